@@ -1,10 +1,17 @@
 """Dropbox Link Generate - generate Dropbox sharing links via CLI."""
 
-from .core.sharing import DropboxLinkGenerator
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
 from .utils.config import Config
 from .utils.paths import normalize_and_validate_path
 from .version import __version__, get_version
 
+if TYPE_CHECKING:
+    from .core.sharing import DropboxLinkGenerator
+    from .session import LinkSession
+
 __author__ = "Dropbox Link Generate"
 __email__ = "niceday@example.com"
 
@@ -12,6 +19,20 @@ __all__ = [
     "__version__",
     "get_version",
     "DropboxLinkGenerator",
+    "LinkSession",
     "Config",
     "normalize_and_validate_path",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # Deferred so `import dropbox_link_generate` does not load the Dropbox SDK.
+    if name == "DropboxLinkGenerator":
+        from .core.sharing import DropboxLinkGenerator
+
+        return DropboxLinkGenerator
+    if name == "LinkSession":
+        from .session import LinkSession
+
+        return LinkSession
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,29 +1,19 @@
 from __future__ import annotations
 
+import importlib
 import os
 import textwrap
-import webbrowser
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, Iterator, Optional
 
 import click
-from dropbox.oauth import (
-    BadStateException,
-    CsrfException,
-    DropboxOAuth2FlowNoRedirect,
-    NotApprovedException,
-    ProviderException,
-)
 from dotenv import load_dotenv
 
-from .core.sharing import DropboxLinkGenerator
-from .diagnostics import check_permissions as run_permissions_check
-from .diagnostics import run_auth_debug, run_diagnosis_suite
-from .diagnostics.common import EnvCheck, validate_env
-from .services.dropbox_client import DropboxClient
-from .utils.config import Config
+from .core.batch import DEFAULT_JOBS
+from .core.concurrency import DEFAULT_MAX_JOBS
+from .session import format_error, open_session
 from .utils.errors import (
     ConfigError,
     DropboxAuthError,
@@ -31,10 +21,21 @@ from .utils.errors import (
     DplkError,
     PathValidationError,
 )
-from .utils.logging import setup_logging
-from .utils.structure import StructureIssue, check_tree as validate_structure, normalize_structure
 
 
+# Subcommands imported only when invoked, keeping `dplk <PATH>` start-up lean.
+LAZY_COMMANDS: dict[str, str] = {
+    "check-env": "dropbox_link_generate.commands.structure:check_env_cmd",
+    "check-tree": "dropbox_link_generate.commands.structure:check_tree_cmd",
+    "hash": "dropbox_link_generate.commands.hash:hash_cmd",
+    "diagnostics": "dropbox_link_generate.commands.diagnostics:diagnostics",
+    "doctor": "dropbox_link_generate.commands.structure:doctor",
+    "index": "dropbox_link_generate.commands.index:index",
+    "normalize": "dropbox_link_generate.commands.structure:normalize",
+    "serve": "dropbox_link_generate.commands.serve:serve",
+    "tree": "dropbox_link_generate.commands.tree:tree_cmd",
+}
+
 DEFAULT_SCOPES: tuple[str, ...] = ("sharing.read", "sharing.write", "files.metadata.read")
 
 
@@ -49,12 +50,34 @@ class AuthResult:
 
 
 class DefaultGroup(click.Group):
-    """A click.Group that treats bare arguments as a default command."""
-
-    def __init__(self, *args, default_command: str | None = None, **kwargs):
+    """A click.Group that treats bare arguments as a default command.
+
+    Commands named in ``lazy_commands`` (``name -> "module:attribute"``) are
+    imported on first lookup, so only the command being run pays for its
+    dependencies.
+    """
+
+    def __init__(
+        self,
+        *args,
+        default_command: str | None = None,
+        lazy_commands: Optional[dict[str, str]] = None,
+        **kwargs,
+    ):
         self.default_command = default_command
+        self.lazy_commands = dict(lazy_commands or {})
         super().__init__(*args, **kwargs)
 
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            module_name, attribute = self.lazy_commands[cmd_name].split(":")
+            command = getattr(importlib.import_module(module_name), attribute)
+            self.add_command(command, cmd_name)
+        return super().get_command(ctx, cmd_name)
+
     def parse_args(self, ctx: click.Context, args: list[str]) -> None:
         if (
             self.default_command
@@ -66,29 +89,50 @@ class DefaultGroup(click.Group):
         super().parse_args(ctx, args)
 
 
-def _run_generate(path: Path, verbose: bool, log_file: Optional[str], no_copy: bool) -> int:
+def _run_via_daemon(path: Path, no_copy: bool) -> Optional[int]:
+    """Forward a single link request to ``dplk serve``; None if it is not running."""
+    from .services.daemon import DaemonUnavailable, request_link
+    from .utils.clipboard import copy_to_clipboard
+
+    try:
+        link = request_link(path)
+    except (DaemonUnavailable, DropboxAuthError):
+        # Auth failures are retried in-process, which can re-run `dplk auth`.
+        return None
+    except DplkError as e:
+        click.echo(format_error(e), err=True)
+        return 1
+
+    if not no_copy and not copy_to_clipboard(link):
+        click.echo("Failed to copy link to clipboard", err=True)
+    click.echo(link, err=False)
+    return 0
+
+
+def _run_generate(
+    path: Path,
+    verbose: bool,
+    log_file: Optional[str],
+    no_copy: bool,
+    no_cache: bool = False,
+    use_daemon: bool = False,
+    wait_sync: Optional[float] = None,
+    verify_hash: bool = False,
+    directory_mode: Optional[str] = None,
+) -> int:
+    if use_daemon:
+        exit_code = _run_via_daemon(path, no_copy)
+        if exit_code is not None:
+            return exit_code
+
     attempted_auto_auth = False
 
     while True:
         try:
-            cfg = Config.from_env()
-            if verbose:
-                cfg.verbose = True
-            if log_file:
-                cfg.log_file = log_file
-
-            logger = setup_logging(verbose=cfg.verbose, log_file=cfg.log_file)
-            logger.debug("Loaded configuration: root=%s", cfg.dropbox_root)
-
-            client = DropboxClient(credentials=cfg.oauth, timeout=5.0, user_agent="dplk/0.1")
-            generator = DropboxLinkGenerator(
-                dropbox_root=cfg.dropbox_root,
-                client=client,
-                logger=logger,
-                archive_dir=cfg.archive_dir,
-            )
-
-            link = generator.generate(path, copy=not no_copy)
+            with open_session(
+                verbose, log_file, no_cache, wait_sync, verify_hash, directory_mode
+            ) as session:
+                link = session.generate(path, copy=not no_copy)
             click.echo(link, err=False)
             return 0
 
@@ -119,38 +163,67 @@ def _run_generate(path: Path, verbose: bool, log_file: Optional[str], no_copy: b
             return 1
 
 
-def _print_structure_issues(issues: list[str]) -> bool:
-    if not issues:
-        click.echo("✅ Project structure matches specification.")
-        return True
-
-    click.echo("❌ Project structure issues detected:")
-    for issue in issues:
-        click.echo(f"  - {issue}")
-    return False
+def _run_batch(
+    paths: Iterable[str],
+    verbose: bool,
+    log_file: Optional[str],
+    jobs: Optional[int],
+    queue_size: Optional[int],
+    no_cache: bool = False,
+    adaptive: bool = False,
+    wait_sync: Optional[float] = None,
+    verify_hash: bool = False,
+    directory_mode: Optional[str] = None,
+) -> int:
+    from .core.concurrency import AIMDController
 
+    attempted_auto_auth = False
 
-def _print_env_report(status: EnvCheck) -> bool:
-    ok = True
-    if status.missing:
-        click.echo("❌ Missing environment variables:")
-        for key in status.missing:
-            click.echo(f"  - {key}")
-        ok = False
-    else:
-        click.echo("✅ Required environment variables are configured.")
-
-    if status.dropbox_root:
-        if status.dropbox_root.exists() and status.dropbox_root.is_dir():
-            click.echo(f"✅ DROPBOX_ROOT: {status.dropbox_root}")
-        else:
-            click.echo(f"❌ DROPBOX_ROOT does not exist: {status.dropbox_root}")
-            ok = False
-    else:
-        click.echo("❌ DROPBOX_ROOT is not set.")
-        ok = False
+    while True:
+        try:
+            session = open_session(
+                verbose, log_file, no_cache, wait_sync, verify_hash, directory_mode
+            )
+            break
+        except ConfigError as e:
+            if not attempted_auto_auth and _should_trigger_auth_for_config_error(e):
+                if _attempt_auto_auth(str(e)):
+                    attempted_auto_auth = True
+                    continue
+            click.echo(str(e), err=True)
+            return 1
 
-    return ok
+    controller = None
+    if adaptive:
+        retry_policy = session.client.retry_policy
+        controller = AIMDController(
+            maximum=jobs or DEFAULT_MAX_JOBS,
+            throttle_events=lambda: retry_policy.throttle_events,
+        )
+
+    failures = 0
+    with session:
+        results = session.generate_many(
+            paths,
+            jobs=jobs or DEFAULT_JOBS,
+            queue_size=queue_size,
+            controller=controller,
+        )
+        for result in results:
+            if result.ok:
+                click.echo(f"{result.path}\t{result.link}")
+            else:
+                failures += 1
+                click.echo(f"{result.path}: {format_error(result.error)}", err=True)
+
+    if controller is not None:
+        report = controller.report()
+        click.echo(
+            f"Adaptive concurrency settled at {report.final} "
+            f"(peak {report.peak}, mean {report.mean:.1f}, {report.decreases} backoffs)",
+            err=True,
+        )
+    return 1 if failures else 0
 
 
 def _scopes_to_list(scopes: Iterable[str]) -> list[str]:
@@ -196,6 +269,16 @@ def _perform_auth_flow(
     scopes: Iterable[str],
     no_browser: bool,
 ) -> AuthResult:
+    import webbrowser
+
+    from dropbox.oauth import (
+        BadStateException,
+        CsrfException,
+        DropboxOAuth2FlowNoRedirect,
+        NotApprovedException,
+        ProviderException,
+    )
+
     load_dotenv()
 
     resolved_app_key = (app_key or os.getenv("DROPBOX_APP_KEY", "")).strip()
@@ -299,25 +382,155 @@ def _attempt_auto_auth(reason: str) -> bool:
 @click.group(
     cls=DefaultGroup,
     default_command="link",
+    lazy_commands=LAZY_COMMANDS,
     context_settings={"help_option_names": ["-h", "--help"]},
 )
 @click.option("--verbose", is_flag=True, help="Enable verbose logging")
 @click.option("--log-file", type=click.Path(dir_okay=False, writable=True), help="Log file path")
 @click.option("--no-copy", is_flag=True, help="Do not copy link to clipboard")
+@click.option("--no-cache", is_flag=True, help="Bypass the local shared-link cache")
+@click.option("--no-daemon", is_flag=True, help="Do not forward requests to `dplk serve`")
 @click.pass_context
-def cli(ctx: click.Context, verbose: bool, log_file: str | None, no_copy: bool) -> None:
+def cli(
+    ctx: click.Context,
+    verbose: bool,
+    log_file: str | None,
+    no_copy: bool,
+    no_cache: bool,
+    no_daemon: bool,
+) -> None:
     """Generate Dropbox shared links or manage authentication."""
 
     ctx.ensure_object(dict)
-    ctx.obj.update({"verbose": verbose, "log_file": log_file, "no_copy": no_copy})
+    ctx.obj.update(
+        {
+            "verbose": verbose,
+            "log_file": log_file,
+            "no_copy": no_copy,
+            "no_cache": no_cache,
+            "no_daemon": no_daemon,
+        }
+    )
 
 
-@cli.command("link", hidden=True)
-@click.argument("path", type=click.Path(path_type=Path))
+@cli.command("link", help="Generate shared links for one or more paths.")
+@click.argument("paths", nargs=-1, type=click.Path(path_type=Path))
+@click.option(
+    "--from-file",
+    "from_file",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    help="Read additional paths from a file, one per line. Use '-' for stdin.",
+)
+@click.option(
+    "-0",
+    "--null",
+    "null_delimited",
+    is_flag=True,
+    help="Paths read from --from-file are NUL-delimited (find -print0).",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    help=(
+        f"Concurrent link requests in batch mode (default {DEFAULT_JOBS}). "
+        f"With --adaptive, the upper bound (default {DEFAULT_MAX_JOBS})."
+    ),
+)
+@click.option(
+    "--queue-size",
+    type=click.IntRange(min=1),
+    help="Maximum queued paths in batch mode. Defaults to 2x --jobs.",
+)
+@click.option(
+    "--adaptive",
+    is_flag=True,
+    help="Adjust concurrency to the API (AIMD): grow until rate limited, then back off.",
+)
+@click.option(
+    "--wait-sync",
+    type=click.FloatRange(min=0),
+    metavar="SECONDS",
+    help="Wait up to SECONDS for the desktop client to upload each file before linking it.",
+)
+@click.option(
+    "--verify-hash",
+    is_flag=True,
+    help="With --wait-sync, also wait until the uploaded content_hash matches the local file.",
+)
+@click.option(
+    "--directory-mode",
+    type=click.Choice(["archive", "folder", "auto"]),
+    help=(
+        "Link directories by zipping them (archive), as shared folders (folder), "
+        "or by size (auto: large trees get folder links)."
+    ),
+)
 @click.pass_context
-def link_cmd(ctx: click.Context, path: Path) -> None:
+def link_cmd(
+    ctx: click.Context,
+    paths: tuple[Path, ...],
+    from_file: Optional[str],
+    null_delimited: bool,
+    jobs: Optional[int],
+    queue_size: Optional[int],
+    adaptive: bool,
+    wait_sync: Optional[float],
+    verify_hash: bool,
+    directory_mode: Optional[str],
+) -> None:
     opts = ctx.obj or {}
-    exit_code = _run_generate(path, opts.get("verbose", False), opts.get("log_file"), opts.get("no_copy", False))
+    verbose = opts.get("verbose", False)
+    log_file = opts.get("log_file")
+    no_cache = opts.get("no_cache", False)
+
+    from .core.batch import read_paths
+    from .services.daemon import daemon_enabled
+
+    if not paths and not from_file:
+        raise click.UsageError("Missing argument 'PATHS...' (or --from-file).", ctx=ctx)
+
+    if len(paths) == 1 and not from_file:
+        # Flags that change in-process behaviour bypass the daemon.
+        use_daemon = (
+            daemon_enabled()
+            and not opts.get("no_daemon", False)
+            and not (verbose or log_file or no_cache or verify_hash)
+            and wait_sync is None
+            and directory_mode is None
+        )
+        exit_code = _run_generate(
+            paths[0],
+            verbose,
+            log_file,
+            opts.get("no_copy", False),
+            no_cache,
+            use_daemon,
+            wait_sync,
+            verify_hash,
+            directory_mode,
+        )
+        ctx.exit(exit_code)
+
+    def iter_inputs() -> Iterator[str]:
+        for path in paths:
+            yield str(path)
+        if from_file:
+            with click.open_file(from_file, "rb") as stream:
+                yield from read_paths(stream, null_delimited=null_delimited)
+
+    exit_code = _run_batch(
+        iter_inputs(),
+        verbose,
+        log_file,
+        jobs,
+        queue_size,
+        no_cache,
+        adaptive,
+        wait_sync,
+        verify_hash,
+        directory_mode,
+    )
     ctx.exit(exit_code)
 
 
@@ -344,78 +557,6 @@ def auth(app_key: Optional[str], app_secret: Optional[str], scopes: tuple[str, .
     _print_auth_success(result)
 
 
-@cli.command(name="check-tree", help="Validate the repository against the project-structure contract.")
-def check_tree_cmd() -> None:
-    issues = validate_structure()
-    if not _print_structure_issues(issues):
-        raise click.ClickException("项目结构存在问题，请运行 `dplk normalize` 后再试。")
-
-
-@cli.command(help="Create missing folders and normalize the repository layout.")
-def normalize() -> None:
-    try:
-        changes = normalize_structure()
-    except StructureIssue as exc:  # pragma: no cover - manual intervention
-        raise click.ClickException(str(exc)) from exc
-
-    if not changes:
-        click.echo("✅ 项目结构已符合要求，无需修改。")
-    else:
-        click.echo("✅ 已应用以下修复：")
-        for change in changes:
-            click.echo(f"  - {change}")
-
-
-@cli.command(name="check-env", help="Verify mandatory Dropbox environment variables.")
-def check_env_cmd() -> None:
-    status = validate_env()
-    if not _print_env_report(status):
-        raise click.ClickException("环境变量配置不完整。")
-
-
-@cli.command(help="Run structure and environment diagnostics in one go.")
-def doctor() -> None:
-    issues = validate_structure()
-    status = validate_env()
-
-    structure_ok = _print_structure_issues(issues)
-    env_ok = _print_env_report(status)
-
-    if not (structure_ok and env_ok):
-        raise click.ClickException("诊断失败，请按照提示修复问题。")
-
-    click.echo("🎉 所有检查均通过，可放心使用。")
-
-
-@cli.group(help="Legacy diagnostic helpers.")
-def diagnostics() -> None:
-    """Run the legacy diagnostics bundled with the project."""
-
-
-@diagnostics.command("permissions", help="Check Dropbox sharing permissions.")
-@click.option("--path", "target_path", help="Dropbox path to test. Defaults to /README.md.")
-def diagnostics_permissions(target_path: Optional[str]) -> None:
-    success = run_permissions_check(target_path=target_path)
-    if not success:
-        raise click.ClickException("权限检查失败。")
-
-
-@diagnostics.command("suite", help="Run the full diagnosis suite.")
-@click.option("--path", "target_path", help="Dropbox path to test.")
-def diagnostics_suite(target_path: Optional[str]) -> None:
-    success = run_diagnosis_suite(target_path=target_path)
-    if not success:
-        raise click.ClickException("诊断套件检测到问题。")
-
-
-@diagnostics.command("auth-debug", help="Run advanced authentication debug steps.")
-@click.option("--path", "target_path", help="Dropbox path to test.")
-def diagnostics_auth_debug(target_path: Optional[str]) -> None:
-    success = run_auth_debug(test_path=target_path)
-    if not success:
-        raise click.ClickException("认证调试失败，请检查输出。")
-
-
 main = cli
 
 
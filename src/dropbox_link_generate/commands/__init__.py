@@ -0,0 +1,3 @@
+"""
+Lazily loaded CLI subcommands (see ``cli.LAZY_COMMANDS``).
+"""
@@ -0,0 +1,45 @@
+"""`dplk diagnostics` - legacy diagnostic helpers."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import click
+
+
+@click.group(help="Legacy diagnostic helpers.")
+def diagnostics() -> None:
+    """Run the legacy diagnostics bundled with the project."""
+
+
+@diagnostics.command("permissions", help="Check Dropbox sharing permissions.")
+@click.option("--path", "target_path", help="Dropbox path to test. Defaults to /README.md.")
+def diagnostics_permissions(target_path: Optional[str]) -> None:
+    from ..diagnostics.permissions import check_permissions as run_permissions_check
+
+    success = run_permissions_check(target_path=target_path)
+    if not success:
+        raise click.ClickException("权限检查失败。")
+
+
+@diagnostics.command("suite", help="Run the full diagnosis suite.")
+@click.option("--path", "target_path", help="Dropbox path to test.")
+def diagnostics_suite(target_path: Optional[str]) -> None:
+    from ..diagnostics.suite import run_diagnosis_suite
+
+    success = run_diagnosis_suite(target_path=target_path)
+    if not success:
+        raise click.ClickException("诊断套件检测到问题。")
+
+
+@diagnostics.command("auth-debug", help="Run advanced authentication debug steps.")
+@click.option("--path", "target_path", help="Dropbox path to test.")
+def diagnostics_auth_debug(target_path: Optional[str]) -> None:
+    try:
+        from ..diagnostics.auth_debug import run_auth_debug
+    except ImportError as exc:
+        raise click.ClickException(f"auth-debug 诊断模块不可用：{exc}") from exc
+
+    success = run_auth_debug(test_path=target_path)
+    if not success:
+        raise click.ClickException("认证调试失败，请检查输出。")
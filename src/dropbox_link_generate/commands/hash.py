@@ -0,0 +1,61 @@
+"""`dplk hash` - print Dropbox content hashes of local files."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from ..session import link_store_path, load_config
+from ..utils.content_hash import content_hash
+from ..utils.errors import ConfigError
+
+
+@click.command("hash", help="Print the Dropbox content_hash of local files.")
+@click.argument(
+    "paths",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Threads hashing blocks of large files (default: CPU count).",
+)
+@click.pass_context
+def hash_cmd(ctx: click.Context, paths: tuple[Path, ...], workers: Optional[int]) -> None:
+    """Output matches ``FileMetadata.content_hash`` for the synced copy."""
+    import sqlite3
+
+    from ..services.content_hash_store import ContentHashStore
+
+    opts = ctx.obj or {}
+    store = None
+    if not opts.get("no_cache"):
+        # Hashing is purely local; without a configured account it just runs uncached.
+        try:
+            cfg, _ = load_config(opts.get("verbose", False), opts.get("log_file"))
+            store_path = link_store_path(cfg)
+            if store_path is not None:
+                store = ContentHashStore(store_path)
+        except (ConfigError, OSError, sqlite3.Error):
+            store = None
+
+    failed = False
+    try:
+        for path in paths:
+            try:
+                digest = content_hash(path, workers=workers, cache=store)
+            except OSError as exc:
+                click.echo(f"{path}: {exc.strerror or exc}", err=True)
+                failed = True
+                continue
+            click.echo(f"{digest}  {path}")
+    finally:
+        if store is not None:
+            store.close()
+    if failed:
+        ctx.exit(1)
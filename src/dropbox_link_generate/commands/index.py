@@ -0,0 +1,77 @@
+"""`dplk index` - manage the local index of existing shared links."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import click
+
+from ..services.link_index import DEFAULT_INDEX_MAX_AGE, SharedLinkIndex
+from ..session import build_client, link_store_path, load_config
+from ..utils.config import Config
+from ..utils.errors import ConfigError, DropboxClientError
+
+
+@click.group(help="Manage the local index of existing shared links.")
+def index() -> None:
+    """Prewarm link lookups from the account-wide shared-link listing."""
+
+
+def _open_index_for_command(ctx: click.Context) -> tuple[Config, SharedLinkIndex]:
+    import sqlite3
+
+    opts = ctx.obj or {}
+    try:
+        cfg, _ = load_config(opts.get("verbose", False), opts.get("log_file"))
+    except ConfigError as exc:
+        raise click.ClickException(str(exc)) from exc
+
+    store_path = link_store_path(cfg)
+    if store_path is None:
+        raise click.ClickException("The shared-link cache is disabled (DPLK_LINK_CACHE).")
+    try:
+        return cfg, SharedLinkIndex(
+            store_path,
+            scope=str(cfg.dropbox_root.resolve()),
+            max_age=DEFAULT_INDEX_MAX_AGE if cfg.link_index_ttl is None else cfg.link_index_ttl,
+        )
+    except (OSError, sqlite3.Error) as exc:
+        raise click.ClickException(f"Cannot open link index at {store_path}: {exc}") from exc
+
+
+@index.command("sync", help="Fetch every existing shared link into the local index.")
+@click.option("--full", is_flag=True, help="Discard the stored cursor and re-list everything.")
+@click.pass_context
+def index_sync(ctx: click.Context, full: bool) -> None:
+    cfg, link_index = _open_index_for_command(ctx)
+    try:
+        client = build_client(cfg)
+        try:
+            result = link_index.sync(client, full=full)
+        finally:
+            client.close()
+    except DropboxClientError as exc:
+        raise click.ClickException(f"Dropbox API error: {exc}") from exc
+    finally:
+        link_index.close()
+
+    mode = "incremental" if result.resumed else "full"
+    click.echo(f"✅ Indexed {result.links} shared links from {result.pages} page(s) ({mode} sync).")
+
+
+@index.command("status", help="Show how many links are indexed and when they were synced.")
+@click.pass_context
+def index_status(ctx: click.Context) -> None:
+    _, link_index = _open_index_for_command(ctx)
+    try:
+        status = link_index.status()
+    finally:
+        link_index.close()
+
+    synced = (
+        datetime.fromtimestamp(status.synced_at).isoformat(timespec="seconds")
+        if status.synced_at
+        else "never"
+    )
+    click.echo(f"Indexed links: {status.links}")
+    click.echo(f"Last sync: {synced}")
@@ -0,0 +1,54 @@
+"""`dplk serve` - resident link daemon."""
+
+from __future__ import annotations
+
+import signal
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from ..services.daemon import LinkDaemon, default_socket_path
+from ..session import open_session
+from ..utils.errors import ConfigError, DplkError
+
+
+@click.command(help="Run a resident link daemon that `dplk <PATH>` forwards to.")
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Unix socket path. Defaults to $DPLK_SOCKET or a per-user runtime path.",
+)
+@click.pass_context
+def serve(ctx: click.Context, socket_path: Optional[Path]) -> None:
+    opts = ctx.obj or {}
+    try:
+        session = open_session(
+            opts.get("verbose", False), opts.get("log_file"), opts.get("no_cache", False)
+        )
+    except ConfigError as exc:
+        raise click.ClickException(str(exc)) from exc
+
+    with session:
+        link_daemon = LinkDaemon(
+            generator=session.generator,
+            socket_path=socket_path or default_socket_path(),
+            logger=session.logger,
+        )
+        try:
+            link_daemon.bind()
+        except (DplkError, OSError) as exc:
+            raise click.ClickException(str(exc)) from exc
+
+        def _stop(_signum, _frame):
+            raise KeyboardInterrupt
+
+        signal.signal(signal.SIGTERM, _stop)
+        click.echo(
+            f"dplk daemon listening on {link_daemon.socket_path} (Ctrl+C to stop)", err=True
+        )
+        try:
+            link_daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
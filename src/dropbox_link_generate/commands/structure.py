@@ -0,0 +1,85 @@
+"""Structure and environment checks: check-tree, normalize, check-env, doctor."""
+
+from __future__ import annotations
+
+import click
+
+from ..diagnostics.common import EnvCheck, validate_env
+from ..utils.structure import StructureIssue, check_tree as validate_structure, normalize_structure
+
+
+def _print_structure_issues(issues: list[str]) -> bool:
+    if not issues:
+        click.echo("✅ Project structure matches specification.")
+        return True
+
+    click.echo("❌ Project structure issues detected:")
+    for issue in issues:
+        click.echo(f"  - {issue}")
+    return False
+
+
+def _print_env_report(status: EnvCheck) -> bool:
+    ok = True
+    if status.missing:
+        click.echo("❌ Missing environment variables:")
+        for key in status.missing:
+            click.echo(f"  - {key}")
+        ok = False
+    else:
+        click.echo("✅ Required environment variables are configured.")
+
+    if status.dropbox_root:
+        if status.dropbox_root.exists() and status.dropbox_root.is_dir():
+            click.echo(f"✅ DROPBOX_ROOT: {status.dropbox_root}")
+        else:
+            click.echo(f"❌ DROPBOX_ROOT does not exist: {status.dropbox_root}")
+            ok = False
+    else:
+        click.echo("❌ DROPBOX_ROOT is not set.")
+        ok = False
+
+    return ok
+
+
+@click.command(name="check-tree", help="Validate the repository against the project-structure contract.")
+def check_tree_cmd() -> None:
+    issues = validate_structure()
+    if not _print_structure_issues(issues):
+        raise click.ClickException("项目结构存在问题，请运行 `dplk normalize` 后再试。")
+
+
+@click.command(help="Create missing folders and normalize the repository layout.")
+def normalize() -> None:
+    try:
+        changes = normalize_structure()
+    except StructureIssue as exc:  # pragma: no cover - manual intervention
+        raise click.ClickException(str(exc)) from exc
+
+    if not changes:
+        click.echo("✅ 项目结构已符合要求，无需修改。")
+    else:
+        click.echo("✅ 已应用以下修复：")
+        for change in changes:
+            click.echo(f"  - {change}")
+
+
+@click.command(name="check-env", help="Verify mandatory Dropbox environment variables.")
+def check_env_cmd() -> None:
+    status = validate_env()
+    if not _print_env_report(status):
+        raise click.ClickException("环境变量配置不完整。")
+
+
+@click.command(help="Run structure and environment diagnostics in one go.")
+def doctor() -> None:
+    issues = validate_structure()
+    status = validate_env()
+
+    structure_ok = _print_structure_issues(issues)
+    env_ok = _print_env_report(status)
+
+    if not (structure_ok and env_ok):
+        raise click.ClickException("诊断失败，请按照提示修复问题。")
+
+    click.echo("🎉 所有检查均通过，可放心使用。")
@@ -0,0 +1,164 @@
+"""`dplk tree` - link every file under a directory."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from ..core.batch import DEFAULT_JOBS
+from ..core.concurrency import DEFAULT_MAX_JOBS, AIMDController
+from ..session import format_error, open_session
+from ..utils.errors import ConfigError, PathValidationError
+
+CSV_FIELDS = ("path", "link", "error")
+
+
+@click.command("tree", help="Generate a shared link for every file under a directory.")
+@click.argument("directory", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option(
+    "--include",
+    multiple=True,
+    metavar="GLOB",
+    help="Only link files matching GLOB, or below a directory matching it "
+    "(gitignore syntax, relative to DIRECTORY). Repeatable.",
+)
+@click.option(
+    "--exclude",
+    multiple=True,
+    metavar="GLOB",
+    help="Skip files and directories matching GLOB. Repeatable.",
+)
+@click.option(
+    "--no-ignore",
+    is_flag=True,
+    help="Also link files excluded by the built-in patterns, .gitignore and .dplkignore.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["ndjson", "csv"]),
+    default="ndjson",
+    show_default=True,
+    help="Output one JSON object per line, or CSV with a header row.",
+)
+@click.option(
+    "--order",
+    type=click.Choice(["path", "completion"]),
+    default="path",
+    show_default=True,
+    help="Print results sorted by relative path, or as soon as each link is ready.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    help=(
+        f"Concurrent link requests (default {DEFAULT_JOBS}). "
+        f"With --adaptive, the upper bound (default {DEFAULT_MAX_JOBS})."
+    ),
+)
+@click.option(
+    "--queue-size",
+    type=click.IntRange(min=1),
+    help="Maximum files in flight or awaiting output. Defaults to 2x --jobs.",
+)
+@click.option(
+    "--adaptive",
+    is_flag=True,
+    help="Adjust concurrency to the API (AIMD): grow until rate limited, then back off.",
+)
+@click.pass_context
+def tree_cmd(
+    ctx: click.Context,
+    directory: Path,
+    include: tuple[str, ...],
+    exclude: tuple[str, ...],
+    no_ignore: bool,
+    output_format: str,
+    order: str,
+    jobs: Optional[int],
+    queue_size: Optional[int],
+    adaptive: bool,
+) -> None:
+    """Failures are reported in the output and make the exit status 1."""
+    opts = ctx.obj or {}
+    try:
+        session = open_session(
+            opts.get("verbose", False), opts.get("log_file"), opts.get("no_cache", False)
+        )
+    except ConfigError as exc:
+        raise click.ClickException(str(exc)) from exc
+
+    controller = None
+    if adaptive:
+        retry_policy = session.client.retry_policy
+        controller = AIMDController(
+            maximum=jobs or DEFAULT_MAX_JOBS,
+            throttle_events=lambda: retry_policy.throttle_events,
+        )
+
+    failures = 0
+    with session:
+        try:
+            results = session.generate_tree(
+                directory,
+                include=include,
+                exclude=exclude,
+                ignore=not no_ignore,
+                ordered=order == "path",
+                jobs=jobs or DEFAULT_JOBS,
+                queue_size=queue_size,
+                controller=controller,
+            )
+        except PathValidationError as exc:
+            raise click.ClickException(str(exc)) from exc
+        emit = _csv_writer() if output_format == "csv" else _ndjson_writer()
+        for result in results:
+            error = None if result.ok else format_error(result.error)
+            failures += error is not None
+            emit(result.path, result.link, error)
+
+    if controller is not None:
+        report = controller.report()
+        click.echo(
+            f"Adaptive concurrency settled at {report.final} "
+            f"(peak {report.peak}, mean {report.mean:.1f}, {report.decreases} backoffs)",
+            err=True,
+        )
+    if failures:
+        ctx.exit(1)
+
+
+def _ndjson_writer():
+    def emit(path: str, link: Optional[str], error: Optional[str]) -> None:
+        record = {"path": path}
+        if error is None:
+            record["link"] = link
+        else:
+            record["error"] = error
+        click.echo(json.dumps(record, ensure_ascii=False))
+
+    return emit
+
+
+def _csv_writer():
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    def write_row(row) -> None:
+        writer.writerow(row)
+        click.echo(buffer.getvalue(), nl=False)
+        buffer.seek(0)
+        buffer.truncate()
+
+    write_row(CSV_FIELDS)
+
+    def emit(path: str, link: Optional[str], error: Optional[str]) -> None:
+        write_row((path, link or "", error or ""))
+
+    return emit
@@ -0,0 +1,346 @@
+"""Single-pass directory archiver that writes straight into the archive dir."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import stat
+import tempfile
+import time
+import zipfile
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from ..utils.errors import PathValidationError
+from .ignore import IgnoreMatcher
+from .parallel_zip import CHUNK_SIZE, ParallelZipWriter, default_workers
+
+# Read buffer for hashing; archive data is read in CHUNK_SIZE pieces.
+COPY_BUFFER_SIZE = CHUNK_SIZE
+# The Dropbox desktop client ignores names starting with ".~" and names
+# starting with "~" and ending in ".tmp", so it never uploads partial archives.
+TEMP_PREFIX = ".~dplk-"
+TEMP_SUFFIX = ".tmp"
+
+DEFAULT_LEVEL = 6
+# Formats that are already compressed; deflating them again gains ~nothing.
+STORED_EXTENSIONS = frozenset(
+    {
+        # images
+        ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".heif", ".avif", ".jxl",
+        # audio / video
+        ".mp3", ".m4a", ".aac", ".ogg", ".opus", ".flac",
+        ".mp4", ".m4v", ".mov", ".mkv", ".webm", ".avi",
+        # archives and containers
+        ".zip", ".gz", ".tgz", ".bz2", ".xz", ".zst", ".lz4", ".7z", ".rar",
+        ".jar", ".whl", ".apk", ".dmg",
+        # zipped office / e-book formats
+        ".docx", ".xlsx", ".pptx", ".odt", ".ods", ".odp", ".epub",
+        ".woff", ".woff2",
+    }
+)
+# Timestamp written for every entry in deterministic mode (the zip epoch).
+DETERMINISTIC_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+# Files below this size are always deflated; sampling them costs more than it saves.
+_SAMPLE_MIN_SIZE = 16 * 1024
+_SAMPLE_SIZE = 64 * 1024
+# A sample that deflates to more than this fraction of its size is stored.
+_INCOMPRESSIBLE_RATIO = 0.95
+
+
+def iter_archive_entries(
+    directory: Path,
+    sort: bool = False,
+    ignore: Optional[IgnoreMatcher] = None,
+) -> Iterator[tuple[Path, str]]:
+    """Yield ``(path, arcname)`` pairs in the order ``shutil.make_archive`` uses.
+
+    The top-level directory itself is the first entry, so archives unpack into
+    ``<name>/``. Symlinked directories are stored as empty directory entries
+    and not descended into; symlinked files are stored with their target's
+    content. With ``sort`` the walk itself is sorted, so the order no longer
+    depends on the filesystem.
+
+    Paths excluded by ``ignore`` are dropped while listing each directory, so
+    an ignored subtree is never entered and its files are never stat'ed.
+    """
+    yield directory, directory.name
+    yield from _walk(directory, directory.name, "", sort, ignore)
+
+
+def _walk(
+    directory: Path,
+    arc_dir: str,
+    rel_dir: str,
+    sort: bool,
+    ignore: Optional[IgnoreMatcher],
+) -> Iterator[tuple[Path, str]]:
+    if ignore is not None:
+        ignore = ignore.descend(directory, rel_dir)
+    try:
+        with os.scandir(directory) as listing:
+            entries = list(listing)
+    except OSError:
+        return
+    if sort:
+        entries.sort(key=lambda entry: entry.name)
+
+    subdirs = []
+    files = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        if ignore is not None and ignore.is_ignored(rel_path, is_dir):
+            continue
+        (subdirs if is_dir else files).append((entry, rel_path))
+
+    for entry, rel_path in sorted(subdirs, key=lambda item: item[0].name):
+        yield Path(entry.path), f"{arc_dir}/{entry.name}"
+    for entry, rel_path in files:
+        # Follows symlinks, like make_archive's os.path.isfile check.
+        if entry.is_file():
+            yield Path(entry.path), f"{arc_dir}/{entry.name}"
+    for entry, rel_path in subdirs:
+        if not entry.is_symlink():
+            yield from _walk(Path(entry.path), f"{arc_dir}/{entry.name}", rel_path, sort, ignore)
+
+
+@dataclass
+class ArchiveStats:
+    """What an archive run wrote and what it cost."""
+
+    path: Path
+    files: int = 0
+    stored: int = 0
+    deflated: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    cpu_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.input_bytes - self.output_bytes
+
+    def summary(self) -> str:
+        return (
+            f"{self.files} files ({self.deflated} deflated, {self.stored} stored), "
+            f"{self.input_bytes} -> {self.output_bytes} bytes "
+            f"(saved {self.saved_bytes}), "
+            f"{self.cpu_seconds:.2f}s CPU in {self.wall_seconds:.2f}s"
+        )
+
+
+def choose_compression(path: Path, size: int, level: int = DEFAULT_LEVEL) -> int:
+    """Return ``ZIP_STORED`` or ``ZIP_DEFLATED`` for one file.
+
+    Known compressed formats are stored by extension. Other files larger
+    than a few KiB have a sample from their start deflated at level 1; if
+    that barely shrinks, the file is stored too. ``level`` 0 stores
+    everything.
+    """
+    if level == 0 or path.suffix.lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    if size < _SAMPLE_MIN_SIZE:
+        return zipfile.ZIP_DEFLATED
+    try:
+        with open(path, "rb") as handle:
+            sample = handle.read(_SAMPLE_SIZE)
+    except OSError:
+        return zipfile.ZIP_DEFLATED
+    if len(zlib.compress(sample, 1)) > len(sample) * _INCOMPRESSIBLE_RATIO:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def tree_exceeds(
+    directory: Path,
+    max_bytes: Optional[int] = None,
+    max_files: Optional[int] = None,
+    ignore: Optional[IgnoreMatcher] = None,
+) -> bool:
+    """Return True if the files :func:`write_archive` would store pass a limit.
+
+    The walk stops as soon as either limit is crossed, so deciding that a
+    huge tree is huge stays cheap.
+    """
+    files = 0
+    total = 0
+    for path, _ in iter_archive_entries(directory, ignore=ignore):
+        if path is directory or path.is_dir():
+            continue
+        files += 1
+        if max_files is not None and files > max_files:
+            return True
+        if max_bytes is not None:
+            try:
+                total += path.stat().st_size
+            except OSError:
+                continue
+            if total > max_bytes:
+                return True
+    return False
+
+
+@dataclass(frozen=True)
+class DirectoryFingerprint:
+    """Digest of a directory's manifest (relative paths, sizes, mtimes)."""
+
+    digest: str
+    entries: int
+
+
+def fingerprint_directory(
+    directory: Path,
+    hash_contents: bool = False,
+    buffer_size: int = COPY_BUFFER_SIZE,
+    options: str = "",
+    ignore: Optional[IgnoreMatcher] = None,
+) -> DirectoryFingerprint:
+    """Fingerprint exactly the entries :func:`write_archive` would store.
+
+    Each entry contributes its archive name and, for files, size and
+    ``st_mtime_ns``. With ``hash_contents`` the file bytes are hashed too,
+    which catches edits that preserve size and mtime at the cost of reading
+    the whole tree (still far cheaper than compressing and re-uploading it).
+    ``options`` describes archiver settings that change the output, so a
+    settings change also invalidates the fingerprint.
+    """
+    manifest = hashlib.sha256(f"dplk-manifest-v1\0{options}\0".encode("utf-8"))
+    entries = 0
+    # Sorted so the digest does not depend on directory listing order.
+    for path, arcname in iter_archive_entries(directory, sort=True, ignore=ignore):
+        entries += 1
+        entry_stat = path.stat()
+        if path.is_dir():
+            manifest.update(f"d\0{arcname}\0".encode("utf-8", "surrogateescape"))
+            continue
+        record = f"f\0{arcname}\0{entry_stat.st_size}\0{entry_stat.st_mtime_ns}\0"
+        manifest.update(record.encode("utf-8", "surrogateescape"))
+        if hash_contents:
+            content = hashlib.sha256()
+            with open(path, "rb") as handle:
+                while chunk := handle.read(buffer_size):
+                    content.update(chunk)
+            manifest.update(content.digest())
+    return DirectoryFingerprint(digest=manifest.hexdigest(), entries=entries)
+
+
+def write_archive(
+    directory: Path,
+    destination: Path,
+    workers: Optional[int] = None,
+    level: int = DEFAULT_LEVEL,
+    deterministic: bool = False,
+    ignore: Optional[IgnoreMatcher] = None,
+) -> ArchiveStats:
+    """Zip ``directory`` into ``destination`` without an intermediate copy.
+
+    Entries are streamed into a hidden temporary file next to ``destination``
+    and the finished archive is fsynced and renamed over it, so readers (and
+    the Dropbox client) only ever see a complete file. File data is deflated
+    at ``level`` on ``workers`` threads (default: one per CPU) in bounded
+    chunks, so memory use does not grow with the tree; already-compressed
+    files are stored (see :func:`choose_compression`).
+
+    With ``deterministic`` the same tree always yields the same bytes:
+    entries are sorted, timestamps are pinned to 1980-01-01 and permissions
+    are reduced to 0644/0755. Compression output never depends on the
+    worker count, so that is not pinned.
+
+    ``ignore`` excludes paths with gitignore rules (see :mod:`.ignore`).
+    """
+    if destination.is_dir():
+        raise PathValidationError(
+            f"Archive destination is a directory, cannot overwrite: {destination}"
+        )
+
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f"{TEMP_PREFIX}{destination.name}.",
+        suffix=TEMP_SUFFIX,
+        dir=str(destination.parent),
+    )
+    tmp_path = Path(tmp_name)
+    started_wall, started_cpu = time.monotonic(), time.process_time()
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            writer = ParallelZipWriter(raw, workers=workers or default_workers(), level=level)
+            with writer:
+                entries = iter_archive_entries(directory, sort=deterministic, ignore=ignore)
+                for path, arcname in entries:
+                    _write_entry(writer, path, arcname, level, deterministic)
+            os.fsync(raw.fileno())
+        # mkstemp creates 0600 files; match what make_archive would have left.
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, destination)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    stats = ArchiveStats(
+        path=destination,
+        cpu_seconds=time.process_time() - started_cpu,
+        wall_seconds=time.monotonic() - started_wall,
+    )
+    for info in writer.written:
+        if info.is_dir():
+            continue
+        stats.files += 1
+        stats.input_bytes += info.file_size
+        stats.output_bytes += info.compress_size
+        if info.compress_type == zipfile.ZIP_STORED:
+            stats.stored += 1
+        else:
+            stats.deflated += 1
+    return stats
+
+
+def _write_entry(
+    writer: ParallelZipWriter,
+    path: Path,
+    arcname: str,
+    level: int,
+    deterministic: bool = False,
+) -> None:
+    info = zipfile.ZipInfo.from_file(path, arcname)
+    if deterministic:
+        _normalize_info(info)
+    if info.is_dir():
+        writer.add_directory(info)
+    else:
+        info.compress_type = choose_compression(path, info.file_size, level)
+        writer.add_file(path, info)
+
+
+def _normalize_info(info: zipfile.ZipInfo) -> None:
+    mode = (info.external_attr >> 16) & 0o7777
+    if info.is_dir():
+        attr = (stat.S_IFDIR | 0o755) << 16 | 0x10
+    else:
+        # Keep only "is it executable", which is what unpacking needs.
+        attr = (stat.S_IFREG | (0o755 if mode & 0o111 else 0o644)) << 16
+    info.date_time = DETERMINISTIC_DATE_TIME
+    info.external_attr = attr
+    info.create_system = 3
+
+
+__all__ = [
+    "ArchiveStats",
+    "COPY_BUFFER_SIZE",
+    "DEFAULT_LEVEL",
+    "DETERMINISTIC_DATE_TIME",
+    "DirectoryFingerprint",
+    "STORED_EXTENSIONS",
+    "choose_compression",
+    "fingerprint_directory",
+    "iter_archive_entries",
+    "tree_exceeds",
+    "write_archive",
+]
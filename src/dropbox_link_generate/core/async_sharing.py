@@ -0,0 +1,131 @@
+"""asyncio front end for link generation."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional, Union
+
+from ..services.async_client import AsyncDropboxClient
+from ..utils.paths import PathValidator
+from .batch import DEFAULT_JOBS, BatchResult
+from .sharing import DropboxLinkGenerator
+
+PathSource = Union[Iterable[Union[str, Path]], AsyncIterable[Union[str, Path]]]
+
+
+@dataclass
+class AsyncDropboxLinkGenerator:
+    """Generate links from coroutines without blocking the event loop.
+
+    Local work - path validation, archiving, the link cache and index - is
+    delegated to ``generator``, so both share configuration and stores;
+    only the Dropbox link calls go through ``client``. That work, and
+    waiting for sync (which uses ``generator.client``), runs in worker
+    threads via :func:`asyncio.to_thread`: the stores and archive locks are
+    shared with threaded callers, and a slow holder must not stall the
+    event loop.
+    """
+
+    generator: DropboxLinkGenerator
+    client: AsyncDropboxClient
+
+    async def generate(
+        self, user_path: str | Path, validator: Optional[PathValidator] = None
+    ) -> str:
+        """Return the link :meth:`DropboxLinkGenerator.generate` would (no clipboard)."""
+        resolved, api_path = await asyncio.to_thread(
+            self.generator._locate, Path(user_path).expanduser(), validator
+        )
+
+        link = await self._resolve_link(resolved, api_path)
+        self.generator.logger.info("Generated/Found link: %s", link)
+        return link
+
+    async def generate_many(
+        self, paths: PathSource, concurrency: int = DEFAULT_JOBS
+    ) -> AsyncIterator[BatchResult]:
+        """Yield a :class:`BatchResult` per path as each one completes.
+
+        At most ``concurrency`` paths are in flight, and ``paths`` (a plain
+        or async iterable) is consumed no further ahead than that, so long
+        inputs keep memory flat. Failures are reported on the result.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        validator = PathValidator(self.generator.dropbox_root)
+        source = _aiter_paths(paths)
+        pending: set[asyncio.Task[BatchResult]] = set()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < concurrency:
+                    try:
+                        path = await source.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    pending.add(asyncio.ensure_future(self._generate_one(path, validator)))
+
+                if not pending:
+                    return
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _generate_one(self, path: str | Path, validator: PathValidator) -> BatchResult:
+        started = time.monotonic()
+        try:
+            link = await self.generate(path, validator)
+        except Exception as exc:
+            return BatchResult(path=str(path), error=exc, elapsed=time.monotonic() - started)
+        return BatchResult(path=str(path), link=link, elapsed=time.monotonic() - started)
+
+    async def _resolve_link(self, resolved: Path, api_path: str) -> str:
+        cache = self.generator.cache
+        if cache is None:
+            return await self._fetch_link(resolved, api_path)
+
+        stat, cached = await asyncio.to_thread(self._cache_lookup, resolved, api_path)
+        if cached:
+            self.generator.logger.debug("Link cache hit for %s", api_path)
+            return cached
+
+        link = await self._fetch_link(resolved, api_path)
+        await asyncio.to_thread(cache.put, api_path, link, stat.st_size, stat.st_mtime_ns)
+        return link
+
+    def _cache_lookup(
+        self, resolved: Path, api_path: str
+    ) -> tuple[os.stat_result, Optional[str]]:
+        stat = resolved.stat()
+        return stat, self.generator.cache.get(api_path, stat.st_size, stat.st_mtime_ns)
+
+    async def _fetch_link(self, resolved: Path, api_path: str) -> str:
+        is_folder = await asyncio.to_thread(resolved.is_dir)
+        if self.generator.wait_for_sync is not None and not is_folder:
+            await asyncio.to_thread(self.generator._wait_for_sync, resolved, api_path)
+        indexed = await asyncio.to_thread(self.generator._indexed_link, api_path)
+        if indexed:
+            return indexed
+        return await self.client.get_or_create_shared_link(api_path, raw=not is_folder)
+
+
+async def _aiter_paths(paths: PathSource) -> AsyncIterator[str | Path]:
+    if hasattr(paths, "__aiter__"):
+        async for path in paths:
+            yield path
+    else:
+        for path in paths:
+            yield path
+
+
+__all__ = ["AsyncDropboxLinkGenerator"]
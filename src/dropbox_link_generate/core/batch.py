@@ -0,0 +1,166 @@
+"""Concurrent link generation for many input paths."""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Iterator, Optional
+
+from ..utils.paths import ValidatedPath
+
+if TYPE_CHECKING:
+    from ..utils.paths import PathValidator
+    from .concurrency import AIMDController
+    from .sharing import DropboxLinkGenerator
+
+DEFAULT_JOBS = 8
+_READ_CHUNK = 64 * 1024
+
+
+@dataclass
+class BatchResult:
+    """Outcome of generating a link for one input path."""
+
+    path: str
+    link: Optional[str] = None
+    error: Optional[Exception] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def read_paths(stream: BinaryIO, null_delimited: bool = False) -> Iterator[str]:
+    """Lazily yield paths from a binary stream.
+
+    Paths are newline separated by default; ``null_delimited`` switches to the
+    ``find -print0`` format. Empty records are skipped.
+    """
+    separator = b"\0" if null_delimited else b"\n"
+    buffer = b""
+    while True:
+        chunk = stream.read(_READ_CHUNK)
+        if not chunk:
+            break
+        buffer += chunk
+        *records, buffer = buffer.split(separator)
+        for record in records:
+            path = _decode_record(record, null_delimited)
+            if path:
+                yield path
+
+    path = _decode_record(buffer, null_delimited)
+    if path:
+        yield path
+
+
+def _decode_record(record: bytes, null_delimited: bool) -> str:
+    if not null_delimited:
+        record = record.rstrip(b"\r")
+    return os.fsdecode(record)
+
+
+def generate_many(
+    generator: DropboxLinkGenerator,
+    paths: Iterable[str | Path | ValidatedPath],
+    jobs: int = DEFAULT_JOBS,
+    queue_size: Optional[int] = None,
+    controller: Optional[AIMDController] = None,
+    validator: Optional[PathValidator] = None,
+    ordered: bool = False,
+) -> Iterator[BatchResult]:
+    """Generate links for ``paths`` on a bounded thread pool.
+
+    All workers share ``generator`` (and therefore one Dropbox client). At most
+    ``queue_size`` paths (default ``2 * jobs``) are pulled from ``paths`` ahead
+    of completion, so arbitrarily long inputs keep memory flat. Results are
+    yielded in completion order; failures are reported on the result instead
+    of aborting the batch.
+
+    With a ``controller`` the number of paths in flight follows
+    ``controller.limit`` instead (``jobs`` and ``queue_size`` are ignored) and
+    every result is fed back to it.
+
+    A ``validator`` for the generator's root is shared by all workers, so
+    paths in the same directories are validated with one ``lstat`` each.
+    Items that are already a :class:`ValidatedPath` skip validation.
+
+    With ``ordered`` results are yielded in input order. Completed results
+    waiting for an earlier, slower path count against the same limit, so
+    memory stays bounded but one slow path can stall the window.
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    limit = queue_size if queue_size is not None else jobs * 2
+    if limit < 1:
+        raise ValueError("queue_size must be at least 1")
+    if controller is not None:
+        jobs = controller.maximum
+
+    source = iter(paths)
+    pending: dict[Future[BatchResult], int] = {}
+    # Finished results held back until every earlier one is yielded (ordered only).
+    finished: dict[int, BatchResult] = {}
+    submitted = yielded = 0
+    exhausted = False
+
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="dplk-link") as pool:
+        try:
+            while True:
+                if controller is not None:
+                    limit = controller.limit
+                while not exhausted and submitted - yielded < limit:
+                    try:
+                        path = next(source)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    future = pool.submit(_generate_one, generator, path, validator)
+                    pending[future] = submitted
+                    submitted += 1
+
+                if not pending:
+                    return
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    result = future.result()
+                    if controller is not None:
+                        controller.record(result.elapsed, result.error)
+                    if ordered:
+                        finished[index] = result
+                    else:
+                        yielded += 1
+                        yield result
+                while yielded in finished:
+                    result = finished.pop(yielded)
+                    yielded += 1
+                    yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _generate_one(
+    generator: DropboxLinkGenerator,
+    path: str | Path | ValidatedPath,
+    validator: Optional[PathValidator],
+) -> BatchResult:
+    name = str(path.path) if isinstance(path, ValidatedPath) else str(path)
+    started = time.monotonic()
+    try:
+        if validator is not None:
+            link = generator.generate(path, copy=False, validator=validator)
+        else:
+            link = generator.generate(path, copy=False)
+    except Exception as exc:
+        return BatchResult(path=name, error=exc, elapsed=time.monotonic() - started)
+    return BatchResult(path=name, link=link, elapsed=time.monotonic() - started)
+
+
+__all__ = ["BatchResult", "DEFAULT_JOBS", "generate_many", "read_paths"]
@@ -0,0 +1,130 @@
+"""Adaptive (AIMD) concurrency control for batch link generation."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from ..utils.errors import DropboxRateLimitError
+
+DEFAULT_INITIAL_JOBS = 2
+DEFAULT_MAX_JOBS = 32
+# Smoothing factor for the latency average (weight of the newest sample).
+_LATENCY_ALPHA = 0.2
+# Samples needed before latency is trusted to hold back growth.
+_LATENCY_WARMUP = 4
+# Latencies below this (cache hits, local errors) say nothing about the API.
+_LATENCY_FLOOR = 0.05
+
+
+@dataclass
+class ConcurrencyReport:
+    """Where the controller ended up after a batch."""
+
+    final: int
+    peak: int
+    mean: float
+    decreases: int
+
+
+class AIMDController:
+    """Additive-increase / multiplicative-decrease limit on in-flight requests.
+
+    Every successful result grows the limit by ``increase / limit`` (about
+    ``increase`` per full window of requests). A rate-limit error, or a 429
+    absorbed by the client's retry policy (seen through ``throttle_events``),
+    multiplies the limit by ``decrease``, at most once per window so one
+    burst of 429s counts as a single congestion signal. While the smoothed
+    latency exceeds ``latency_tolerance`` times the best seen so far the
+    limit is held instead of grown.
+    """
+
+    def __init__(
+        self,
+        initial: int = DEFAULT_INITIAL_JOBS,
+        minimum: int = 1,
+        maximum: int = DEFAULT_MAX_JOBS,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_tolerance: float = 2.0,
+        throttle_events: Optional[Callable[[], int]] = None,
+    ) -> None:
+        if not 1 <= minimum <= maximum:
+            raise ValueError("minimum must be between 1 and maximum")
+        if not 0.0 < decrease < 1.0:
+            raise ValueError("decrease must be between 0 and 1")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self._throttle_events = throttle_events
+        self._lock = threading.Lock()
+        self._limit = float(min(max(initial, minimum), maximum))
+        self._seen_throttles = throttle_events() if throttle_events else 0
+        # Let the first congestion signal through immediately.
+        self._since_decrease = maximum
+        self._smoothed: Optional[float] = None
+        self._best: Optional[float] = None
+        self._samples = 0
+        self._records = 0
+        self._limit_total = 0.0
+        self._peak = int(self._limit)
+        self._decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return int(self._limit)
+
+    def record(self, latency: float, error: Optional[BaseException] = None) -> None:
+        """Feed back one finished request and adjust the limit."""
+        with self._lock:
+            self._records += 1
+            self._since_decrease += 1
+
+            throttled = isinstance(error, DropboxRateLimitError)
+            if self._throttle_events is not None:
+                seen = self._throttle_events()
+                throttled = throttled or seen > self._seen_throttles
+                self._seen_throttles = seen
+
+            if throttled:
+                if self._since_decrease >= self.limit:
+                    self._limit = max(float(self.minimum), self._limit * self.decrease)
+                    self._since_decrease = 0
+                    self._decreases += 1
+            elif error is None and not self._observe_latency(latency):
+                self._limit = min(float(self.maximum), self._limit + self.increase / self._limit)
+
+            self._peak = max(self._peak, self.limit)
+            self._limit_total += self._limit
+
+    def report(self) -> ConcurrencyReport:
+        with self._lock:
+            mean = self._limit_total / self._records if self._records else self._limit
+            return ConcurrencyReport(
+                final=self.limit, peak=self._peak, mean=mean, decreases=self._decreases
+            )
+
+    def _observe_latency(self, latency: float) -> bool:
+        """Update the latency average; return True if latency is elevated."""
+        if self._smoothed is None:
+            self._smoothed = latency
+        else:
+            self._smoothed += _LATENCY_ALPHA * (latency - self._smoothed)
+        self._samples += 1
+        if self._samples < _LATENCY_WARMUP:
+            return False
+        if self._best is None or self._smoothed < self._best:
+            self._best = self._smoothed
+        return self._smoothed > max(self._best, _LATENCY_FLOOR) * self.latency_tolerance
+
+
+__all__ = [
+    "AIMDController",
+    "ConcurrencyReport",
+    "DEFAULT_INITIAL_JOBS",
+    "DEFAULT_MAX_JOBS",
+]
@@ -0,0 +1,138 @@
+"""Keep DROPBOX_ARCHIVE_DIR within a size budget by evicting old archives."""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Mapping, Optional
+
+from ..utils.singleflight import remove_stale_lock
+from .archive import TEMP_PREFIX
+
+DEFAULT_PIN_SECONDS = 3600.0
+
+logger = logging.getLogger("dplk")
+
+
+@dataclass(frozen=True)
+class ArchiveBudget:
+    """Limits for the archive directory; ``None`` means unlimited.
+
+    Archives linked (or written) within the last ``pin_seconds`` are never
+    evicted, even if that leaves the directory over budget.
+    """
+
+    max_bytes: Optional[int] = None
+    max_count: Optional[int] = None
+    pin_seconds: float = DEFAULT_PIN_SECONDS
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes is not None or self.max_count is not None
+
+    def exceeded(self, total_bytes: int, count: int) -> bool:
+        if self.max_bytes is not None and total_bytes > self.max_bytes:
+            return True
+        return self.max_count is not None and count > self.max_count
+
+
+@dataclass
+class EvictionResult:
+    removed: list[Path] = field(default_factory=list)
+    freed_bytes: int = 0
+    remaining_bytes: int = 0
+    remaining_count: int = 0
+    # True if pinned archives alone keep the directory over budget.
+    over_budget: bool = False
+
+
+@dataclass(frozen=True)
+class _Candidate:
+    path: Path
+    size: int
+    last_used: float
+
+
+def evict_archives(
+    archive_root: Path,
+    budget: ArchiveBudget,
+    last_linked: Optional[Mapping[str, float]] = None,
+    keep: Iterable[Path] = (),
+    now: Optional[float] = None,
+) -> EvictionResult:
+    """Delete least recently used archives until ``budget`` is met.
+
+    Only archives dplk has recorded - the keys of ``last_linked``, paths as
+    strings mapped to their last link time - are counted or deleted; any
+    other file in the directory is the user's and is left alone. An
+    archive's last use is the later of its link time and its mtime, so one
+    another process has just rewritten is judged by age on disk. Paths in
+    ``keep`` and pinned archives are skipped; partial archives being
+    written are never counted. Lock files no process holds any more are
+    removed along the way.
+    """
+    now = time.time() if now is None else now
+    last_linked = last_linked or {}
+    keep_paths = {str(path) for path in keep}
+
+    candidates = []
+    try:
+        with os.scandir(archive_root) as listing:
+            for entry in listing:
+                if entry.name.startswith(TEMP_PREFIX):
+                    if entry.name.endswith(".lock"):
+                        _sweep_lock(Path(entry.path))
+                    continue
+                linked_at = last_linked.get(entry.path)
+                if linked_at is None or not entry.name.endswith(".zip"):
+                    continue
+                try:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    entry_stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                last_used = max(linked_at, entry_stat.st_mtime)
+                candidates.append(_Candidate(Path(entry.path), entry_stat.st_size, last_used))
+    except OSError as exc:
+        logger.debug("Could not list archive directory %s: %s", archive_root, exc)
+        return EvictionResult()
+
+    result = EvictionResult(
+        remaining_bytes=sum(candidate.size for candidate in candidates),
+        remaining_count=len(candidates),
+    )
+    candidates.sort(key=lambda candidate: candidate.last_used)
+    for candidate in candidates:
+        if not budget.exceeded(result.remaining_bytes, result.remaining_count):
+            break
+        if str(candidate.path) in keep_paths or now - candidate.last_used < budget.pin_seconds:
+            continue
+        try:
+            candidate.path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            logger.debug("Could not evict %s: %s", candidate.path, exc)
+            continue
+        result.removed.append(candidate.path)
+        result.freed_bytes += candidate.size
+        result.remaining_bytes -= candidate.size
+        result.remaining_count -= 1
+
+    result.over_budget = budget.exceeded(result.remaining_bytes, result.remaining_count)
+    return result
+
+
+def _sweep_lock(path: Path) -> None:
+    try:
+        if remove_stale_lock(path):
+            logger.debug("Removed stale lock file %s", path)
+    except OSError as exc:
+        logger.debug("Could not remove lock file %s: %s", path, exc)
+
+
+__all__ = ["ArchiveBudget", "DEFAULT_PIN_SECONDS", "EvictionResult", "evict_archives"]
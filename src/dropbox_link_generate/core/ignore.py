@@ -0,0 +1,177 @@
+"""gitignore-style exclusion rules for directory archives."""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+IGNORE_FILES = (".gitignore", ".dplkignore")
+
+# Never worth shipping in a shared archive. Build output (build/, dist/,
+# target/) is left to .gitignore because those names are common in
+# ordinary document folders too.
+DEFAULT_PATTERNS = (
+    ".git/",
+    ".hg/",
+    ".svn/",
+    "node_modules/",
+    "__pycache__/",
+    "*.py[cod]",
+    ".venv/",
+    "venv/",
+    ".tox/",
+    ".nox/",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    ".ruff_cache/",
+    ".DS_Store",
+    "Thumbs.db",
+    ".dropbox.cache/",
+)
+
+logger = logging.getLogger("dplk")
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    pattern: re.Pattern[str]
+    negated: bool
+    dir_only: bool
+    # Directory (relative to the archive root, "" or ending in "/") the rule
+    # was read from; patterns are matched relative to it.
+    base: str = ""
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if not rel_path.startswith(self.base):
+            return False
+        return self.pattern.fullmatch(rel_path[len(self.base) :]) is not None
+
+
+def parse_rule(line: str, base: str = "") -> Optional[IgnoreRule]:
+    """Parse one gitignore line; blank lines and comments yield ``None``."""
+    line = line.rstrip("\n").rstrip("\r")
+    if not line or line.startswith("#"):
+        return None
+    # Trailing spaces are ignored unless escaped.
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    if not line:
+        return None
+
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    # A slash anywhere but the end anchors the pattern to its directory.
+    anchored = "/" in line
+    line = line.lstrip("/")
+    regex = _translate(line)
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    return IgnoreRule(re.compile(regex, re.DOTALL), negated, dir_only, base)
+
+
+def _translate(pattern: str) -> str:
+    parts: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        char = pattern[i]
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i) and i + 2 == n and (i == 0 or pattern[i - 1] == "/"):
+            parts.append(".*")
+            i += 2
+        elif char == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif char == "?":
+            parts.append("[^/]")
+            i += 1
+        elif char == "[":
+            end = pattern.find("]", i + 2 if pattern[i + 1 : i + 2] in ("!", "]") else i + 1)
+            if end == -1:
+                parts.append(re.escape(char))
+                i += 1
+                continue
+            body = pattern[i + 1 : end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append("[" + body.replace("[", "\\[") + "]")
+            i = end + 1
+        elif char == "\\" and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(char))
+            i += 1
+    return "".join(parts)
+
+
+class IgnoreMatcher:
+    """Ordered gitignore rules; the last matching rule decides.
+
+    Rules from an ignore file apply to paths below the directory holding it,
+    and deeper files take precedence over shallower ones, as in git. Use
+    :meth:`descend` while walking to pick up each directory's ignore files.
+    """
+
+    def __init__(self, rules: Iterable[IgnoreRule] = ()) -> None:
+        self.rules = tuple(rules)
+
+    @classmethod
+    def with_defaults(cls, extra_patterns: Iterable[str] = ()) -> "IgnoreMatcher":
+        rules = []
+        for line in (*DEFAULT_PATTERNS, *extra_patterns):
+            rule = parse_rule(line)
+            if rule is not None:
+                rules.append(rule)
+        return cls(rules)
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        ignored = False
+        for rule in self.rules:
+            if rule.matches(rel_path, is_dir):
+                ignored = not rule.negated
+        return ignored
+
+    def descend(self, directory: Path, rel_dir: str) -> "IgnoreMatcher":
+        """Return a matcher that also applies ``directory``'s ignore files.
+
+        ``rel_dir`` is ``directory`` relative to the archive root ("" for the
+        root itself).
+        """
+        base = f"{rel_dir}/" if rel_dir else ""
+        added = []
+        for name in IGNORE_FILES:
+            try:
+                text = (directory / name).read_text(encoding="utf-8", errors="surrogateescape")
+            except FileNotFoundError:
+                continue
+            except OSError as exc:
+                logger.debug("Could not read %s: %s", directory / name, exc)
+                continue
+            for line in text.splitlines():
+                rule = parse_rule(line, base)
+                if rule is not None:
+                    added.append(rule)
+        if not added:
+            return self
+        return IgnoreMatcher((*self.rules, *added))
+
+
+__all__ = ["DEFAULT_PATTERNS", "IGNORE_FILES", "IgnoreMatcher", "IgnoreRule", "parse_rule"]
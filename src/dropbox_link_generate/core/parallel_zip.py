@@ -0,0 +1,272 @@
+"""Zip writer that deflates file data on several cores at once.
+
+Each file is split into fixed-size chunks that are compressed independently
+on a thread pool (zlib releases the GIL), the way pigz does it: every chunk
+is primed with the last 32 KiB of the previous one as a preset dictionary
+and ends on a sync flush, so the concatenated output is one ordinary
+deflate stream. Chunks from consecutive files are in flight together,
+which keeps all workers busy on trees of many small files too.
+
+The output is a standard zip file (with Zip64 records where needed) and is
+byte-for-byte independent of the worker count.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+CHUNK_SIZE = 1024 * 1024
+_WINDOW = 32 * 1024
+_ZIP64_LIMIT = (1 << 31) - 1
+_ZIP_FILECOUNT_LIMIT = (1 << 16) - 1
+_ZIP64_VERSION = 45
+
+_CENTRAL_DIR = struct.Struct("<4s4B4HL2L5H2L")
+_END_ARCHIVE = struct.Struct("<4s4H2LH")
+_END_ARCHIVE64 = struct.Struct("<4sQ2H2L4Q")
+_END_ARCHIVE64_LOCATOR = struct.Struct("<4sLQL")
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def _deflate_chunk(data: bytes, zdict: Optional[bytes], level: int, last: bool) -> bytes:
+    if zdict:
+        compressor = zlib.compressobj(
+            level,
+            zlib.DEFLATED,
+            -zlib.MAX_WBITS,
+            zlib.DEF_MEM_LEVEL,
+            zlib.Z_DEFAULT_STRATEGY,
+            zdict,
+        )
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(
+        zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+    )
+
+
+@dataclass
+class _Entry:
+    info: zipfile.ZipInfo
+    zip64: bool = False
+    # Accumulated by the writer as chunks land.
+    compress_size: int = 0
+
+
+@dataclass
+class _Chunk:
+    entry: _Entry
+    data: Union[bytes, Future]
+
+
+@dataclass
+class _EntryEnd:
+    entry: _Entry
+    crc: int
+    file_size: int
+
+
+@dataclass
+class ParallelZipWriter:
+    """Write a zip archive to ``stream``, compressing on ``workers`` threads.
+
+    ``stream`` must be seekable: local headers are rewritten with the final
+    CRC and sizes once an entry's data is written, as :mod:`zipfile` does.
+    At most ``max_pending`` chunks are buffered, so memory stays bounded by
+    roughly ``2 * max_pending * chunk_size`` however large the tree is.
+    """
+
+    stream: BinaryIO
+    workers: int = field(default_factory=default_workers)
+    level: int = 6
+    chunk_size: int = CHUNK_SIZE
+    max_pending: Optional[int] = None
+    _pool: ThreadPoolExecutor = field(init=False, repr=False)
+    _queue: deque = field(default_factory=deque, init=False, repr=False)
+    _entries: list = field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.workers < 1:
+            raise ValueError("workers must be at least 1")
+        if self.max_pending is None:
+            self.max_pending = self.workers * 4
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="dplk-zip")
+
+    def __enter__(self) -> "ParallelZipWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def add_directory(self, info: zipfile.ZipInfo) -> None:
+        info.compress_type = zipfile.ZIP_STORED
+        info.file_size = info.compress_size = 0
+        info.CRC = 0
+        entry = _Entry(info)
+        self._queue.append(entry)
+        self._queue.append(_EntryEnd(entry, crc=0, file_size=0))
+        self._drain(self.max_pending)
+
+    def add_file(self, path: Path, info: zipfile.ZipInfo) -> None:
+        """Queue ``path`` under ``info``; data is read in bounded chunks."""
+        compress = info.compress_type == zipfile.ZIP_DEFLATED
+        # Placeholders until the data is written and the header is rewritten.
+        info.CRC = info.compress_size = 0
+        entry = _Entry(info, zip64=info.file_size * 1.05 > _ZIP64_LIMIT)
+        self._queue.append(entry)
+
+        crc = 0
+        size = 0
+        zdict: Optional[bytes] = None
+        with open(path, "rb") as source:
+            data = source.read(self.chunk_size)
+            while True:
+                following = source.read(self.chunk_size) if data else b""
+                last = not following
+                crc = zlib.crc32(data, crc)
+                size += len(data)
+                if compress:
+                    payload = self._pool.submit(_deflate_chunk, data, zdict, self.level, last)
+                    zdict = data[-_WINDOW:]
+                else:
+                    payload = data
+                self._queue.append(_Chunk(entry, payload))
+                self._drain(self.max_pending)
+                if last:
+                    break
+                data = following
+
+        self._queue.append(_EntryEnd(entry, crc=crc, file_size=size))
+
+    @property
+    def written(self) -> list[zipfile.ZipInfo]:
+        """Entries fully written so far, with final sizes and CRCs."""
+        return list(self._entries)
+
+    def close(self) -> None:
+        try:
+            self._drain(0)
+            self._write_central_directory()
+            self.stream.flush()
+        finally:
+            self._pool.shutdown(wait=True)
+
+    def _drain(self, keep: int) -> None:
+        while len(self._queue) > keep:
+            item = self._queue.popleft()
+            if isinstance(item, _Entry):
+                item.info.header_offset = self.stream.tell()
+                self.stream.write(item.info.FileHeader(item.zip64))
+            elif isinstance(item, _Chunk):
+                data = item.data.result() if isinstance(item.data, Future) else item.data
+                self.stream.write(data)
+                item.entry.compress_size += len(data)
+            else:
+                self._finish_entry(item)
+
+    def _finish_entry(self, end: _EntryEnd) -> None:
+        info = end.entry.info
+        info.CRC = end.crc
+        info.file_size = end.file_size
+        info.compress_size = end.entry.compress_size
+        if not end.entry.zip64 and (
+            info.file_size > _ZIP64_LIMIT or info.compress_size > _ZIP64_LIMIT
+        ):
+            raise RuntimeError(f"{info.filename} grew past the Zip64 limit while archiving")
+
+        position = self.stream.tell()
+        self.stream.seek(info.header_offset)
+        self.stream.write(info.FileHeader(end.entry.zip64))
+        self.stream.seek(position)
+        self._entries.append(info)
+
+    def _write_central_directory(self) -> None:
+        start = self.stream.tell()
+        for info in self._entries:
+            self._write_central_record(info)
+        end = self.stream.tell()
+
+        count = len(self._entries)
+        size = end - start
+        if count > _ZIP_FILECOUNT_LIMIT or start > _ZIP64_LIMIT or size > _ZIP64_LIMIT:
+            self.stream.write(
+                _END_ARCHIVE64.pack(b"PK\x06\x06", 44, 45, 45, 0, 0, count, count, size, start)
+            )
+            self.stream.write(_END_ARCHIVE64_LOCATOR.pack(b"PK\x06\x07", 0, end, 1))
+            count = min(count, 0xFFFF)
+            size = min(size, 0xFFFFFFFF)
+            start = min(start, 0xFFFFFFFF)
+        self.stream.write(_END_ARCHIVE.pack(b"PK\x05\x06", 0, 0, count, count, size, start, 0))
+
+    def _write_central_record(self, info: zipfile.ZipInfo) -> None:
+        year, month, day, hour, minute, second = info.date_time
+        dosdate = (year - 1980) << 9 | month << 5 | day
+        dostime = hour << 11 | minute << 5 | (second // 2)
+
+        zip64_fields = []
+        file_size, compress_size = info.file_size, info.compress_size
+        if file_size > _ZIP64_LIMIT or compress_size > _ZIP64_LIMIT:
+            zip64_fields += [file_size, compress_size]
+            file_size = compress_size = 0xFFFFFFFF
+        header_offset = info.header_offset
+        if header_offset > _ZIP64_LIMIT:
+            zip64_fields.append(header_offset)
+            header_offset = 0xFFFFFFFF
+
+        extra = b""
+        version = info.extract_version
+        if zip64_fields:
+            count = len(zip64_fields)
+            extra = struct.pack(f"<HH{count}Q", 1, 8 * count, *zip64_fields)
+            version = max(version, _ZIP64_VERSION)
+
+        filename, flag_bits = _encode_filename(info)
+        self.stream.write(
+            _CENTRAL_DIR.pack(
+                b"PK\x01\x02",
+                max(version, info.create_version),
+                info.create_system,
+                version,
+                info.reserved,
+                flag_bits,
+                info.compress_type,
+                dostime,
+                dosdate,
+                info.CRC,
+                compress_size,
+                file_size,
+                len(filename),
+                len(extra),
+                0,
+                0,
+                info.internal_attr,
+                info.external_attr,
+                header_offset,
+            )
+        )
+        self.stream.write(filename)
+        self.stream.write(extra)
+
+
+def _encode_filename(info: zipfile.ZipInfo) -> tuple[bytes, int]:
+    try:
+        return info.filename.encode("ascii"), info.flag_bits
+    except UnicodeEncodeError:
+        return info.filename.encode("utf-8"), info.flag_bits | 0x800
+
+
+__all__ = ["CHUNK_SIZE", "ParallelZipWriter", "default_workers"]
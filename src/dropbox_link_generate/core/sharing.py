@@ -1,16 +1,41 @@
 from __future__ import annotations
 
 import logging
-import shutil
-import tempfile
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+from ..services.archive_manifest import ArchiveManifestStore
+from ..services.content_hash_store import ContentHashStore
 from ..services.dropbox_client import DropboxClient
+from ..services.link_cache import SharedLinkCache
+from ..services.link_index import SharedLinkIndex
 from ..utils.clipboard import copy_to_clipboard
+from ..utils.content_hash import content_hash
 from ..utils.errors import ConfigError, NotInDropboxRoot, PathValidationError
-from ..utils.paths import normalize_and_validate_path
+from ..utils.paths import PathValidator, ValidatedPath, normalize_and_validate_path
+from ..utils.singleflight import SingleFlight, file_lock
+from .archive import (
+    DEFAULT_LEVEL,
+    TEMP_PREFIX,
+    fingerprint_directory,
+    tree_exceeds,
+    write_archive,
+)
+from .eviction import ArchiveBudget, evict_archives
+from .ignore import IgnoreMatcher
+from .sync import SyncWaiter
+
+# How directory inputs are linked.
+ARCHIVE = "archive"
+FOLDER = "folder"
+AUTO = "auto"
+DIRECTORY_MODES = (ARCHIVE, FOLDER, AUTO)
+# In auto mode, trees above either threshold get a folder link instead of
+# being zipped.
+DEFAULT_FOLDER_MIN_BYTES = 1024**3
+DEFAULT_FOLDER_MIN_FILES = 10_000
 
 
 @dataclass
@@ -19,13 +44,40 @@ class DropboxLinkGenerator:
     client: DropboxClient
     logger: logging.Logger
     archive_dir: Optional[Path] = None
+    cache: Optional[SharedLinkCache] = None
+    index: Optional[SharedLinkIndex] = None
+    manifests: Optional[ArchiveManifestStore] = None
+    hashes: Optional[ContentHashStore] = None
+    hash_archives: bool = False
+    archive_workers: Optional[int] = None
+    archive_level: int = DEFAULT_LEVEL
+    deterministic_archives: bool = False
+    archive_ignore: bool = True
+    archive_budget: Optional[ArchiveBudget] = None
+    # Seconds to wait for the desktop client to upload a file before linking
+    # it; None links immediately.
+    wait_for_sync: Optional[float] = None
+    verify_sync_hash: bool = False
+    directory_mode: str = ARCHIVE
+    folder_min_bytes: Optional[int] = DEFAULT_FOLDER_MIN_BYTES
+    folder_min_files: Optional[int] = DEFAULT_FOLDER_MIN_FILES
+    _evict_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _archive_flights: SingleFlight = field(default_factory=SingleFlight, init=False, repr=False)
 
-    def generate(self, user_path: str | Path, copy: bool = True) -> str:
-        prepared_path = self._prepare_path(user_path)
-        resolved, api_path = normalize_and_validate_path(prepared_path, self.dropbox_root)
-        self.logger.debug("Resolved path %s to Dropbox API path %s", resolved, api_path)
+    def generate(
+        self,
+        user_path: str | Path | ValidatedPath,
+        copy: bool = True,
+        validator: Optional[PathValidator] = None,
+    ) -> str:
+        """Return the shared link for ``user_path``, archiving directories first.
 
-        link = self.client.get_or_create_shared_link(api_path)
+        Batches pass a shared ``validator`` so files in the same directories
+        are checked with one ``lstat`` each; results are unchanged. A
+        :class:`ValidatedPath` file is linked as is, or its error raised.
+        """
+        resolved, api_path = self._locate(user_path, validator)
+        link = self._resolve_link(resolved, api_path)
         self.logger.info("Generated/Found link: %s", link)
 
         if copy:
@@ -39,11 +91,81 @@ class DropboxLinkGenerator:
         return link
 
     # Internal helpers -------------------------------------------------
+    def _locate(
+        self,
+        user_path: str | Path | ValidatedPath,
+        validator: Optional[PathValidator] = None,
+    ) -> tuple[Path, str]:
+        """Archive directories as configured and return ``(resolved, api_path)``."""
+        if isinstance(user_path, ValidatedPath):
+            if user_path.error is not None:
+                raise user_path.error
+            return user_path.resolved, user_path.api_path
+        if validator is not None:
+            try:
+                resolved, api_path = validator.validate(user_path)
+            except PathValidationError:
+                # Directories and invalid paths take the full route below,
+                # which archives them or raises the usual error.
+                pass
+            else:
+                self.logger.debug("Resolved path %s to Dropbox API path %s", resolved, api_path)
+                return resolved, api_path
+        prepared_path = self._prepare_path(user_path)
+        resolved, api_path = normalize_and_validate_path(
+            prepared_path, self.dropbox_root, allow_directories=prepared_path.is_dir()
+        )
+        self.logger.debug("Resolved path %s to Dropbox API path %s", resolved, api_path)
+        return resolved, api_path
+
+    def _resolve_link(self, resolved: Path, api_path: str) -> str:
+        if self.cache is None:
+            return self._fetch_link(resolved, api_path)
+
+        stat = resolved.stat()
+        cached = self.cache.get(api_path, stat.st_size, stat.st_mtime_ns)
+        if cached:
+            self.logger.debug("Link cache hit for %s", api_path)
+            return cached
+
+        link = self._fetch_link(resolved, api_path)
+        self.cache.put(api_path, link, stat.st_size, stat.st_mtime_ns)
+        return link
+
+    def _fetch_link(self, resolved: Path, api_path: str) -> str:
+        is_folder = resolved.is_dir()
+        # Sync waits track files; a folder link does not depend on its contents.
+        if self.wait_for_sync is not None and not is_folder:
+            self._wait_for_sync(resolved, api_path)
+        indexed = self._indexed_link(api_path)
+        if indexed:
+            return indexed
+        if is_folder:
+            return self.client.get_or_create_shared_link(api_path, raw=False)
+        return self.client.get_or_create_shared_link(api_path)
+
+    def _indexed_link(self, api_path: str) -> Optional[str]:
+        if self.index is None:
+            return None
+        indexed = self.index.lookup(api_path)
+        if indexed:
+            self.logger.debug("Link index hit for %s", api_path)
+        return indexed
+
+    def _wait_for_sync(self, resolved: Path, api_path: str) -> None:
+        expected = content_hash(resolved, cache=self.hashes) if self.verify_sync_hash else None
+        waiter = SyncWaiter(self.client, timeout=self.wait_for_sync)
+        remote = waiter.wait(api_path, expected_hash=expected)
+        self.logger.debug("Dropbox has %s (%d bytes)", remote.path_lower, remote.size)
+
     def _prepare_path(self, user_path: str | Path) -> Path:
         path = Path(user_path).expanduser()
 
         if path.is_dir():
             resolved_dir = self._validate_directory(path)
+            if self._links_as_folder(resolved_dir):
+                self.logger.debug("Linking directory %s as a shared folder", resolved_dir)
+                return resolved_dir
             archive_path = self._archive_directory(resolved_dir)
             self.logger.debug(
                 "Archived directory %s to %s before link generation",
@@ -54,6 +176,21 @@ class DropboxLinkGenerator:
 
         return path
 
+    def _links_as_folder(self, directory: Path) -> bool:
+        if self.directory_mode == FOLDER:
+            return True
+        if self.directory_mode != AUTO:
+            return False
+        if self.archive_dir is None:
+            return True
+        ignore = IgnoreMatcher.with_defaults() if self.archive_ignore else None
+        return tree_exceeds(
+            directory,
+            max_bytes=self.folder_min_bytes,
+            max_files=self.folder_min_files,
+            ignore=ignore,
+        )
+
     def _validate_directory(self, directory: Path) -> Path:
         if not directory.exists():
             raise PathValidationError(f"Path does not exist: {directory}")
@@ -76,7 +213,10 @@ class DropboxLinkGenerator:
 
     def _archive_directory(self, directory: Path) -> Path:
         if self.archive_dir is None:
-            raise ConfigError("Directory inputs require DROPBOX_ARCHIVE_DIR to be configured")
+            raise ConfigError(
+                "Directory inputs require DROPBOX_ARCHIVE_DIR to be configured "
+                "(or DPLK_DIRECTORY_MODE=folder to share them as folders)"
+            )
 
         archive_root = self.archive_dir.resolve()
         root = self.dropbox_root.resolve()
@@ -87,27 +227,84 @@ class DropboxLinkGenerator:
 
         archive_name = directory.name + ".zip"
         destination = archive_root / archive_name
+        # Workers asking for the same directory share one build.
+        return self._archive_flights.do(
+            (directory, destination),
+            lambda: self._build_archive(directory, archive_root, destination),
+        )
+
+    def _build_archive(self, directory: Path, archive_root: Path, destination: Path) -> Path:
+        # Other dplk processes may be building the same destination. Once
+        # their lock is released, the manifest check below normally finds
+        # their archive and reuses it instead of zipping the tree again.
+        with file_lock(archive_root / f"{TEMP_PREFIX}{destination.name}.lock"):
+            return self._build_archive_locked(directory, archive_root, destination)
 
-        with tempfile.TemporaryDirectory(prefix="dplk-zip-") as tmpdir:
-            temp_base = Path(tmpdir) / directory.name
-            shutil.make_archive(
-                base_name=str(temp_base),
-                format="zip",
-                root_dir=str(directory.parent),
-                base_dir=directory.name,
+    def _build_archive_locked(
+        self, directory: Path, archive_root: Path, destination: Path
+    ) -> Path:
+        ignore = IgnoreMatcher.with_defaults() if self.archive_ignore else None
+        fingerprint = None
+        if self.manifests is not None:
+            fingerprint = fingerprint_directory(
+                directory,
+                hash_contents=self.hash_archives,
+                options=(
+                    f"level={self.archive_level};"
+                    f"deterministic={int(self.deterministic_archives)};"
+                    f"ignore={int(self.archive_ignore)}"
+                ),
+                ignore=ignore,
             )
-            temp_zip = temp_base.with_suffix(".zip")
+            if self.manifests.matches(directory, destination, fingerprint.digest):
+                self.logger.debug("Directory %s unchanged; reusing %s", directory, destination)
+                self._record_archive_use(archive_root, destination)
+                return destination
 
-            if destination.exists():
-                if destination.is_dir():
-                    raise PathValidationError(
-                        f"Archive destination is a directory, cannot overwrite: {destination}"
-                    )
-                destination.unlink()
+        stats = write_archive(
+            directory,
+            destination,
+            workers=self.archive_workers,
+            level=self.archive_level,
+            deterministic=self.deterministic_archives,
+            ignore=ignore,
+        )
+        self.logger.info("Archived %s: %s", directory, stats.summary())
+        if self.manifests is not None and fingerprint is not None:
+            self.manifests.record(directory, destination, fingerprint.digest, fingerprint.entries)
+        self._record_archive_use(archive_root, destination)
+        return destination
 
-            shutil.move(str(temp_zip), destination)
+    def _record_archive_use(self, archive_root: Path, archive: Path) -> None:
+        if self.manifests is not None:
+            self.manifests.touch(archive)
+        if self.archive_budget is None or not self.archive_budget.enabled:
+            return
 
-        return destination
+        # One sweep at a time; concurrent links would only race for the same files.
+        with self._evict_lock:
+            last_linked = self.manifests.last_linked() if self.manifests is not None else None
+            result = evict_archives(
+                archive_root, self.archive_budget, last_linked=last_linked, keep=(archive,)
+            )
+            for removed in result.removed:
+                if self.manifests is not None:
+                    self.manifests.forget(removed)
+        if result.removed:
+            self.logger.info(
+                "Evicted %d archive(s) from %s, freeing %d bytes",
+                len(result.removed),
+                archive_root,
+                result.freed_bytes,
+            )
+        if result.over_budget:
+            self.logger.warning(
+                "Archive directory %s is over budget (%d bytes in %d archives); "
+                "remaining archives are pinned by recent links",
+                archive_root,
+                result.remaining_bytes,
+                result.remaining_count,
+            )
 
     @staticmethod
     def _is_subpath(child: Path, parent: Path) -> bool:
@@ -116,3 +313,14 @@ class DropboxLinkGenerator:
             return True
         except Exception:
             return False
+
+
+__all__ = [
+    "ARCHIVE",
+    "AUTO",
+    "DEFAULT_FOLDER_MIN_BYTES",
+    "DEFAULT_FOLDER_MIN_FILES",
+    "DIRECTORY_MODES",
+    "DropboxLinkGenerator",
+    "FOLDER",
+]
@@ -0,0 +1,106 @@
+"""Wait for the Dropbox desktop client to upload a file before linking it."""
+
+from __future__ import annotations
+
+import logging
+import posixpath
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from ..services.dropbox_client import DropboxClient, RemoteFile
+from ..utils.errors import DropboxClientError, SyncTimeoutError
+
+DEFAULT_SYNC_TIMEOUT = 300.0
+# files/list_folder/longpoll accepts timeouts between 30 and 480 seconds, and
+# Dropbox may hold it open up to 90 seconds past the one requested.
+_LONGPOLL_MIN = 30
+_LONGPOLL_MAX = 480
+_LONGPOLL_JITTER = 90
+# Metadata polling interval once too little time is left for a longpoll.
+_POLL_INTERVAL = 5.0
+
+logger = logging.getLogger("dplk")
+
+
+@dataclass
+class SyncWaiter:
+    """Block until a path exists in the cloud, optionally with given content.
+
+    Watches the file's parent folder with ``files/list_folder/longpoll``, so
+    waiting costs one held-open request per ~8 minutes instead of a stream
+    of failed link attempts. If the parent folder has not been uploaded yet
+    either (a fresh archive directory), the nearest existing ancestor is
+    watched recursively instead.
+
+    Each longpoll asks for the remaining time less Dropbox's 90 second
+    jitter, so it cannot outlast ``timeout``; once that leaves less than the
+    30 second minimum, the wait falls back to polling the file's metadata
+    every few seconds until the deadline.
+    """
+
+    client: DropboxClient
+    timeout: float = DEFAULT_SYNC_TIMEOUT
+    sleep: Callable[[float], None] = field(default=time.sleep, repr=False)
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False)
+
+    def wait(self, api_path: str, expected_hash: Optional[str] = None) -> RemoteFile:
+        """Return the remote file at ``api_path`` once it is synced.
+
+        With ``expected_hash`` (see :mod:`utils.content_hash`) an older
+        version already in the cloud does not count; the wait continues
+        until the uploaded content matches. Raises
+        :class:`SyncTimeoutError` when ``timeout`` expires first.
+        """
+        deadline = self.clock() + self.timeout
+        target = api_path.lower()
+        # Take the cursor before the first check so no upload slips between them.
+        cursor = self._cursor_for(api_path)
+        remote = self.client.get_file_metadata(api_path)
+        if self._is_ready(remote, expected_hash):
+            return remote
+        logger.info("Waiting for Dropbox to sync %s", api_path)
+
+        while True:
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                raise SyncTimeoutError(
+                    f"Timed out after {self.timeout:.0f}s waiting for Dropbox to sync {api_path}"
+                )
+            poll_timeout = int(min(remaining - _LONGPOLL_JITTER, _LONGPOLL_MAX))
+            if poll_timeout < _LONGPOLL_MIN:
+                self.sleep(min(_POLL_INTERVAL, remaining))
+                remote = self.client.get_file_metadata(api_path)
+                if self._is_ready(remote, expected_hash):
+                    return remote
+                continue
+            changes, backoff = self.client.longpoll(cursor, timeout=poll_timeout)
+            if changes:
+                entries, cursor = self.client.list_folder_changes(cursor)
+                for entry in entries:
+                    if entry.path_lower == target and self._is_ready(entry, expected_hash):
+                        return entry
+            if backoff:
+                self.sleep(backoff)
+
+    def _cursor_for(self, api_path: str) -> str:
+        folder = posixpath.dirname(api_path.rstrip("/"))
+        recursive = False
+        while True:
+            api_folder = "" if folder == "/" else folder
+            cursor = self.client.latest_cursor(api_folder, recursive=recursive)
+            if cursor is not None:
+                return cursor
+            if not api_folder:
+                raise DropboxClientError("Cannot list the Dropbox root folder")
+            folder = posixpath.dirname(folder)
+            recursive = True
+
+    @staticmethod
+    def _is_ready(remote: Optional[RemoteFile], expected_hash: Optional[str]) -> bool:
+        if remote is None:
+            return False
+        return expected_hash is None or remote.content_hash == expected_hash
+
+
+__all__ = ["DEFAULT_SYNC_TIMEOUT", "SyncWaiter"]
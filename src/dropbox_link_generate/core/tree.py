@@ -0,0 +1,138 @@
+"""Enumerate and validate every file under a directory for `dplk tree`."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from ..utils.errors import NotInDropboxRoot, PathValidationError
+from ..utils.paths import (
+    PathValidator,
+    ValidatedPath,
+    _absolute,
+    _check_textually_under,
+    _is_subpath,
+)
+from .ignore import IgnoreMatcher, parse_rule
+
+
+def walk_tree(
+    directory: str | Path,
+    validator: PathValidator,
+    include: Iterable[str] = (),
+    exclude: Iterable[str] = (),
+    ignore: Optional[IgnoreMatcher] = None,
+) -> Iterator[ValidatedPath]:
+    """Lazily yield a :class:`ValidatedPath` for each file under ``directory``.
+
+    ``include`` and ``exclude`` are gitignore-style globs matched against
+    paths relative to ``directory``: ``*.pdf`` matches at any depth,
+    ``docs/*.pdf`` only directly below ``docs``, and a trailing ``/`` only
+    matches directories. A file is kept when it, or a directory above it,
+    matches an ``include`` pattern (or none are given), and nothing on its
+    way matches an ``exclude`` pattern; excluded directories are not
+    entered. ``ignore`` additionally applies each directory's ignore files,
+    as for archives.
+
+    Files come in path order - sorted by their path relative to
+    ``directory`` - and their ``path`` keeps ``directory`` as given, while
+    ``resolved`` and ``api_path`` are those of the real file. Entries are
+    checked with ``validator`` from their :func:`os.scandir` data, without
+    further syscalls; a file that fails validation is yielded with its
+    error. Symlinked directories are not followed. ``directory`` itself is
+    checked before this returns.
+    """
+    top = _absolute(directory)
+    root = validator.dropbox_root
+    if top != root:
+        _check_textually_under(top, root)
+    if not top.is_dir():
+        raise PathValidationError(f"Not a directory: {top}")
+    real = top.resolve()
+    if real != root and not _is_subpath(real, root):
+        raise NotInDropboxRoot("Symlink target escapes DROPBOX_ROOT; refusing to follow")
+    return _walk(
+        real,
+        os.path.expanduser(os.fspath(directory)),
+        "",
+        validator,
+        _matcher(include),
+        _matcher(exclude),
+        ignore,
+        included=False,
+    )
+
+
+def _matcher(patterns: Iterable[str]) -> Optional[IgnoreMatcher]:
+    rules = [rule for rule in map(parse_rule, patterns) if rule is not None]
+    return IgnoreMatcher(rules) if rules else None
+
+
+def _walk(
+    directory: Path,
+    shown_dir: str,
+    rel_dir: str,
+    validator: PathValidator,
+    include: Optional[IgnoreMatcher],
+    exclude: Optional[IgnoreMatcher],
+    ignore: Optional[IgnoreMatcher],
+    included: bool,
+) -> Iterator[ValidatedPath]:
+    # ``included``: a directory above matched an include pattern.
+    if ignore is not None:
+        ignore = ignore.descend(directory, rel_dir)
+    try:
+        with os.scandir(directory) as listing:
+            entries = []
+            for entry in listing:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                entries.append((entry, is_dir))
+    except OSError:
+        return
+    # "a/" sorts after "a.txt" just as "a/b" does, so a directory's files
+    # interleave with its siblings exactly as full relative paths sort.
+    entries.sort(key=lambda item: item[0].name + "/" if item[1] else item[0].name)
+
+    for entry, is_dir in entries:
+        rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        if ignore is not None and ignore.is_ignored(rel_path, is_dir):
+            continue
+        if exclude is not None and exclude.is_ignored(rel_path, is_dir):
+            continue
+        # The include matcher's "ignored" means "matched".
+        selected = included or include is None or include.is_ignored(rel_path, is_dir)
+        if is_dir:
+            if not entry.is_symlink():
+                yield from _walk(
+                    Path(entry.path),
+                    os.path.join(shown_dir, entry.name),
+                    rel_path,
+                    validator,
+                    include,
+                    exclude,
+                    ignore,
+                    included=selected,
+                )
+            continue
+        if not selected:
+            continue
+        # Skips sockets, devices and dangling symlinks, like the archive walk.
+        try:
+            if not entry.is_file():
+                continue
+        except OSError:
+            continue
+        shown = os.path.join(shown_dir, entry.name)
+        try:
+            resolved, api_path = validator.validate_entry(entry)
+        except PathValidationError as exc:
+            yield ValidatedPath(shown, error=exc)
+        else:
+            yield ValidatedPath(shown, resolved, api_path)
+
+
+__all__ = ["walk_tree"]
@@ -1,8 +1,20 @@
-"""Diagnostic helpers and utilities for admin workflows."""
+"""Diagnostic helpers and utilities for admin workflows.
 
-from .auth_debug import run_auth_debug
-from .permissions import check_permissions
-from .suite import DiagnosisSuite, run_diagnosis_suite
+Submodules are imported on first attribute access so that importing the
+package (e.g. for ``diagnostics.common``) does not load the Dropbox SDK.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+_EXPORTS = {
+    "check_permissions": ".permissions",
+    "run_diagnosis_suite": ".suite",
+    "DiagnosisSuite": ".suite",
+    "run_auth_debug": ".auth_debug",
+}
 
 __all__ = [
     "check_permissions",
@@ -10,3 +22,10 @@ __all__ = [
     "DiagnosisSuite",
     "run_auth_debug",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_EXPORTS[name], __name__)
+    return getattr(module, name)
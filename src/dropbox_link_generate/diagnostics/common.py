@@ -5,11 +5,22 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import dropbox
 from dotenv import load_dotenv
 
+from ..services.token_store import (
+    UNKNOWN_EXPIRY,
+    CachedToken,
+    TokenStore,
+    configured_token_store,
+)
+from ..utils.config import Config
+from ..utils.errors import ConfigError
+
+if TYPE_CHECKING:
+    import dropbox
+
 
 @dataclass
 class Credentials:
@@ -69,16 +80,56 @@ def validate_env() -> EnvCheck:
     return EnvCheck(missing=missing, dropbox_root=dropbox_root)
 
 
-def build_client(credentials: Credentials) -> dropbox.Dropbox:
-    """Instantiate a Dropbox client from credentials."""
+def build_client(
+    credentials: Credentials,
+    token_store: Optional[TokenStore] = None,
+) -> dropbox.Dropbox:
+    """Instantiate a Dropbox client from credentials.
+
+    Uses the token store the configuration asks for (none with
+    ``DPLK_TOKEN_CACHE=0``) unless ``token_store`` is given. A supplied
+    access token is used as is; otherwise a cached one is reused while it is
+    still valid, or the token is refreshed once up front and cached for the
+    next invocation.
+    """
+
+    import dropbox
 
     if not credentials.app_key or not credentials.app_secret or not credentials.refresh_token:
         raise ValueError("Missing Dropbox OAuth credentials")
 
-    return dropbox.Dropbox(
+    store = token_store
+    if store is None:
+        try:
+            store = configured_token_store(Config.from_env())
+        except ConfigError:
+            # Diagnostics must work with an incomplete configuration.
+            store = None
+    access_token = credentials.access_token
+    expiration = UNKNOWN_EXPIRY if access_token is not None else None
+    if access_token is None and store is not None:
+        cached = store.load(credentials.app_key, credentials.refresh_token)
+        if cached is not None:
+            access_token, expiration = cached.access_token, cached.expires_at
+
+    client = dropbox.Dropbox(
         app_key=credentials.app_key,
         app_secret=credentials.app_secret,
         oauth2_refresh_token=credentials.refresh_token,
-        oauth2_access_token=credentials.access_token,
+        oauth2_access_token=access_token,
+        oauth2_access_token_expiration=expiration,
         timeout=10.0,
     )
+
+    if access_token is None:
+        client.refresh_access_token()
+        # The SDK exposes no public accessors for its token state.
+        token = client._oauth2_access_token
+        expires_at = client._oauth2_access_token_expiration
+        if store is not None and token and expires_at:
+            store.save(
+                credentials.app_key,
+                credentials.refresh_token,
+                CachedToken(access_token=token, expires_at=expires_at),
+            )
+    return client
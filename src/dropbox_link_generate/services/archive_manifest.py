@@ -0,0 +1,154 @@
+"""Remember which directory state each archive in DROPBOX_ARCHIVE_DIR holds."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from .link_cache import connect_store
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS archive_manifests (
+        scope TEXT NOT NULL,
+        source TEXT NOT NULL,
+        archive TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        archive_size INTEGER NOT NULL,
+        archive_mtime_ns INTEGER NOT NULL,
+        entries INTEGER NOT NULL,
+        archived_at REAL NOT NULL,
+        PRIMARY KEY (scope, source)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS archive_usage (
+        scope TEXT NOT NULL,
+        archive TEXT NOT NULL,
+        last_linked_at REAL NOT NULL,
+        PRIMARY KEY (scope, archive)
+    )
+    """,
+)
+
+logger = logging.getLogger("dplk")
+
+
+class ArchiveManifestStore:
+    """Map source directories to the fingerprint of their last archive.
+
+    A directory whose fingerprint (see :func:`core.archive.fingerprint_directory`)
+    is unchanged can reuse its zip, provided the zip itself is still the file
+    that was written: its size and mtime are recorded too, so an archive that
+    was edited, replaced or deleted is rebuilt. Shares the SQLite file with
+    :class:`SharedLinkCache`.
+
+    It also records when each archive was last linked, which drives LRU
+    eviction of the archive directory.
+    """
+
+    def __init__(self, path: Path, scope: str = "") -> None:
+        self.path = path
+        self.scope = scope
+        self._lock = threading.Lock()
+        self._conn = connect_store(path)
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+
+    def matches(self, source: Path, archive: Path, fingerprint: str) -> bool:
+        """Return True if ``archive`` was built from ``source`` in this state."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT archive, fingerprint, archive_size, archive_mtime_ns "
+                    "FROM archive_manifests WHERE scope = ? AND source = ?",
+                    (self.scope, str(source)),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.debug("Archive manifest lookup failed for %s: %s", source, exc)
+            return False
+        if row is None:
+            return False
+
+        recorded_archive, recorded_fingerprint, size, mtime_ns = row
+        if recorded_archive != str(archive) or recorded_fingerprint != fingerprint:
+            return False
+        try:
+            stat = archive.stat()
+        except OSError:
+            return False
+        return stat.st_size == size and stat.st_mtime_ns == mtime_ns
+
+    def record(self, source: Path, archive: Path, fingerprint: str, entries: int) -> None:
+        """Remember that ``archive`` now holds ``source`` at ``fingerprint``."""
+        try:
+            stat = archive.stat()
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO archive_manifests "
+                    "(scope, source, archive, fingerprint, archive_size, archive_mtime_ns, "
+                    "entries, archived_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        self.scope,
+                        str(source),
+                        str(archive),
+                        fingerprint,
+                        stat.st_size,
+                        stat.st_mtime_ns,
+                        entries,
+                        time.time(),
+                    ),
+                )
+        except (OSError, sqlite3.Error) as exc:
+            logger.debug("Archive manifest write failed for %s: %s", source, exc)
+
+    def touch(self, archive: Path, when: Optional[float] = None) -> None:
+        """Record that a link to ``archive`` was just handed out."""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO archive_usage (scope, archive, last_linked_at) "
+                    "VALUES (?, ?, ?)",
+                    (self.scope, str(archive), time.time() if when is None else when),
+                )
+        except sqlite3.Error as exc:
+            logger.debug("Archive usage write failed for %s: %s", archive, exc)
+
+    def last_linked(self) -> dict[str, float]:
+        """Map archive paths to the time they were last linked."""
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT archive, last_linked_at FROM archive_usage WHERE scope = ?",
+                    (self.scope,),
+                ).fetchall()
+        except sqlite3.Error as exc:
+            logger.debug("Archive usage lookup failed: %s", exc)
+            return {}
+        return dict(rows)
+
+    def forget(self, archive: Path) -> None:
+        """Drop manifest and usage records for a deleted ``archive``."""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "DELETE FROM archive_manifests WHERE scope = ? AND archive = ?",
+                    (self.scope, str(archive)),
+                )
+                self._conn.execute(
+                    "DELETE FROM archive_usage WHERE scope = ? AND archive = ?",
+                    (self.scope, str(archive)),
+                )
+        except sqlite3.Error as exc:
+            logger.debug("Archive manifest cleanup failed for %s: %s", archive, exc)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = ["ArchiveManifestStore"]
@@ -0,0 +1,390 @@
+"""Non-blocking Dropbox client for asyncio applications.
+
+Talks to the same RPC endpoints as :class:`DropboxClient`, encoding
+arguments and decoding replies with the SDK's own serializers, but sends
+them through an :class:`AsyncTransport` instead of ``requests``. The
+default transport needs the optional ``aiohttp`` dependency
+(``pip install 'dropbox-link-generate[async]'``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import ssl
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Mapping, Optional, Protocol, TypeVar
+from urllib.parse import urlencode
+
+from dropbox import auth, sharing, stone_serializers
+from dropbox.exceptions import (
+    ApiError,
+    AuthError,
+    BadInputError,
+    HttpError,
+    InternalServerError,
+    RateLimitError,
+)
+from dropbox.session import API_HOST
+
+from ..utils.config import DropboxOAuthCredentials
+from ..utils.errors import (
+    ConfigError,
+    DropboxAuthError,
+    DropboxClientError,
+    DropboxRateLimitError,
+)
+from ..utils.singleflight import AsyncSingleFlight
+from .dropbox_client import (
+    ADAPTIVE,
+    _already_existing_link,
+    _is_expired_token,
+    _StrategyTracker,
+    _to_raw_url,
+)
+from .retry import RetryPolicy
+from .token_store import DEFAULT_REFRESH_MARGIN, CachedToken, TokenStore, _utcnow
+from .transport import DEFAULT_POOL_SIZE
+
+T = TypeVar("T")
+
+TOKEN_URL = f"https://{API_HOST}/oauth2/token"
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    status: int
+    # Header names are lower-cased.
+    headers: Mapping[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body.decode("utf-8"))
+
+
+class AsyncTransport(Protocol):
+    """Sends one HTTPS POST; implementations own connection pooling.
+
+    Connection failures must surface as :class:`ConnectionError` and
+    timeouts as :class:`TimeoutError` so the retry policy recognises them.
+    """
+
+    async def post(
+        self, url: str, headers: Mapping[str, str], body: bytes, timeout: float
+    ) -> HttpResponse: ...
+
+    async def close(self) -> None: ...
+
+
+def _import_aiohttp():
+    try:
+        import aiohttp
+    except ImportError as exc:
+        raise ConfigError(
+            "The asyncio API needs aiohttp; install it with "
+            "`pip install 'dropbox-link-generate[async]'`"
+        ) from exc
+    return aiohttp
+
+
+@dataclass
+class AiohttpTransport:
+    """One ``aiohttp`` session with a keep-alive connection pool.
+
+    The session is created on first use, inside the running event loop, and
+    must only be used from that loop.
+    """
+
+    pool_size: int = DEFAULT_POOL_SIZE
+    keepalive_timeout: float = 60.0
+    ca_certs: Optional[str] = None
+    _session: Any = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self._aiohttp = _import_aiohttp()
+
+    async def post(
+        self, url: str, headers: Mapping[str, str], body: bytes, timeout: float
+    ) -> HttpResponse:
+        aiohttp = self._aiohttp
+        try:
+            async with self._get_session().post(
+                url,
+                headers=dict(headers),
+                data=body,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as resp:
+                payload = await resp.read()
+                return HttpResponse(
+                    status=resp.status,
+                    headers={k.lower(): v for k, v in resp.headers.items()},
+                    body=payload,
+                )
+        except asyncio.TimeoutError as exc:
+            raise TimeoutError(f"Request to {url} timed out") from exc
+        except aiohttp.ClientError as exc:
+            raise ConnectionError(f"Request to {url} failed: {exc}") from exc
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            aiohttp = self._aiohttp
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size,
+                keepalive_timeout=self.keepalive_timeout,
+                ssl=ssl.create_default_context(cafile=self.ca_certs),
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+
+@dataclass
+class AsyncDropboxClient:
+    """Coroutine counterpart of :class:`DropboxClient` for link lookups.
+
+    Link strategies, retries, token persistence and per-path deduplication
+    behave as in the blocking client. Must be used from a single event
+    loop; call :meth:`close` (or use ``async with``) when done.
+    """
+
+    credentials: DropboxOAuthCredentials
+    timeout: float = 5.0
+    user_agent: Optional[str] = None
+    token_store: Optional[TokenStore] = None
+    retry_policy: RetryPolicy = field(default_factory=RetryPolicy)
+    # Defaults to an AiohttpTransport.
+    transport: Optional[AsyncTransport] = None
+    link_strategy: str = ADAPTIVE
+    _token: Optional[CachedToken] = field(default=None, init=False, repr=False)
+    # A supplied access token has no known expiry; it is used until Dropbox
+    # reports it expired.
+    _explicit_token: Optional[str] = field(default=None, init=False, repr=False)
+    _token_lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False)
+    _strategy: _StrategyTracker = field(init=False, repr=False)
+    _link_flights: AsyncSingleFlight = field(
+        default_factory=AsyncSingleFlight, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        self._strategy = _StrategyTracker(self.link_strategy)
+        if self.transport is None:
+            self.transport = AiohttpTransport()
+        self._explicit_token = self.credentials.access_token
+        if self._explicit_token is None and self.token_store is not None:
+            self._token = self.token_store.load(
+                self.credentials.app_key, self.credentials.refresh_token
+            )
+
+    async def __aenter__(self) -> AsyncDropboxClient:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close pooled connections; the client must not be used afterwards."""
+        await self.transport.close()
+
+    async def get_or_create_shared_link(self, path: str, raw: bool = True) -> str:
+        """Return a shared link for ``path``; see :meth:`DropboxClient.get_or_create_shared_link`."""
+        return await self._link_flights.do(
+            (path.lower(), raw), lambda: self._get_or_create_shared_link(path, raw)
+        )
+
+    async def _get_or_create_shared_link(self, path: str, raw: bool) -> str:
+        if self._strategy.prefers_listing():
+            url = await self._with_retry(lambda: self._list_first_shared_link(path))
+            if url:
+                self._strategy.observe(existed=True)
+                return _to_raw_url(url) if raw else url
+
+        url, existed = await self._with_retry(lambda: self._create_or_existing_link(path))
+        bare = existed and url is None
+        if bare:
+            url = await self._with_retry(lambda: self._list_first_shared_link(path))
+            if not url:
+                raise DropboxClientError(f"Shared link for {path} exists but could not be listed")
+        self._strategy.observe(existed=existed, bare=bare)
+        return _to_raw_url(url) if raw else url
+
+    async def _list_first_shared_link(self, path: str) -> Optional[str]:
+        arg = sharing.ListSharedLinksArg(path=path, direct_only=True)
+        res = await self._rpc("sharing", sharing.list_shared_links, arg)
+        links = res.links or []
+        return links[0].url if links else None
+
+    async def _create_or_existing_link(self, path: str) -> tuple[Optional[str], bool]:
+        arg = sharing.CreateSharedLinkWithSettingsArg(
+            path=path,
+            settings=sharing.SharedLinkSettings(
+                requested_visibility=sharing.RequestedVisibility.public
+            ),
+        )
+        try:
+            res = await self._rpc("sharing", sharing.create_shared_link_with_settings, arg)
+        except ApiError as e:
+            exists, url = _already_existing_link(e)
+            if not exists:
+                raise
+            return url, True
+        return res.url, False
+
+    async def ensure_access_token(self) -> str:
+        """Return an access token outside the refresh margin, refreshing if needed.
+
+        A supplied access token is returned as is until a request fails with
+        ``expired_access_token``.
+        """
+        margin = self.token_store.margin if self.token_store else DEFAULT_REFRESH_MARGIN
+        async with self._token_lock:
+            if self._explicit_token is not None:
+                return self._explicit_token
+            if self._token is not None and self._token.is_fresh(margin):
+                return self._token.access_token
+
+            body = {
+                "grant_type": "refresh_token",
+                "refresh_token": self.credentials.refresh_token,
+                "client_id": self.credentials.app_key,
+                "client_secret": self.credentials.app_secret,
+            }
+            resp = await self.transport.post(
+                TOKEN_URL,
+                headers={
+                    **self._base_headers(),
+                    "Content-Type": "application/x-www-form-urlencoded",
+                },
+                body=urlencode(body).encode("ascii"),
+                timeout=self.timeout,
+            )
+            _raise_for_status(resp)
+            content = resp.json()
+            self._token = CachedToken(
+                access_token=content["access_token"],
+                expires_at=_utcnow() + timedelta(seconds=int(content["expires_in"])),
+            )
+            if self.token_store is not None:
+                self.token_store.save(
+                    self.credentials.app_key, self.credentials.refresh_token, self._token
+                )
+            return self._token.access_token
+
+    async def _rpc(self, namespace: str, route, arg) -> Any:
+        token = await self.ensure_access_token()
+        try:
+            return await self._send_rpc(namespace, route, arg, token)
+        except AuthError as e:
+            if token != self._explicit_token or not _is_expired_token(e):
+                raise
+        # The supplied token expired: refresh it and try once more.
+        async with self._token_lock:
+            if self._explicit_token == token:
+                self._explicit_token = None
+        token = await self.ensure_access_token()
+        return await self._send_rpc(namespace, route, arg, token)
+
+    async def _send_rpc(self, namespace: str, route, arg, token: str) -> Any:
+        route_name = f"{namespace}/{route.name}"
+        if route.version > 1:
+            route_name += f"_v{route.version}"
+        resp = await self.transport.post(
+            f"https://{API_HOST}/2/{route_name}",
+            headers={
+                **self._base_headers(),
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            },
+            body=stone_serializers.json_encode(route.arg_type, arg).encode("utf-8"),
+            timeout=self.timeout,
+        )
+        _raise_for_status(resp)
+        payload = resp.json()
+        if resp.status in (403, 404, 409):
+            error = stone_serializers.json_compat_obj_decode(
+                route.error_type, payload["error"], strict=False
+            )
+            user_message = payload.get("user_message") or {}
+            raise ApiError(
+                resp.headers.get("x-dropbox-request-id"),
+                error,
+                user_message.get("text"),
+                user_message.get("locale"),
+            )
+        return stone_serializers.json_compat_obj_decode(route.result_type, payload, strict=False)
+
+    def _base_headers(self) -> dict[str, str]:
+        return {"User-Agent": self.user_agent} if self.user_agent else {}
+
+    async def _with_retry(self, func: Callable[[], Awaitable[T]]) -> T:
+        try:
+            return await self.retry_policy.call_async(func)
+        except AuthError as e:
+            raise DropboxAuthError(
+                "Authentication with Dropbox failed. "
+                "Please verify DROPBOX_APP_KEY, DROPBOX_APP_SECRET, and DROPBOX_REFRESH_TOKEN "
+                "or run `dplk auth` to refresh credentials."
+            ) from e
+        except RateLimitError as e:
+            raise DropboxRateLimitError("Rate limit exceeded (429)") from e
+        except ApiError as e:
+            raise DropboxClientError(str(e)) from e
+        except HttpError as e:
+            raise DropboxClientError(f"HTTP error from Dropbox API: {e}") from e
+        except (ConnectionError, TimeoutError) as e:
+            raise DropboxClientError("Network error talking to Dropbox API") from e
+
+
+def _raise_for_status(resp: HttpResponse) -> None:
+    """Raise the SDK's exception for a failed response, as ``requests`` callers see it.
+
+    403, 404 and 409 carry a route error and are left to the caller.
+    """
+    request_id = resp.headers.get("x-dropbox-request-id")
+    status = resp.status
+    text = resp.body.decode("utf-8", "replace")
+    if status >= 500:
+        raise InternalServerError(request_id, status, text)
+    if status == 400:
+        try:
+            invalid_grant = resp.json().get("error") == "invalid_grant"
+        except (ValueError, AttributeError):
+            invalid_grant = False
+        if invalid_grant:
+            raise AuthError(request_id, "invalid_access_token")
+        raise BadInputError(request_id, text)
+    if status == 401:
+        try:
+            error = stone_serializers.json_compat_obj_decode(
+                auth.AuthError_validator, resp.json()["error"], strict=False
+            )
+        except (ValueError, KeyError, TypeError, stone_serializers.bv.ValidationError):
+            error = text
+        raise AuthError(request_id, error)
+    if status == 429:
+        retry_after = resp.headers.get("retry-after")
+        try:
+            retry_after = resp.json()["error"]["retry_after"]
+        except (ValueError, KeyError, TypeError):
+            pass
+        raise RateLimitError(request_id, None, int(retry_after) if retry_after else None)
+    if status in (403, 404, 409):
+        return
+    if not 200 <= status <= 299:
+        raise HttpError(request_id, status, text)
+
+
+__all__ = [
+    "AiohttpTransport",
+    "AsyncDropboxClient",
+    "AsyncTransport",
+    "HttpResponse",
+    "TOKEN_URL",
+]
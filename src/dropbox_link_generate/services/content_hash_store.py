@@ -0,0 +1,82 @@
+"""Persistent cache of local Dropbox content hashes backed by SQLite."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from ..utils.content_hash import FileStamp
+from .link_cache import connect_store
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS content_hashes (
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    hashed_at REAL NOT NULL,
+    PRIMARY KEY (device, inode)
+)
+"""
+
+logger = logging.getLogger("dplk")
+
+
+class ContentHashStore:
+    """Remember content hashes by file identity (device, inode, size, mtime).
+
+    One row is kept per inode, so rewriting a file replaces its entry rather
+    than accumulating stale ones. Implements the cache protocol expected by
+    :func:`utils.content_hash.content_hash` and shares the SQLite file with
+    :class:`SharedLinkCache`.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect_store(path)
+        self._conn.execute(_SCHEMA)
+
+    def get(self, stamp: FileStamp) -> Optional[str]:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT content_hash FROM content_hashes "
+                    "WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ?",
+                    (stamp.device, stamp.inode, stamp.size, stamp.mtime_ns),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.debug("Content hash lookup failed: %s", exc)
+            return None
+        return row[0] if row else None
+
+    def put(self, stamp: FileStamp, content_hash: str) -> None:
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO content_hashes "
+                    "(device, inode, size, mtime_ns, content_hash, hashed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        stamp.device,
+                        stamp.inode,
+                        stamp.size,
+                        stamp.mtime_ns,
+                        content_hash,
+                        time.time(),
+                    ),
+                )
+        except sqlite3.Error as exc:
+            logger.debug("Content hash write failed: %s", exc)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = ["ContentHashStore"]
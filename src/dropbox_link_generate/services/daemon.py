@@ -0,0 +1,249 @@
+"""Resident link daemon (``dplk serve``) and the thin client used by ``dplk``.
+
+The protocol is one JSON object per line over a Unix domain socket::
+
+    -> {"path": "/abs/path/to/file"}
+    <- {"ok": true, "link": "https://..."}
+    <- {"ok": false, "error": "...", "type": "PathValidationError"}
+
+Paths are made absolute by the client because the daemon's working
+directory is unrelated to the caller's.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import struct
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from ..utils import errors
+from ..utils.errors import DplkError
+
+DAEMON_ENV = "DPLK_DAEMON"
+SOCKET_ENV = "DPLK_SOCKET"
+CONNECT_TIMEOUT = 0.5
+REQUEST_TIMEOUT = 300.0
+
+logger = logging.getLogger("dplk")
+
+_ERROR_TYPES: dict[str, type[DplkError]] = {
+    cls.__name__: cls
+    for cls in (
+        errors.DplkError,
+        errors.ConfigError,
+        errors.PathValidationError,
+        errors.NotInDropboxRoot,
+        errors.DropboxClientError,
+        errors.DropboxRateLimitError,
+        errors.DropboxAuthError,
+        errors.SyncTimeoutError,
+    )
+}
+
+
+class DaemonUnavailable(Exception):
+    """No daemon answered on the socket; callers fall back to in-process work."""
+
+
+def default_socket_path() -> Path:
+    """Return the socket path from DPLK_SOCKET or a per-user runtime default.
+
+    Without ``XDG_RUNTIME_DIR`` the socket lives in a private ``dplk-<uid>``
+    directory under the temp dir rather than directly in it, so other users
+    cannot create it first.
+    """
+    configured = os.getenv(SOCKET_ENV, "").strip()
+    if configured:
+        return Path(configured).expanduser()
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR", "").strip()
+    if runtime_dir:
+        return Path(runtime_dir) / "dplk.sock"
+    return _fallback_socket_dir() / "dplk.sock"
+
+
+def _fallback_socket_dir() -> Path:
+    return Path(tempfile.gettempdir()) / f"dplk-{os.getuid()}"
+
+
+def daemon_enabled() -> bool:
+    return os.getenv(DAEMON_ENV, "").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def request_link(
+    path: str | Path,
+    socket_path: Optional[Path] = None,
+    timeout: float = REQUEST_TIMEOUT,
+) -> str:
+    """Ask a running daemon for the link of ``path``.
+
+    Raises :class:`DaemonUnavailable` when no daemon is reachable (or it went
+    away mid-request) and the matching :class:`DplkError` subclass when the
+    daemon reports a failure. A socket or server process owned by another
+    user is never trusted and also counts as unavailable.
+    """
+    target = socket_path or default_socket_path()
+    try:
+        owner = os.stat(target).st_uid
+    except OSError:
+        raise DaemonUnavailable(f"No daemon socket at {target}") from None
+    if owner != os.getuid():
+        logger.warning("Ignoring daemon socket %s owned by uid %d", target, owner)
+        raise DaemonUnavailable(f"Daemon socket {target} is owned by another user")
+
+    absolute = Path(path).expanduser()
+    if not absolute.is_absolute():
+        absolute = Path.cwd() / absolute
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(target))
+            peer = _peer_uid(sock)
+            if peer is not None and peer != os.getuid():
+                logger.warning("Ignoring daemon on %s run by uid %d", target, peer)
+                raise DaemonUnavailable(f"Daemon on {target} is run by another user")
+            sock.settimeout(timeout)
+            sock.sendall(json.dumps({"path": str(absolute)}).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                line = stream.readline()
+        response = json.loads(line)
+    except (OSError, ValueError) as exc:
+        raise DaemonUnavailable(str(exc)) from exc
+
+    if response.get("ok"):
+        return response["link"]
+    error_type = _ERROR_TYPES.get(response.get("type", ""), DplkError)
+    raise error_type(response.get("error", "Unknown daemon error"))
+
+
+class _LinkRequestHandler(socketserver.StreamRequestHandler):
+    server: "_LinkServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.link_daemon.handle_request(line)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _LinkServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, link_daemon: "LinkDaemon") -> None:
+        self.link_daemon = link_daemon
+        super().__init__(socket_path, _LinkRequestHandler)
+
+
+class LinkDaemon:
+    """Serve link requests with one long-lived generator.
+
+    The generator (and with it the Dropbox client, HTTP session, caches and
+    logger) is created once, so each request costs a single warm API call
+    at most.
+    """
+
+    def __init__(self, generator, socket_path: Path, logger: logging.Logger) -> None:
+        self.generator = generator
+        self.socket_path = socket_path
+        self.logger = logger
+        self._server: Optional[_LinkServer] = None
+
+    def bind(self) -> None:
+        if self.socket_path.exists():
+            if _socket_is_live(self.socket_path):
+                raise DplkError(f"A dplk daemon is already listening on {self.socket_path}")
+            self.socket_path.unlink()
+
+        if self.socket_path.parent == _fallback_socket_dir():
+            _private_dir(self.socket_path.parent)
+        else:
+            self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = _LinkServer(str(self.socket_path), self)
+        finally:
+            os.umask(previous_umask)
+        self.logger.info("dplk daemon listening on %s", self.socket_path)
+
+    def serve_forever(self) -> None:
+        if self._server is None:
+            self.bind()
+        assert self._server is not None
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+            self.socket_path.unlink(missing_ok=True)
+
+    def handle_request(self, line: bytes) -> dict:
+        try:
+            payload = json.loads(line)
+            path = payload["path"]
+        except (ValueError, KeyError, TypeError):
+            return {"ok": False, "error": "Malformed request", "type": "DplkError"}
+
+        try:
+            link = self.generator.generate(path, copy=False)
+        except DplkError as exc:
+            return {"ok": False, "error": str(exc), "type": type(exc).__name__}
+        except Exception:
+            self.logger.exception("Unexpected error while serving %s", path)
+            return {"ok": False, "error": "Unexpected error occurred", "type": "DplkError"}
+        return {"ok": True, "link": link}
+
+
+def _peer_uid(sock: socket.socket) -> Optional[int]:
+    """The uid of the process on the other end, where the OS reports it (Linux)."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _pid, uid, _gid = struct.unpack("3i", creds)
+    return uid
+
+
+def _private_dir(directory: Path) -> None:
+    """Create ``directory`` as 0700, or check an existing one is ours and private."""
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise DplkError(
+            f"Refusing to use {directory} for the daemon socket: "
+            "it must be a directory owned by you with mode 0700"
+        )
+
+
+def _socket_is_live(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+__all__ = [
+    "DaemonUnavailable",
+    "LinkDaemon",
+    "daemon_enabled",
+    "default_socket_path",
+    "request_link",
+]
@@ -1,16 +1,30 @@
 from __future__ import annotations
 
-import time
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 from typing import Optional
 from urllib.parse import urlencode, urlparse, urlunparse, parse_qsl
 
 import dropbox
-from dropbox.exceptions import ApiError, AuthError, BadInputError, HttpError
-from dropbox.sharing import RequestedVisibility, SharedLinkSettings
+import requests
+from dropbox.exceptions import ApiError, AuthError, HttpError, RateLimitError
+from dropbox.files import FileMetadata
+from dropbox.sharing import FolderLinkMetadata, RequestedVisibility, SharedLinkSettings
 
 from ..utils.config import DropboxOAuthCredentials
 from ..utils.errors import DropboxAuthError, DropboxClientError, DropboxRateLimitError
+from ..utils.singleflight import SingleFlight
+from .retry import RetryPolicy
+from .token_store import DEFAULT_REFRESH_MARGIN, UNKNOWN_EXPIRY, CachedToken, TokenStore
+from .transport import HttpTransport
+
+
+LIST_FIRST = "list-first"
+CREATE_FIRST = "create-first"
+ADAPTIVE = "adaptive"
+LINK_STRATEGIES = (LIST_FIRST, CREATE_FIRST, ADAPTIVE)
+# Weight of the newest observation in the adaptive strategy's running rates.
+_STRATEGY_ALPHA = 0.1
 
 
 def _to_raw_url(url: str) -> str:
@@ -23,62 +37,345 @@ def _to_raw_url(url: str) -> str:
     return urlunparse(parts)
 
 
+@dataclass(frozen=True)
+class SharedLinkEntry:
+    """One shared link from the account-wide listing."""
+
+    path_lower: str
+    url: str
+    is_folder: bool
+
+
+@dataclass(frozen=True)
+class RemoteFile:
+    """The synced copy of a file as Dropbox reports it."""
+
+    path_lower: str
+    content_hash: Optional[str]
+    size: int
+
+
+def _remote_file(metadata) -> Optional[RemoteFile]:
+    if not isinstance(metadata, FileMetadata) or not metadata.path_lower:
+        return None
+    return RemoteFile(metadata.path_lower, metadata.content_hash, metadata.size)
+
+
+def _is_missing_path(exc: ApiError) -> bool:
+    """True for path/not_found (and path/not_folder) lookup errors."""
+    error = exc.error
+    if not (hasattr(error, "is_path") and error.is_path()):
+        return False
+    lookup = error.get_path()
+    return lookup.is_not_found() or lookup.is_not_folder()
+
+
+def _is_expired_token(exc: AuthError) -> bool:
+    error = exc.error
+    return hasattr(error, "is_expired_access_token") and error.is_expired_access_token()
+
+
+@dataclass
+class _StrategyTracker:
+    """Chooses list-first or create-first per call; see LINK_STRATEGIES."""
+
+    strategy: str = ADAPTIVE
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    # Adaptive strategy state: share of paths that already had a link, and
+    # share of "already exists" replies that omitted the link itself.
+    _existing_rate: float = field(default=0.0, init=False, repr=False)
+    _bare_exists_rate: float = field(default=0.0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.strategy not in LINK_STRATEGIES:
+            raise ValueError(f"Unknown link strategy: {self.strategy}")
+
+    def prefers_listing(self) -> bool:
+        if self.strategy != ADAPTIVE:
+            return self.strategy == LIST_FIRST
+        with self._lock:
+            existing, bare = self._existing_rate, self._bare_exists_rate
+        # Expected calls per path: list-first 1 + (1 - existing),
+        # create-first 1 + existing * bare.
+        return 1 - existing < existing * bare
+
+    def observe(self, existed: bool, bare: Optional[bool] = None) -> None:
+        with self._lock:
+            self._existing_rate += _STRATEGY_ALPHA * (existed - self._existing_rate)
+            if bare is not None and existed:
+                self._bare_exists_rate += _STRATEGY_ALPHA * (bare - self._bare_exists_rate)
+
+
+def _already_existing_link(exc: ApiError) -> tuple[bool, Optional[str]]:
+    """Inspect a create_shared_link_with_settings error.
+
+    Returns ``(already_exists, url)``; ``url`` is None when Dropbox did not
+    include the existing link in the error.
+    """
+    error = exc.error
+    if not (
+        hasattr(error, "is_shared_link_already_exists") and error.is_shared_link_already_exists()
+    ):
+        return False, None
+    existing = error.get_shared_link_already_exists()
+    if existing is not None and existing.is_metadata():
+        return True, existing.get_metadata().url
+    return True, None
+
+
 @dataclass
 class DropboxClient:
     credentials: DropboxOAuthCredentials
     timeout: float = 5.0
     user_agent: Optional[str] = None
+    token_store: Optional[TokenStore] = None
+    retry_policy: RetryPolicy = field(default_factory=RetryPolicy)
+    # Shared, thread-safe connection pool; see HttpTransport.
+    transport: HttpTransport = field(default_factory=HttpTransport)
+    # How get_or_create_shared_link finds links; see LINK_STRATEGIES.
+    link_strategy: str = ADAPTIVE
+    _token_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _strategy: _StrategyTracker = field(init=False, repr=False)
+    _link_flights: SingleFlight = field(default_factory=SingleFlight, init=False, repr=False)
+    # A supplied access token has no known expiry; it is used until Dropbox
+    # reports it expired and the SDK refreshes it.
+    _explicit_token: bool = field(default=False, init=False, repr=False)
 
     def __post_init__(self) -> None:
+        self._strategy = _StrategyTracker(self.link_strategy)
+        access_token = self.credentials.access_token
+        self._explicit_token = access_token is not None
+        expiration = UNKNOWN_EXPIRY if self._explicit_token else None
+        if access_token is None and self.token_store is not None:
+            cached = self.token_store.load(self.credentials.app_key, self.credentials.refresh_token)
+            if cached is not None:
+                access_token, expiration = cached.access_token, cached.expires_at
+
         self._dbx = dropbox.Dropbox(
             timeout=self.timeout,
             user_agent=self.user_agent,
-            oauth2_access_token=self.credentials.access_token,
+            oauth2_access_token=access_token,
+            oauth2_access_token_expiration=expiration,
             oauth2_refresh_token=self.credentials.refresh_token,
             app_key=self.credentials.app_key,
             app_secret=self.credentials.app_secret,
+            session=self.transport.session(),
+            # Retries are owned by retry_policy so they share backoff state.
+            max_retries_on_error=0,
+            max_retries_on_rate_limit=0,
         )
 
-    def get_or_create_shared_link(self, path: str) -> str:
-        url = self._with_retry(lambda: self._list_first_shared_link(path))
-        if url:
-            return _to_raw_url(url)
+    def close(self) -> None:
+        """Close pooled connections; the client must not be used afterwards."""
+        self.transport.close()
+
+    def ensure_access_token(self) -> None:
+        """Refresh the access token ahead of expiry and persist the new one.
+
+        Serialised with a lock so concurrent workers trigger one refresh, and
+        called before every request so long-lived processes never send a
+        token inside the refresh margin. An explicitly supplied token has no
+        known expiry and is sent as is; the SDK replaces it when a request
+        fails with ``expired_access_token``.
+        """
+        margin = self.token_store.margin if self.token_store else DEFAULT_REFRESH_MARGIN
+        with self._token_lock:
+            # The SDK exposes no public accessors for its token state.
+            token = self._dbx._oauth2_access_token
+            expiration = self._dbx._oauth2_access_token_expiration
+            if token and expiration and CachedToken(token, expiration).is_fresh(margin):
+                return
+            self._dbx.refresh_access_token()
+            self._save_token()
+
+    def get_or_create_shared_link(self, path: str, raw: bool = True) -> str:
+        """Return a shared link for ``path``, creating one if needed.
+
+        File links are returned as raw (``?raw=1``) URLs; pass ``raw=False``
+        for folders, whose links only make sense as the preview page.
 
-        created_url = self._with_retry(lambda: self._create_shared_link(path))
-        return _to_raw_url(created_url)
+        ``list-first`` lists existing links and creates only when there are
+        none: one call for linked files, two for new ones. ``create-first``
+        creates straight away; when a link already exists Dropbox answers
+        ``shared_link_already_exists`` with that link, so both cases usually
+        cost one call. ``adaptive`` picks whichever has been cheaper for
+        the paths seen so far.
+
+        Concurrent calls for the same path share one lookup.
+        """
+        return self._link_flights.do(
+            (path.lower(), raw), lambda: self._get_or_create_shared_link(path, raw)
+        )
+
+    def _get_or_create_shared_link(self, path: str, raw: bool) -> str:
+        if self._strategy.prefers_listing():
+            url = self._with_retry(lambda: self._list_first_shared_link(path))
+            if url:
+                self._strategy.observe(existed=True)
+                return _to_raw_url(url) if raw else url
+
+        url, existed = self._with_retry(lambda: self._create_or_existing_link(path))
+        bare = existed and url is None
+        if bare:
+            # Already exists, but the reply did not carry the link.
+            url = self._with_retry(lambda: self._list_first_shared_link(path))
+            if not url:
+                raise DropboxClientError(f"Shared link for {path} exists but could not be listed")
+        self._strategy.observe(existed=existed, bare=bare)
+        return _to_raw_url(url) if raw else url
+
+    def list_shared_links_page(
+        self, cursor: Optional[str] = None
+    ) -> tuple[list[SharedLinkEntry], Optional[str], bool]:
+        """Fetch one page of all shared links on the account.
+
+        Returns ``(entries, cursor, has_more)``. File URLs are converted to
+        raw URLs; folder links are kept as returned. Links without a local
+        path (e.g. links to content outside the user's Dropbox) are skipped.
+        """
+        if cursor:
+            res = self._with_retry(lambda: self._dbx.sharing_list_shared_links(cursor=cursor))
+        else:
+            res = self._with_retry(lambda: self._dbx.sharing_list_shared_links())
+
+        entries: list[SharedLinkEntry] = []
+        for link in res.links or []:
+            path_lower = getattr(link, "path_lower", None)
+            if not path_lower:
+                continue
+            is_folder = isinstance(link, FolderLinkMetadata)
+            url = link.url if is_folder else _to_raw_url(link.url)
+            entries.append(SharedLinkEntry(path_lower=path_lower, url=url, is_folder=is_folder))
+        return entries, res.cursor, bool(res.has_more)
+
+    def get_file_metadata(self, path: str) -> Optional[RemoteFile]:
+        """Return the synced file at ``path``, or None if it is not there (yet)."""
+
+        def fetch():
+            try:
+                return self._dbx.files_get_metadata(path)
+            except ApiError as e:
+                if _is_missing_path(e):
+                    return None
+                raise
+
+        return _remote_file(self._with_retry(fetch))
+
+    def latest_cursor(self, folder: str, recursive: bool = False) -> Optional[str]:
+        """Return a list_folder cursor for ``folder`` ("" is the root).
+
+        Returns None if the folder does not exist.
+        """
+
+        def fetch():
+            try:
+                return self._dbx.files_list_folder_get_latest_cursor(
+                    folder, recursive=recursive
+                ).cursor
+            except ApiError as e:
+                if _is_missing_path(e):
+                    return None
+                raise
+
+        return self._with_retry(fetch)
+
+    def longpoll(self, cursor: str, timeout: int = 30) -> tuple[bool, Optional[float]]:
+        """Block until entries under ``cursor`` change or ``timeout`` passes.
+
+        Returns ``(changes, backoff)``; callers must wait ``backoff`` seconds
+        before polling again when it is set.
+        """
+        res = self._with_retry(lambda: self._dbx.files_list_folder_longpoll(cursor, timeout))
+        return bool(res.changes), res.backoff
+
+    def list_folder_changes(self, cursor: str) -> tuple[list[RemoteFile], str]:
+        """Return files added or modified since ``cursor`` and the new cursor."""
+        files: list[RemoteFile] = []
+        while True:
+            res = self._with_retry(lambda: self._dbx.files_list_folder_continue(cursor))
+            for entry in res.entries or []:
+                remote = _remote_file(entry)
+                if remote is not None:
+                    files.append(remote)
+            cursor = res.cursor
+            if not res.has_more:
+                return files, cursor
 
     def _list_first_shared_link(self, path: str) -> Optional[str]:
         res = self._dbx.sharing_list_shared_links(path=path, direct_only=True)
         links = res.links or []
         return links[0].url if links else None
 
-    def _create_shared_link(self, path: str) -> str:
+    def _create_or_existing_link(self, path: str) -> tuple[Optional[str], bool]:
+        """Create a link; returns ``(url, already_existed)``.
+
+        ``url`` is None when the link already existed but Dropbox did not
+        include it in the error.
+        """
         settings = SharedLinkSettings(requested_visibility=RequestedVisibility.public)
-        res = self._dbx.sharing_create_shared_link_with_settings(path=path, settings=settings)
-        return res.url
+        try:
+            res = self._dbx.sharing_create_shared_link_with_settings(path=path, settings=settings)
+        except ApiError as e:
+            exists, url = _already_existing_link(e)
+            if not exists:
+                raise
+            return url, True
+        return res.url, False
 
     def _with_retry(self, func):
         try:
-            return func()
+            return self.retry_policy.call(lambda: self._call_with_token(func))
         except AuthError as e:
             raise DropboxAuthError(
                 "Authentication with Dropbox failed. "
                 "Please verify DROPBOX_APP_KEY, DROPBOX_APP_SECRET, and DROPBOX_REFRESH_TOKEN "
                 "or run `dplk auth` to refresh credentials."
             ) from e
+        except RateLimitError as e:
+            raise DropboxRateLimitError("Rate limit exceeded (429)") from e
         except ApiError as e:
-            if getattr(e, "status_code", None) == 429:
-                time.sleep(1.0)
-                try:
-                    return func()
-                except Exception as e2:
-                    raise DropboxRateLimitError("Rate limit exceeded (429)") from e2
             raise DropboxClientError(str(e)) from e
-        except (HttpError, BadInputError) as e:
-            try:
-                return func()
-            except Exception as e2:  # pragma: no cover
-                raise DropboxClientError("Network or HTTP error with Dropbox API") from e2
+        except HttpError as e:
+            raise DropboxClientError(f"HTTP error from Dropbox API: {e}") from e
+        except requests.exceptions.RequestException as e:
+            raise DropboxClientError("Network error talking to Dropbox API") from e
+
+    def _call_with_token(self, func):
+        self.ensure_access_token()
+        try:
+            return func()
+        finally:
+            if self._explicit_token:
+                self._save_replaced_token()
+
+    def _save_replaced_token(self) -> None:
+        # The SDK refreshes an expired token and retries within the failed
+        # request; once it has replaced the supplied token, persist the new one.
+        with self._token_lock:
+            if self._dbx._oauth2_access_token_expiration == UNKNOWN_EXPIRY:
+                return
+            self._explicit_token = False
+            self._save_token()
+
+    def _save_token(self) -> None:
+        # Called with _token_lock held.
+        token = self._dbx._oauth2_access_token
+        expiration = self._dbx._oauth2_access_token_expiration
+        if self.token_store is not None and token and expiration is not None:
+            self.token_store.save(
+                self.credentials.app_key,
+                self.credentials.refresh_token,
+                CachedToken(access_token=token, expires_at=expiration),
+            )
 
 
-__all__ = ["DropboxClient", "_to_raw_url"]
+__all__ = [
+    "ADAPTIVE",
+    "CREATE_FIRST",
+    "DropboxClient",
+    "LINK_STRATEGIES",
+    "LIST_FIRST",
+    "RemoteFile",
+    "SharedLinkEntry",
+    "_to_raw_url",
+]
@@ -0,0 +1,118 @@
+"""Persistent shared-link cache backed by SQLite."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+LINK_CACHE_FILENAME = "links.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shared_links (
+    scope TEXT NOT NULL,
+    path_lower TEXT NOT NULL,
+    url TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (scope, path_lower)
+)
+"""
+
+logger = logging.getLogger("dplk")
+
+
+def connect_store(path: Path, timeout: float = 5.0) -> sqlite3.Connection:
+    """Open a SQLite database in WAL mode suitable for concurrent processes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(
+        str(path),
+        timeout=timeout,
+        isolation_level=None,
+        check_same_thread=False,
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class SharedLinkCache:
+    """Map Dropbox API paths to previously fetched raw shared-link URLs.
+
+    Entries are stamped with the local file's size and mtime; a lookup only
+    hits when both still match, so replaced files fall through to the API.
+    ``scope`` namespaces entries (the CLI uses the resolved DROPBOX_ROOT) so
+    several accounts can share one database file. The connection is shared
+    across threads behind a lock; WAL mode keeps concurrent ``dplk``
+    processes from blocking each other on reads.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        scope: str = "",
+        max_age: Optional[float] = None,
+    ) -> None:
+        self.path = path
+        self.scope = scope
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = connect_store(path)
+        self._conn.execute(_SCHEMA)
+
+    def get(self, api_path: str, size: int, mtime_ns: int) -> Optional[str]:
+        """Return the cached URL for ``api_path`` if its stamps still match."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT url, size, mtime_ns, fetched_at FROM shared_links "
+                    "WHERE scope = ? AND path_lower = ?",
+                    (self.scope, api_path.lower()),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.debug("Link cache lookup failed for %s: %s", api_path, exc)
+            return None
+
+        if row is None:
+            return None
+        url, cached_size, cached_mtime, fetched_at = row
+        if cached_size != size or cached_mtime != mtime_ns:
+            return None
+        if self.max_age is not None and time.time() - fetched_at > self.max_age:
+            return None
+        return url
+
+    def put(self, api_path: str, url: str, size: int, mtime_ns: int) -> None:
+        """Record ``url`` for ``api_path``; failures are logged and ignored."""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO shared_links "
+                    "(scope, path_lower, url, size, mtime_ns, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.scope, api_path.lower(), url, size, mtime_ns, time.time()),
+                )
+        except sqlite3.Error as exc:
+            logger.debug("Link cache write failed for %s: %s", api_path, exc)
+
+    def invalidate(self, api_path: str) -> None:
+        """Drop any cached entry for ``api_path``."""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "DELETE FROM shared_links WHERE scope = ? AND path_lower = ?",
+                    (self.scope, api_path.lower()),
+                )
+        except sqlite3.Error as exc:
+            logger.debug("Link cache invalidation failed for %s: %s", api_path, exc)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = ["LINK_CACHE_FILENAME", "SharedLinkCache", "connect_store"]
@@ -0,0 +1,206 @@
+"""Local index of every shared link on the account, filled by bulk listing."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from ..utils.errors import DropboxClientError
+from .link_cache import connect_store
+
+if TYPE_CHECKING:
+    from .dropbox_client import DropboxClient, SharedLinkEntry
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS link_index (
+        scope TEXT NOT NULL,
+        path_lower TEXT NOT NULL,
+        url TEXT NOT NULL,
+        is_folder INTEGER NOT NULL,
+        indexed_at REAL NOT NULL,
+        PRIMARY KEY (scope, path_lower)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS link_index_state (
+        scope TEXT PRIMARY KEY,
+        cursor TEXT,
+        synced_at REAL
+    )
+    """,
+)
+
+# Indexed links older than this are not trusted: revoking a link does not
+# show up in an incremental listing.
+DEFAULT_INDEX_MAX_AGE = 24 * 3600.0
+
+logger = logging.getLogger("dplk")
+
+
+@dataclass
+class IndexSyncResult:
+    pages: int
+    links: int
+    resumed: bool
+
+
+@dataclass
+class IndexStatus:
+    links: int
+    synced_at: Optional[float]
+    has_cursor: bool
+
+
+class SharedLinkIndex:
+    """Answer "does this path already have a link?" without an API call.
+
+    The index is populated by :meth:`sync`, which pages through
+    ``sharing_list_shared_links`` for the whole account and remembers the
+    final cursor so the next sync only pulls links created since. It shares
+    the SQLite file (and WAL settings) with :class:`SharedLinkCache`.
+
+    Links later revoked are not reported by the listing, so entries listed
+    more than ``max_age`` seconds ago are ignored, and a sync over an index
+    that old re-lists everything.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        scope: str = "",
+        max_age: Optional[float] = DEFAULT_INDEX_MAX_AGE,
+    ) -> None:
+        self.path = path
+        self.scope = scope
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = connect_store(path)
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+
+    def lookup(self, api_path: str) -> Optional[str]:
+        """Return the indexed URL for ``api_path``, if any."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT url, indexed_at FROM link_index WHERE scope = ? AND path_lower = ?",
+                    (self.scope, api_path.lower()),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.debug("Link index lookup failed for %s: %s", api_path, exc)
+            return None
+        if row is None or self._expired(row[1]):
+            return None
+        return row[0]
+
+    def store(self, entries: Iterable[SharedLinkEntry]) -> int:
+        """Insert or refresh ``entries`` and return how many were written."""
+        now = time.time()
+        rows = [
+            (self.scope, entry.path_lower, entry.url, int(entry.is_folder), now)
+            for entry in entries
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO link_index "
+                "(scope, path_lower, url, is_folder, indexed_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def status(self) -> IndexStatus:
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM link_index WHERE scope = ?", (self.scope,)
+            ).fetchone()
+            state = self._conn.execute(
+                "SELECT cursor, synced_at FROM link_index_state WHERE scope = ?",
+                (self.scope,),
+            ).fetchone()
+        cursor, synced_at = state if state else (None, None)
+        return IndexStatus(links=count, synced_at=synced_at, has_cursor=bool(cursor))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM link_index WHERE scope = ?", (self.scope,))
+            self._conn.execute("DELETE FROM link_index_state WHERE scope = ?", (self.scope,))
+
+    def sync(self, client: DropboxClient, full: bool = False) -> IndexSyncResult:
+        """Page through every shared link on the account into the index.
+
+        Resumes from the stored cursor unless ``full`` is set or the index
+        has entries past ``max_age``. If Dropbox rejects the stored cursor
+        the sync restarts from the beginning.
+        """
+        if not full and self._has_expired_entries():
+            logger.info("Link index is older than its maximum age; running a full sync")
+            full = True
+        if full:
+            self.clear()
+
+        cursor = None if full else self._load_cursor()
+        resumed = cursor is not None
+        pages = links = 0
+
+        while True:
+            try:
+                entries, cursor, has_more = client.list_shared_links_page(cursor)
+            except DropboxClientError:
+                if not resumed or pages:
+                    raise
+                logger.warning("Stored link index cursor was rejected; running a full sync")
+                resumed = False
+                cursor = None
+                continue
+
+            pages += 1
+            links += self.store(entries)
+            if cursor:
+                self._save_cursor(cursor)
+            if not has_more:
+                break
+
+        self._save_cursor(cursor, synced=True)
+        return IndexSyncResult(pages=pages, links=links, resumed=resumed)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _expired(self, indexed_at: float) -> bool:
+        return self.max_age is not None and time.time() - indexed_at > self.max_age
+
+    def _has_expired_entries(self) -> bool:
+        # A full sync clears the index first, so the oldest entry dates it.
+        with self._lock:
+            (oldest,) = self._conn.execute(
+                "SELECT MIN(indexed_at) FROM link_index WHERE scope = ?", (self.scope,)
+            ).fetchone()
+        return oldest is not None and self._expired(oldest)
+
+    def _load_cursor(self) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cursor FROM link_index_state WHERE scope = ?", (self.scope,)
+            ).fetchone()
+        return row[0] if row and row[0] else None
+
+    def _save_cursor(self, cursor: Optional[str], synced: bool = False) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO link_index_state (scope, cursor, synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(scope) DO UPDATE SET cursor = excluded.cursor, "
+                "synced_at = COALESCE(excluded.synced_at, synced_at)",
+                (self.scope, cursor, time.time() if synced else None),
+            )
+
+
+__all__ = ["DEFAULT_INDEX_MAX_AGE", "IndexStatus", "IndexSyncResult", "SharedLinkIndex"]
@@ -0,0 +1,165 @@
+"""Retry policy shared by every request a :class:`DropboxClient` makes."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import requests
+from dropbox.exceptions import InternalServerError, RateLimitError
+
+T = TypeVar("T")
+
+# Dropbox's own default when a 429 carries no Retry-After hint.
+DEFAULT_RATE_LIMIT_BACKOFF = 5.0
+
+logger = logging.getLogger("dplk")
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with jitter, honouring server backoff hints.
+
+    One policy instance is meant to be shared by all threads using a client:
+    a rate-limit response blocks *every* caller until the server's backoff
+    has elapsed, not just the thread that received it.
+
+    ``max_attempts`` counts the first try. ``budget`` caps the total time a
+    single call may spend waiting between attempts; a retry whose wait would
+    overrun it is not attempted and the last error is raised instead.
+    """
+
+    max_attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    budget: float = 60.0
+    jitter: float = 0.5
+    sleep: Callable[[float], None] = field(default=time.sleep, repr=False)
+    async_sleep: Callable[[float], Awaitable[None]] = field(default=asyncio.sleep, repr=False)
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _blocked_until: float = field(default=0.0, init=False, repr=False)
+    _throttle_events: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if self.base_delay < 0 or self.max_delay < 0 or self.budget < 0:
+            raise ValueError("delays and budget must not be negative")
+        if not 0.0 <= self.jitter <= 1.0:
+            raise ValueError("jitter must be between 0 and 1")
+
+    @property
+    def throttle_events(self) -> int:
+        """Number of rate-limit responses seen since the policy was created."""
+        return self._throttle_events
+
+    def call(self, func: Callable[[], T]) -> T:
+        """Run ``func`` until it succeeds, fails permanently or runs out of retries."""
+        waited = 0.0
+        attempt = 1
+        while True:
+            gate = self._gate_remaining()
+            if gate > 0:
+                self.sleep(gate)
+                waited += gate
+            try:
+                return func()
+            except Exception as exc:
+                delay = self._retry_delay(exc, attempt, waited)
+                if delay is None:
+                    raise
+                self.sleep(delay)
+                waited += delay
+                attempt += 1
+
+    async def call_async(self, func: Callable[[], Awaitable[T]]) -> T:
+        """Coroutine version of :meth:`call`; waits without blocking the loop.
+
+        Shares the rate-limit gate with :meth:`call`, so sync and async
+        callers of one policy back off together.
+        """
+        waited = 0.0
+        attempt = 1
+        while True:
+            gate = self._gate_remaining()
+            if gate > 0:
+                await self.async_sleep(gate)
+                waited += gate
+            try:
+                return await func()
+            except Exception as exc:
+                delay = self._retry_delay(exc, attempt, waited)
+                if delay is None:
+                    raise
+                await self.async_sleep(delay)
+                waited += delay
+                attempt += 1
+
+    def _retry_delay(self, exc: Exception, attempt: int, waited: float) -> Optional[float]:
+        """Seconds to wait before retrying after ``exc``, or None to give up."""
+        hint = self.retry_hint(exc)
+        if isinstance(exc, RateLimitError):
+            # Slow every other worker down even if this call gives up.
+            self._block_for(hint)
+        if hint is None or attempt >= self.max_attempts:
+            return None
+        if isinstance(exc, RateLimitError):
+            delay = hint + self._jitter(self.base_delay)
+        else:
+            delay = self.backoff(attempt)
+        if waited + delay > self.budget:
+            return None
+        logger.debug(
+            "Retrying after %s (attempt %d/%d) in %.2fs",
+            type(exc).__name__,
+            attempt,
+            self.max_attempts,
+            delay,
+        )
+        return delay
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered exponential delay before retry number ``attempt``."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return ceiling - self._jitter(ceiling)
+
+    @staticmethod
+    def retry_hint(exc: BaseException) -> Optional[float]:
+        """Return the server-requested wait for a retryable error, else ``None``.
+
+        Retryable: rate limits (429), Dropbox 5xx responses and connection
+        or timeout failures, whether raised by ``requests`` or as the
+        built-in :class:`ConnectionError` / :class:`TimeoutError`.
+        Everything else - auth errors, bad input, route errors such as 409 -
+        fails the same way on a retry.
+        """
+        if isinstance(exc, RateLimitError):
+            return float(exc.backoff) if exc.backoff is not None else DEFAULT_RATE_LIMIT_BACKOFF
+        if isinstance(exc, InternalServerError):
+            return 0.0
+        if isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+            return 0.0
+        if isinstance(exc, (ConnectionError, TimeoutError)):
+            return 0.0
+        return None
+
+    def _jitter(self, span: float) -> float:
+        return random.uniform(0.0, span * self.jitter) if span > 0 else 0.0
+
+    def _block_for(self, seconds: float) -> None:
+        with self._lock:
+            self._throttle_events += 1
+            self._blocked_until = max(self._blocked_until, self.clock() + seconds)
+
+    def _gate_remaining(self) -> float:
+        with self._lock:
+            return max(0.0, self._blocked_until - self.clock())
+
+
+__all__ = ["DEFAULT_RATE_LIMIT_BACKOFF", "RetryPolicy"]
@@ -0,0 +1,135 @@
+"""Private on-disk store for short-lived Dropbox access tokens."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import stat
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from ..utils.config import Config
+
+TOKEN_STORE_FILENAME = "token.json"
+# Tokens this close to expiry are treated as expired and refreshed early.
+DEFAULT_REFRESH_MARGIN = 300.0
+# Expiry given to the SDK for a supplied access token. The SDK refreshes any
+# token without an expiry before each request, replacing the one supplied.
+UNKNOWN_EXPIRY = datetime.max
+
+logger = logging.getLogger("dplk")
+
+
+def _utcnow() -> datetime:
+    # The Dropbox SDK tracks expirations as naive UTC datetimes.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass
+class CachedToken:
+    access_token: str
+    expires_at: datetime
+
+    def is_fresh(self, margin: float = DEFAULT_REFRESH_MARGIN) -> bool:
+        return self.expires_at - _utcnow() > timedelta(seconds=margin)
+
+
+class TokenStore:
+    """Persist access tokens between ``dplk`` invocations.
+
+    Entries are keyed by app key plus a digest of the refresh token, so a
+    re-authorised account never picks up a token minted for the old grant.
+    The file is written atomically with mode ``0600``; a file readable by
+    group or others is ignored rather than trusted.
+    """
+
+    def __init__(self, path: Path, margin: float = DEFAULT_REFRESH_MARGIN) -> None:
+        self.path = path
+        self.margin = margin
+        self._lock = threading.Lock()
+
+    def load(self, app_key: str, refresh_token: str) -> Optional[CachedToken]:
+        """Return a cached token that is still valid beyond the refresh margin."""
+        with self._lock:
+            entry = self._read().get(self._key(app_key, refresh_token))
+        if not entry:
+            return None
+        try:
+            token = CachedToken(
+                access_token=entry["access_token"],
+                expires_at=datetime.fromtimestamp(entry["expires_at"], timezone.utc).replace(
+                    tzinfo=None
+                ),
+            )
+        except (KeyError, TypeError, ValueError, OverflowError):
+            return None
+        return token if token.is_fresh(self.margin) else None
+
+    def save(self, app_key: str, refresh_token: str, token: CachedToken) -> None:
+        """Store ``token``; failures are logged and otherwise ignored."""
+        expires_at = token.expires_at.replace(tzinfo=timezone.utc).timestamp()
+        with self._lock:
+            entries = self._read()
+            entries[self._key(app_key, refresh_token)] = {
+                "access_token": token.access_token,
+                "expires_at": expires_at,
+            }
+            try:
+                self._write(entries)
+            except OSError as exc:
+                logger.debug("Could not persist access token to %s: %s", self.path, exc)
+
+    @staticmethod
+    def _key(app_key: str, refresh_token: str) -> str:
+        digest = hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()[:16]
+        return f"{app_key}:{digest}"
+
+    def _read(self) -> dict:
+        try:
+            mode = self.path.stat().st_mode
+        except OSError:
+            return {}
+        if mode & (stat.S_IRWXG | stat.S_IRWXO):
+            logger.warning("Ignoring token store with loose permissions: %s", self.path)
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, entries: dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=".token-", dir=str(self.path.parent))
+        try:
+            # mkstemp creates the file with mode 0600.
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(entries, handle)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+
+def configured_token_store(cfg: Config) -> Optional[TokenStore]:
+    """The token store ``cfg`` asks for, or None when DPLK_TOKEN_CACHE is off."""
+    if not cfg.token_cache or cfg.store_dir is None:
+        return None
+    return TokenStore(cfg.store_dir / TOKEN_STORE_FILENAME)
+
+
+__all__ = [
+    "CachedToken",
+    "DEFAULT_REFRESH_MARGIN",
+    "TOKEN_STORE_FILENAME",
+    "TokenStore",
+    "UNKNOWN_EXPIRY",
+    "configured_token_store",
+]
@@ -0,0 +1,120 @@
+"""Pooled HTTPS transport shared by every Dropbox API call of a client."""
+
+from __future__ import annotations
+
+import socket
+import ssl
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.poolmanager import PoolManager
+
+# Connections kept per host. Matches the adaptive batch ceiling
+# (core.concurrency.DEFAULT_MAX_JOBS) so no worker has to open a throwaway
+# connection when the pool is exhausted.
+DEFAULT_POOL_SIZE = 32
+# Hosts the SDK talks to: api (RPC and OAuth), content and notify (longpoll).
+_POOL_HOSTS = 4
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter that always verifies certificates, like the SDK's own."""
+
+    def __init__(self, *args, ca_certs=None, socket_options=None, **kwargs):
+        self._ca_certs = ca_certs
+        self._socket_options = socket_options
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if self._socket_options is not None:
+            pool_kwargs["socket_options"] = self._socket_options
+        self.poolmanager = PoolManager(
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            cert_reqs=ssl.CERT_REQUIRED,
+            ca_certs=self._ca_certs,
+            **pool_kwargs,
+        )
+
+
+@dataclass
+class HttpTransport:
+    """One ``requests`` session with a connection pool sized for concurrency.
+
+    Thread safety: the session is created once and never reconfigured
+    afterwards, and all mutable connection state lives in urllib3's pools,
+    which are thread-safe. Concurrent workers can therefore send through
+    the same session; each request checks a kept-alive TLS connection out
+    of the pool and returns it afterwards. Dropbox API calls carry their
+    token in headers and set no cookies, so the shared cookie jar stays
+    empty. OAuth token state lives on the ``dropbox.Dropbox`` object and is
+    refreshed under ``DropboxClient``'s lock.
+
+    With ``pool_block`` a worker waits for a free connection instead of
+    opening an extra one that is discarded afterwards. TCP keep-alive
+    probes let long-lived processes (``dplk serve``) notice connections
+    that a NAT or proxy has silently dropped while idle.
+    """
+
+    pool_size: int = DEFAULT_POOL_SIZE
+    pool_block: bool = False
+    keepalive: bool = True
+    keepalive_idle: int = 60
+    keepalive_interval: int = 15
+    keepalive_count: int = 4
+    ca_certs: Optional[str] = None
+    _session: Optional[requests.Session] = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+
+    def session(self) -> requests.Session:
+        """Return the shared session, creating it on first use."""
+        with self._lock:
+            if self._session is None:
+                self._session = self._build_session()
+            return self._session
+
+    def close(self) -> None:
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def socket_options(self) -> Optional[list[tuple[int, int, int]]]:
+        if not self.keepalive:
+            return None
+        options = list(HTTPConnection.default_socket_options)
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        # Linux names; macOS only has TCP_KEEPALIVE (the idle time).
+        idle = getattr(socket, "TCP_KEEPIDLE", getattr(socket, "TCP_KEEPALIVE", None))
+        if idle is not None:
+            options.append((socket.IPPROTO_TCP, idle, self.keepalive_idle))
+        if hasattr(socket, "TCP_KEEPINTVL"):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, self.keepalive_interval))
+        if hasattr(socket, "TCP_KEEPCNT"):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, self.keepalive_count))
+        return options
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        session.verify = self.ca_certs if self.ca_certs is not None else True
+        adapter = _PooledAdapter(
+            pool_connections=_POOL_HOSTS,
+            pool_maxsize=self.pool_size,
+            pool_block=self.pool_block,
+            ca_certs=self.ca_certs,
+            socket_options=self.socket_options(),
+        )
+        session.mount("https://", adapter)
+        return session
+
+
+__all__ = ["DEFAULT_POOL_SIZE", "HttpTransport"]
@@ -0,0 +1,310 @@
+"""Reusable link generation session: configuration and clients set up once."""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+from .core.batch import DEFAULT_JOBS
+from .utils.config import Config
+from .utils.errors import DplkError, DropboxClientError
+from .utils.logging import setup_logging
+
+if TYPE_CHECKING:
+    from .core.batch import BatchResult
+    from .core.concurrency import AIMDController
+    from .core.sharing import DropboxLinkGenerator
+    from .services.archive_manifest import ArchiveManifestStore
+    from .services.content_hash_store import ContentHashStore
+    from .services.dropbox_client import DropboxClient
+    from .services.link_cache import SharedLinkCache
+    from .services.link_index import DEFAULT_INDEX_MAX_AGE, SharedLinkIndex
+
+
+class LinkSession:
+    """One configuration, Dropbox client, logger and set of local stores.
+
+    Building a session loads the configuration, opens the link cache and
+    creates the client (with its connection pool and access token) once;
+    afterwards :meth:`generate`, :meth:`generate_many` and
+    :meth:`generate_tree` only pay for the API work. All of them may be
+    called from several threads. Use the session as a context manager, or
+    call :meth:`close`, to release connections and store handles::
+
+        with LinkSession.from_env() as session:
+            link = session.generate("~/Dropbox/report.pdf")
+    """
+
+    def __init__(self, config: Config, logger: Optional[logging.Logger] = None) -> None:
+        self.config = config
+        self.logger = logger or setup_logging(verbose=config.verbose, log_file=config.log_file)
+        self.logger.debug("Loaded configuration: root=%s", config.dropbox_root)
+        self.generator = _build_generator(config, self.logger)
+
+    @classmethod
+    def from_env(
+        cls,
+        env_path: Optional[Path] = None,
+        verbose: bool = False,
+        log_file: Optional[str] = None,
+    ) -> LinkSession:
+        """Build a session from ``Config.from_env``; the flags override the environment."""
+        return cls(_override_config(Config.from_env(env_path), verbose, log_file))
+
+    @property
+    def client(self) -> DropboxClient:
+        return self.generator.client
+
+    def generate(self, path: str | Path, copy: bool = False) -> str:
+        """Return the link for ``path``; see :meth:`DropboxLinkGenerator.generate`."""
+        return self.generator.generate(path, copy=copy)
+
+    def generate_many(
+        self,
+        paths: Iterable[str | Path],
+        jobs: int = DEFAULT_JOBS,
+        queue_size: Optional[int] = None,
+        controller: Optional[AIMDController] = None,
+    ) -> Iterator[BatchResult]:
+        """Yield results for ``paths`` as they complete; see :func:`core.batch.generate_many`."""
+        from .core.batch import generate_many
+        from .utils.paths import PathValidator
+
+        return generate_many(
+            self.generator,
+            paths,
+            jobs=jobs,
+            queue_size=queue_size,
+            controller=controller,
+            validator=PathValidator(self.generator.dropbox_root),
+        )
+
+    def generate_tree(
+        self,
+        directory: str | Path,
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        ignore: bool = True,
+        ordered: bool = False,
+        jobs: int = DEFAULT_JOBS,
+        queue_size: Optional[int] = None,
+        controller: Optional[AIMDController] = None,
+    ) -> Iterator[BatchResult]:
+        """Yield a result for every file under ``directory``.
+
+        Files are selected as in :func:`core.tree.walk_tree`; with ``ignore``
+        the built-in excludes, ``.gitignore`` and ``.dplkignore`` apply too.
+        Walking, validation and linking are pipelined, so large trees keep
+        memory flat. ``ordered`` yields results in path order instead of
+        completion order.
+        """
+        from .core.batch import generate_many
+        from .core.ignore import IgnoreMatcher
+        from .core.tree import walk_tree
+        from .utils.paths import PathValidator
+
+        files = walk_tree(
+            directory,
+            PathValidator(self.generator.dropbox_root),
+            include=include,
+            exclude=exclude,
+            ignore=IgnoreMatcher.with_defaults() if ignore else None,
+        )
+        return generate_many(
+            self.generator,
+            files,
+            jobs=jobs,
+            queue_size=queue_size,
+            controller=controller,
+            ordered=ordered,
+        )
+
+    def close(self) -> None:
+        """Close the client's connections and the local stores."""
+        generator = self.generator
+        self.client.close()
+        for store in (generator.cache, generator.index, generator.manifests, generator.hashes):
+            if store is not None:
+                store.close()
+
+    def __enter__(self) -> LinkSession:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def open_session(
+    verbose: bool,
+    log_file: Optional[str],
+    no_cache: bool = False,
+    wait_sync: Optional[float] = None,
+    verify_hash: bool = False,
+    directory_mode: Optional[str] = None,
+) -> LinkSession:
+    """Build a :class:`LinkSession` with a CLI invocation's flags applied."""
+    from .core.sync import DEFAULT_SYNC_TIMEOUT
+
+    cfg, logger = load_config(verbose, log_file)
+    if no_cache:
+        cfg.link_cache = False
+    if wait_sync is not None:
+        cfg.wait_sync = wait_sync
+    if verify_hash:
+        cfg.wait_sync_hash = True
+        if cfg.wait_sync is None:
+            cfg.wait_sync = DEFAULT_SYNC_TIMEOUT
+    if directory_mode is not None:
+        cfg.directory_mode = directory_mode
+    return LinkSession(cfg, logger)
+
+
+def format_error(error: Exception) -> str:
+    """Return the one-line message the CLI prints for a failed link."""
+    if isinstance(error, DropboxClientError):
+        return f"Dropbox API error: {error}"
+    if isinstance(error, DplkError):
+        return str(error)
+    return "Unexpected error occurred"
+
+
+def _override_config(cfg: Config, verbose: bool, log_file: Optional[str]) -> Config:
+    if verbose:
+        cfg.verbose = True
+    if log_file:
+        cfg.log_file = log_file
+    return cfg
+
+
+def load_config(verbose: bool, log_file: Optional[str]) -> tuple[Config, logging.Logger]:
+    """Load ``Config.from_env`` with the flags applied, and set up logging."""
+    cfg = _override_config(Config.from_env(), verbose, log_file)
+    logger = setup_logging(verbose=cfg.verbose, log_file=cfg.log_file)
+    logger.debug("Loaded configuration: root=%s", cfg.dropbox_root)
+    return cfg, logger
+
+
+def link_store_path(cfg: Config) -> Optional[Path]:
+    """Return the path of the local link store, or None when it is disabled."""
+    from .services.link_cache import LINK_CACHE_FILENAME
+
+    if not cfg.link_cache or cfg.store_dir is None:
+        return None
+    return cfg.store_dir / LINK_CACHE_FILENAME
+
+
+def _open_link_store(
+    cfg: Config, logger: logging.Logger
+) -> tuple[
+    Optional[SharedLinkCache],
+    Optional[SharedLinkIndex],
+    Optional[ArchiveManifestStore],
+    Optional[ContentHashStore],
+]:
+    import sqlite3
+
+    from .services.archive_manifest import ArchiveManifestStore
+    from .services.content_hash_store import ContentHashStore
+    from .services.link_cache import SharedLinkCache
+    from .services.link_index import DEFAULT_INDEX_MAX_AGE, SharedLinkIndex
+
+    store_path = link_store_path(cfg)
+    if store_path is None:
+        return None, None, None, None
+
+    scope = str(cfg.dropbox_root.resolve())
+    try:
+        cache = SharedLinkCache(store_path, scope=scope, max_age=cfg.link_cache_ttl)
+        index = SharedLinkIndex(
+            store_path,
+            scope=scope,
+            max_age=DEFAULT_INDEX_MAX_AGE if cfg.link_index_ttl is None else cfg.link_index_ttl,
+        )
+        manifests = ArchiveManifestStore(store_path, scope=scope)
+        hashes = ContentHashStore(store_path)
+    except (OSError, sqlite3.Error) as exc:
+        logger.warning("Shared-link cache unavailable, continuing without it: %s", exc)
+        return None, None, None, None
+    return cache, index, manifests, hashes
+
+
+def build_client(cfg: Config) -> DropboxClient:
+    """Create a :class:`DropboxClient` configured from ``cfg``; the caller closes it."""
+    from .services.dropbox_client import ADAPTIVE, DropboxClient
+    from .services.retry import RetryPolicy
+    from .services.token_store import configured_token_store
+    from .services.transport import DEFAULT_POOL_SIZE, HttpTransport
+
+    retry_policy = RetryPolicy()
+    if cfg.retry_max_attempts is not None:
+        retry_policy.max_attempts = cfg.retry_max_attempts
+    if cfg.retry_budget is not None:
+        retry_policy.budget = cfg.retry_budget
+    return DropboxClient(
+        credentials=cfg.oauth,
+        timeout=5.0,
+        user_agent="dplk/0.1",
+        token_store=configured_token_store(cfg),
+        retry_policy=retry_policy,
+        transport=HttpTransport(
+            pool_size=cfg.http_pool_size or DEFAULT_POOL_SIZE,
+            keepalive=cfg.http_keepalive,
+        ),
+        link_strategy=cfg.link_strategy or ADAPTIVE,
+    )
+
+
+def _build_generator(cfg: Config, logger: logging.Logger) -> DropboxLinkGenerator:
+    from .core.eviction import DEFAULT_PIN_SECONDS, ArchiveBudget
+    from .core.sharing import (
+        DEFAULT_FOLDER_MIN_BYTES,
+        DEFAULT_FOLDER_MIN_FILES,
+        DropboxLinkGenerator,
+    )
+
+    # The client first: it can fail on bad credentials, and would leave the
+    # stores open if they came first.
+    client = build_client(cfg)
+    cache, index, manifests, hashes = _open_link_store(cfg, logger)
+    return DropboxLinkGenerator(
+        dropbox_root=cfg.dropbox_root,
+        client=client,
+        logger=logger,
+        archive_dir=cfg.archive_dir,
+        cache=cache,
+        index=index,
+        manifests=manifests,
+        hashes=hashes,
+        hash_archives=cfg.archive_hash,
+        archive_workers=cfg.archive_workers,
+        archive_level=cfg.archive_level,
+        deterministic_archives=cfg.archive_deterministic,
+        archive_ignore=cfg.archive_ignore,
+        archive_budget=ArchiveBudget(
+            max_bytes=cfg.archive_max_bytes,
+            max_count=cfg.archive_max_count,
+            pin_seconds=(
+                DEFAULT_PIN_SECONDS if cfg.archive_pin_seconds is None else cfg.archive_pin_seconds
+            ),
+        ),
+        wait_for_sync=cfg.wait_sync,
+        verify_sync_hash=cfg.wait_sync_hash,
+        directory_mode=cfg.directory_mode,
+        folder_min_bytes=(
+            DEFAULT_FOLDER_MIN_BYTES if cfg.folder_min_bytes is None else cfg.folder_min_bytes
+        ),
+        folder_min_files=(
+            DEFAULT_FOLDER_MIN_FILES if cfg.folder_min_files is None else cfg.folder_min_files
+        ),
+    )
+
+
+__all__ = [
+    "LinkSession",
+    "build_client",
+    "format_error",
+    "link_store_path",
+    "load_config",
+    "open_session",
+]
@@ -9,6 +9,63 @@ from dotenv import load_dotenv
 
 from .errors import ConfigError
 
+_PROJECT_DATA = Path(__file__).resolve().parents[3] / "data"
+_TRUTHY = {"1", "true", "yes", "on"}
+_FALSY = {"0", "false", "no", "off"}
+# Mirrors services.dropbox_client.LINK_STRATEGIES without importing the SDK.
+_LINK_STRATEGIES = ("list-first", "create-first", "adaptive")
+# Mirrors core.sharing.DIRECTORY_MODES.
+_DIRECTORY_MODES = ("archive", "folder", "auto")
+
+
+def default_store_dir() -> Path:
+    """Return ``data/store`` in a source checkout, else the per-user cache dir."""
+    if _PROJECT_DATA.is_dir():
+        return _PROJECT_DATA / "store"
+    cache_home = os.getenv("XDG_CACHE_HOME", "").strip()
+    base = Path(cache_home).expanduser() if cache_home else Path.home() / ".cache"
+    return base / "dplk"
+
+
+def _optional_float(name: str) -> Optional[float]:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        raise ConfigError(f"{name} must be a number")
+
+
+def _optional_int(name: str) -> Optional[int]:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        raise ConfigError(f"{name} must be an integer")
+
+
+_SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+
+
+def _optional_size(name: str) -> Optional[int]:
+    """Parse a byte count such as ``500M`` or ``20G`` (binary units)."""
+    raw = os.getenv(name, "").strip().lower()
+    if not raw:
+        return None
+    number, unit = raw.rstrip("ib"), ""
+    if number and number[-1] in _SIZE_UNITS:
+        number, unit = number[:-1], number[-1]
+    try:
+        value = float(number.strip())
+    except ValueError:
+        raise ConfigError(f"{name} must be a size such as 500M or 20G")
+    if value < 0:
+        raise ConfigError(f"{name} must not be negative")
+    return int(value * _SIZE_UNITS[unit])
+
 
 @dataclass
 class DropboxOAuthCredentials:
@@ -25,6 +82,29 @@ class Config:
     verbose: bool = False
     log_file: Optional[str] = None
     archive_dir: Optional[Path] = None
+    store_dir: Optional[Path] = None
+    link_cache: bool = True
+    link_cache_ttl: Optional[float] = None
+    link_index_ttl: Optional[float] = None
+    token_cache: bool = True
+    retry_max_attempts: Optional[int] = None
+    retry_budget: Optional[float] = None
+    archive_hash: bool = False
+    archive_workers: Optional[int] = None
+    archive_level: int = 6
+    archive_deterministic: bool = False
+    archive_ignore: bool = True
+    archive_max_bytes: Optional[int] = None
+    archive_max_count: Optional[int] = None
+    archive_pin_seconds: Optional[float] = None
+    wait_sync: Optional[float] = None
+    wait_sync_hash: bool = False
+    link_strategy: Optional[str] = None
+    http_pool_size: Optional[int] = None
+    http_keepalive: bool = True
+    directory_mode: str = "archive"
+    folder_min_bytes: Optional[int] = None
+    folder_min_files: Optional[int] = None
 
     @classmethod
     def from_env(cls, env_path: Optional[Path] = None) -> "Config":
@@ -39,6 +119,41 @@ class Config:
         - DROPBOX_ACCESS_TOKEN (prefetched short-lived token)
         - VERBOSE (truthy values)
         - LOG_FILE
+        - DROPBOX_ARCHIVE_DIR (directory for zipped folder inputs)
+        - DPLK_STORE_DIR (local state; defaults to data/store or ~/.cache/dplk)
+        - DPLK_LINK_CACHE (falsy values disable the shared-link cache)
+        - DPLK_LINK_CACHE_TTL (seconds before cached links are re-fetched)
+        - DPLK_LINK_INDEX_TTL (seconds before indexed links are no longer
+          trusted; default one day)
+        - DPLK_TOKEN_CACHE (falsy values disable the access-token store)
+        - DPLK_RETRY_MAX_ATTEMPTS (attempts per API call, including the first)
+        - DPLK_RETRY_BUDGET (seconds a single API call may spend backing off)
+        - DPLK_HTTP_POOL_SIZE (kept-alive connections per Dropbox host shared
+          by all workers; default 32)
+        - DPLK_HTTP_KEEPALIVE (falsy values disable TCP keep-alive probes)
+        - DPLK_LINK_STRATEGY (list-first, create-first or adaptive; default
+          adaptive)
+        - DPLK_ARCHIVE_HASH (truthy values hash file contents when checking
+          whether a directory changed since its last archive)
+        - DPLK_ARCHIVE_WORKERS (compression threads; defaults to the CPU count)
+        - DPLK_ARCHIVE_LEVEL (deflate level 0-9, default 6; 0 stores every file)
+        - DPLK_ARCHIVE_DETERMINISTIC (truthy values make identical trees produce
+          byte-identical archives)
+        - DPLK_ARCHIVE_IGNORE (falsy values archive everything, ignoring the
+          built-in excludes, .gitignore and .dplkignore)
+        - DPLK_ARCHIVE_MAX_BYTES (size budget for DROPBOX_ARCHIVE_DIR, e.g. 20G;
+          least recently linked archives are deleted beyond it)
+        - DPLK_ARCHIVE_MAX_COUNT (maximum number of archives to keep)
+        - DPLK_ARCHIVE_PIN_SECONDS (archives linked this recently are never
+          evicted; default 3600)
+        - DPLK_DIRECTORY_MODE (archive, folder or auto; how directory inputs
+          are linked, default archive)
+        - DPLK_FOLDER_MIN_BYTES / DPLK_FOLDER_MIN_FILES (in auto mode, trees
+          larger than either get a folder link; default 1G / 10000 files)
+        - DPLK_WAIT_SYNC (seconds to wait for the desktop client to upload a
+          file before linking it; unset links immediately)
+        - DPLK_WAIT_SYNC_HASH (truthy values also wait until the uploaded
+          content_hash matches the local file)
         """
         if env_path is not None:
             if env_path.is_dir():
@@ -56,6 +171,29 @@ class Config:
         verbose_str = os.getenv("VERBOSE", "").strip().lower()
         log_file = os.getenv("LOG_FILE", "").strip() or None
         archive_str = os.getenv("DROPBOX_ARCHIVE_DIR", "").strip()
+        store_str = os.getenv("DPLK_STORE_DIR", "").strip()
+        link_cache_str = os.getenv("DPLK_LINK_CACHE", "").strip().lower()
+        link_cache_ttl = _optional_float("DPLK_LINK_CACHE_TTL")
+        link_index_ttl = _optional_float("DPLK_LINK_INDEX_TTL")
+        token_cache_str = os.getenv("DPLK_TOKEN_CACHE", "").strip().lower()
+        retry_max_attempts = _optional_int("DPLK_RETRY_MAX_ATTEMPTS")
+        retry_budget = _optional_float("DPLK_RETRY_BUDGET")
+        link_strategy = os.getenv("DPLK_LINK_STRATEGY", "").strip().lower() or None
+        http_pool_size = _optional_int("DPLK_HTTP_POOL_SIZE")
+        http_keepalive_str = os.getenv("DPLK_HTTP_KEEPALIVE", "").strip().lower()
+        archive_hash_str = os.getenv("DPLK_ARCHIVE_HASH", "").strip().lower()
+        archive_workers = _optional_int("DPLK_ARCHIVE_WORKERS")
+        archive_level = _optional_int("DPLK_ARCHIVE_LEVEL")
+        deterministic_str = os.getenv("DPLK_ARCHIVE_DETERMINISTIC", "").strip().lower()
+        archive_ignore_str = os.getenv("DPLK_ARCHIVE_IGNORE", "").strip().lower()
+        archive_max_bytes = _optional_size("DPLK_ARCHIVE_MAX_BYTES")
+        archive_max_count = _optional_int("DPLK_ARCHIVE_MAX_COUNT")
+        archive_pin_seconds = _optional_float("DPLK_ARCHIVE_PIN_SECONDS")
+        directory_mode = os.getenv("DPLK_DIRECTORY_MODE", "").strip().lower() or "archive"
+        folder_min_bytes = _optional_size("DPLK_FOLDER_MIN_BYTES")
+        folder_min_files = _optional_int("DPLK_FOLDER_MIN_FILES")
+        wait_sync = _optional_float("DPLK_WAIT_SYNC")
+        wait_sync_hash_str = os.getenv("DPLK_WAIT_SYNC_HASH", "").strip().lower()
 
         if not app_key:
             raise ConfigError("Missing DROPBOX_APP_KEY in environment/.env")
@@ -87,7 +225,37 @@ class Config:
             except ValueError:
                 raise ConfigError("DROPBOX_ARCHIVE_DIR must be inside DROPBOX_ROOT")
 
-        verbose = verbose_str in {"1", "true", "yes", "on"}
+        store_dir = Path(store_str).expanduser() if store_str else default_store_dir()
+        if not store_dir.is_absolute():
+            raise ConfigError("DPLK_STORE_DIR must be an absolute path")
+        if retry_max_attempts is not None and retry_max_attempts < 1:
+            raise ConfigError("DPLK_RETRY_MAX_ATTEMPTS must be at least 1")
+        if retry_budget is not None and retry_budget < 0:
+            raise ConfigError("DPLK_RETRY_BUDGET must not be negative")
+        if http_pool_size is not None and http_pool_size < 1:
+            raise ConfigError("DPLK_HTTP_POOL_SIZE must be at least 1")
+        if link_strategy is not None and link_strategy not in _LINK_STRATEGIES:
+            raise ConfigError(
+                "DPLK_LINK_STRATEGY must be one of: " + ", ".join(_LINK_STRATEGIES)
+            )
+        if archive_workers is not None and archive_workers < 1:
+            raise ConfigError("DPLK_ARCHIVE_WORKERS must be at least 1")
+        if archive_level is not None and not 0 <= archive_level <= 9:
+            raise ConfigError("DPLK_ARCHIVE_LEVEL must be between 0 and 9")
+        if archive_max_count is not None and archive_max_count < 0:
+            raise ConfigError("DPLK_ARCHIVE_MAX_COUNT must not be negative")
+        if archive_pin_seconds is not None and archive_pin_seconds < 0:
+            raise ConfigError("DPLK_ARCHIVE_PIN_SECONDS must not be negative")
+        if directory_mode not in _DIRECTORY_MODES:
+            raise ConfigError(
+                "DPLK_DIRECTORY_MODE must be one of: " + ", ".join(_DIRECTORY_MODES)
+            )
+        if folder_min_files is not None and folder_min_files < 0:
+            raise ConfigError("DPLK_FOLDER_MIN_FILES must not be negative")
+        if wait_sync is not None and wait_sync < 0:
+            raise ConfigError("DPLK_WAIT_SYNC must not be negative")
+
+        verbose = verbose_str in _TRUTHY
         credentials = DropboxOAuthCredentials(
             app_key=app_key,
             app_secret=app_secret,
@@ -100,4 +268,27 @@ class Config:
             verbose=verbose,
             log_file=log_file,
             archive_dir=archive_dir,
+            store_dir=store_dir,
+            link_cache=link_cache_str not in _FALSY,
+            link_cache_ttl=link_cache_ttl,
+            link_index_ttl=link_index_ttl,
+            token_cache=token_cache_str not in _FALSY,
+            retry_max_attempts=retry_max_attempts,
+            retry_budget=retry_budget,
+            link_strategy=link_strategy,
+            http_pool_size=http_pool_size,
+            http_keepalive=http_keepalive_str not in _FALSY,
+            archive_hash=archive_hash_str in _TRUTHY,
+            archive_workers=archive_workers,
+            archive_level=6 if archive_level is None else archive_level,
+            archive_deterministic=deterministic_str in _TRUTHY,
+            archive_ignore=archive_ignore_str not in _FALSY,
+            archive_max_bytes=archive_max_bytes,
+            archive_max_count=archive_max_count,
+            archive_pin_seconds=archive_pin_seconds,
+            directory_mode=directory_mode,
+            folder_min_bytes=folder_min_bytes,
+            folder_min_files=folder_min_files,
+            wait_sync=wait_sync,
+            wait_sync_hash=wait_sync_hash_str in _TRUTHY,
         )
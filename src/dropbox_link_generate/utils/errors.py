@@ -24,3 +24,7 @@ class DropboxRateLimitError(DropboxClientError):
 
 class DropboxAuthError(DropboxClientError):
     """Raised when Dropbox authentication fails."""
+
+
+class SyncTimeoutError(DplkError):
+    """Raised when a file does not reach Dropbox before the sync wait expires."""
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import errno
 import os
+import stat
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable, Iterator, Optional
 
 from .errors import NotInDropboxRoot, PathValidationError
 
+# Errors Path.exists() reports as "does not exist" rather than raising.
+_MISSING_ERRNOS = frozenset({errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP})
+
 
 def _is_subpath(child: Path, parent: Path) -> bool:
     try:
@@ -17,6 +24,7 @@ def _is_subpath(child: Path, parent: Path) -> bool:
 def normalize_and_validate_path(
     user_path: str | Path,
     dropbox_root: Path,
+    allow_directories: bool = False,
 ) -> tuple[Path, str]:
     """Validate a user path and return (resolved_path, dropbox_api_path).
 
@@ -24,27 +32,20 @@ def normalize_and_validate_path(
     - Path must be textually under dropbox_root (no outside path allowed)
     - Follow symlinks only if the path itself is within dropbox_root and the
       fully resolved target remains within dropbox_root as well
+    - Directories are rejected unless ``allow_directories`` (for folder
+      links); DROPBOX_ROOT itself can never be linked
     - Return path resolved to real file and its Dropbox API path (leading '/')
     """
-    p = Path(user_path).expanduser()
-    # Absolute without resolving symlinks
-    if not p.is_absolute():
-        p_abs = (Path.cwd() / p)
-    else:
-        p_abs = p
-
+    p_abs = _absolute(user_path)
     dropbox_root = dropbox_root.resolve()
 
     # First gate: textual under root
-    if not _is_subpath(p_abs, dropbox_root):
-        raise NotInDropboxRoot(
-            f"Path is not under DROPBOX_ROOT: {p_abs} not in {dropbox_root}"
-        )
+    _check_textually_under(p_abs, dropbox_root)
 
     # Existence check before resolving
     if not p_abs.exists():
         raise PathValidationError(f"Path does not exist: {p_abs}")
-    if p_abs.is_dir():
+    if p_abs.is_dir() and not allow_directories:
         raise PathValidationError("Only files are supported (got a directory)")
 
     # Second gate: fully resolved must still stay within root
@@ -54,7 +55,149 @@ def normalize_and_validate_path(
             "Symlink target escapes DROPBOX_ROOT; refusing to follow"
         )
 
+    if resolved == dropbox_root:
+        raise PathValidationError("Cannot share DROPBOX_ROOT itself")
+
+    return resolved, _api_path(resolved, dropbox_root)
+
+
+@dataclass
+class ValidatedPath:
+    """Outcome of validating one path with :meth:`PathValidator.validate_many`."""
+
+    path: str | Path
+    resolved: Optional[Path] = None
+    api_path: Optional[str] = None
+    error: Optional[PathValidationError] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _DirInfo:
+    under_root: bool
+    real: Optional[Path] = None
+    # API path of the real directory ("" for the root); None if it escapes.
+    api_prefix: Optional[str] = None
+
+
+class PathValidator:
+    """Validate many paths against one DROPBOX_ROOT with few syscalls.
+
+    Accepts and rejects exactly what :func:`normalize_and_validate_path`
+    does, with the same errors. The root is resolved once and everything
+    about a parent directory - whether it lies under the root, its real
+    path and its API path - is worked out once per directory, so a path
+    that is not itself a symlink costs one ``lstat``, or none when it comes
+    from :func:`os.scandir`. Symlinks still get the full check.
+
+    The memo assumes directories are not moved or re-pointed while the
+    validator is in use: keep one per batch, not one per process. Safe to
+    share between threads.
+    """
+
+    def __init__(self, dropbox_root: Path) -> None:
+        self.dropbox_root = dropbox_root.resolve()
+        self._dirs: dict[Path, _DirInfo] = {}
+
+    def validate(
+        self, user_path: str | Path, allow_directories: bool = False
+    ) -> tuple[Path, str]:
+        """Return ``(resolved_path, dropbox_api_path)`` or raise like the function."""
+        p_abs = _absolute(user_path)
+        info = self._check_textually_under(p_abs)
+        try:
+            st = os.lstat(p_abs)
+        except OSError as exc:
+            if exc.errno in _MISSING_ERRNOS:
+                raise PathValidationError(f"Path does not exist: {p_abs}") from None
+            raise
+        if stat.S_ISLNK(st.st_mode):
+            return normalize_and_validate_path(p_abs, self.dropbox_root, allow_directories)
+        return self._finish(p_abs, info, stat.S_ISDIR(st.st_mode), allow_directories)
+
+    def validate_entry(
+        self, entry: os.DirEntry, allow_directories: bool = False
+    ) -> tuple[Path, str]:
+        """Like :meth:`validate`, trusting the file type ``os.scandir`` reported.
+
+        An entry deleted since the directory was listed is not noticed.
+        """
+        p_abs = _absolute(entry.path)
+        info = self._check_textually_under(p_abs)
+        if entry.is_symlink():
+            return normalize_and_validate_path(p_abs, self.dropbox_root, allow_directories)
+        return self._finish(p_abs, info, entry.is_dir(follow_symlinks=False), allow_directories)
+
+    def validate_many(
+        self, paths: Iterable[str | Path], allow_directories: bool = False
+    ) -> Iterator[ValidatedPath]:
+        """Lazily validate ``paths``, reporting failures on the result."""
+        for path in paths:
+            try:
+                resolved, api_path = self.validate(path, allow_directories)
+            except PathValidationError as exc:
+                yield ValidatedPath(path, error=exc)
+            else:
+                yield ValidatedPath(path, resolved, api_path)
+
+    def _check_textually_under(self, p_abs: Path) -> _DirInfo:
+        # p_abs has one more part than its parent, so it is under the root
+        # exactly when its parent is (or it is the root itself).
+        info = self._dir_info(p_abs.parent)
+        if not info.under_root and p_abs != self.dropbox_root:
+            _check_textually_under(p_abs, self.dropbox_root)
+        return info
+
+    def _finish(
+        self, p_abs: Path, info: _DirInfo, is_dir: bool, allow_directories: bool
+    ) -> tuple[Path, str]:
+        if is_dir and not allow_directories:
+            raise PathValidationError("Only files are supported (got a directory)")
+        name = p_abs.name
+        if name == "..":
+            return normalize_and_validate_path(p_abs, self.dropbox_root, allow_directories)
+        if info.real is None:
+            # p_abs is not a symlink, so only its parent can resolve elsewhere.
+            real = Path(os.path.realpath(p_abs.parent))
+            if real == self.dropbox_root:
+                info.api_prefix = ""
+            elif _is_subpath(real, self.dropbox_root):
+                info.api_prefix = _api_path(real, self.dropbox_root)
+            info.real = real
+        resolved = info.real / name
+        if name == self.dropbox_root.name and resolved == self.dropbox_root:
+            raise PathValidationError("Cannot share DROPBOX_ROOT itself")
+        if info.api_prefix is None:
+            raise NotInDropboxRoot("Symlink target escapes DROPBOX_ROOT; refusing to follow")
+        return resolved, f"{info.api_prefix}/{name}"
+
+    def _dir_info(self, directory: Path) -> _DirInfo:
+        info = self._dirs.get(directory)
+        if info is None:
+            info = self._dirs[directory] = _DirInfo(_is_subpath(directory, self.dropbox_root))
+        return info
+
+
+def _absolute(user_path: str | Path) -> Path:
+    # Absolute without resolving symlinks
+    p = Path(user_path).expanduser()
+    return p if p.is_absolute() else Path.cwd() / p
+
+
+def _check_textually_under(p_abs: Path, dropbox_root: Path) -> None:
+    if not _is_subpath(p_abs, dropbox_root):
+        raise NotInDropboxRoot(
+            f"Path is not under DROPBOX_ROOT: {p_abs} not in {dropbox_root}"
+        )
+
+
+def _api_path(resolved: Path, dropbox_root: Path) -> str:
     rel = resolved.relative_to(dropbox_root)
-    api_path = "/" + str(rel).replace(os.sep, "/")
-    return resolved, api_path
+    return "/" + str(rel).replace(os.sep, "/")
+
+
+__all__ = ["PathValidator", "ValidatedPath", "normalize_and_validate_path"]
 
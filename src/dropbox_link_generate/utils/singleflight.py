@@ -0,0 +1,160 @@
+"""Collapse concurrent calls for the same key into one execution."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Generic, Hashable, Iterator, Optional, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Call(Generic[T]):
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Optional[T] = None
+    error: Optional[BaseException] = None
+
+
+class SingleFlight(Generic[T]):
+    """Run ``func`` once per key among callers that overlap in time.
+
+    The first caller for a key runs it; callers arriving while it is in
+    flight block and receive the same result (or the same exception). Once
+    it finishes the key is forgotten, so later calls run afresh: this
+    deduplicates work, it does not cache it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call[T]] = {}
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight(Generic[T]):
+    """Coroutine version of :class:`SingleFlight` for one event loop.
+
+    The first caller's coroutine runs as a task that later callers await
+    too. Cancelling one caller does not cancel the shared task while others
+    are still waiting for it.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[Hashable, asyncio.Task[T]] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive ``flock`` on ``path`` (created if missing).
+
+    Serialises work across processes; on platforms without :mod:`fcntl`
+    it only provides the in-process guarantees of the caller. The lock file
+    is removed on release, so none are left behind: a waiter that wakes up
+    holding an unlinked file notices and locks the new one instead.
+    """
+    if fcntl is None:  # pragma: no cover - Windows
+        yield
+        return
+    fd = _acquire(path, blocking=True)
+    assert fd is not None
+    try:
+        yield
+    finally:
+        _release(path, fd)
+
+
+def remove_stale_lock(path: Path) -> bool:
+    """Delete a :func:`file_lock` file nobody holds; False if it is in use."""
+    if fcntl is None:  # pragma: no cover - Windows
+        return False
+    try:
+        fd = _acquire(path, blocking=False, create=False)
+    except FileNotFoundError:
+        return True
+    if fd is None:
+        return False
+    _release(path, fd)
+    return True
+
+
+def _acquire(path: Path, blocking: bool, create: bool = True) -> Optional[int]:
+    flags = os.O_RDWR | (os.O_CREAT if create else 0)
+    while True:
+        fd = os.open(path, flags, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        try:
+            current = os.stat(path)
+        except FileNotFoundError:
+            current = None
+        if current is not None and os.path.samestat(current, os.fstat(fd)):
+            return fd
+        # The previous holder removed this file; lock the one now at path.
+        os.close(fd)
+        if not create and current is None:
+            raise FileNotFoundError(path)
+
+
+def _release(path: Path, fd: int) -> None:
+    try:
+        # Unlink while still holding the lock so no one can lock this inode
+        # after it is gone from the directory.
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+__all__ = ["AsyncSingleFlight", "SingleFlight", "file_lock", "remove_stale_lock"]
@@ -0,0 +1,11 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_store(tmp_path, monkeypatch):
+    """Keep local dplk state (link cache etc.) out of the developer's store."""
+    store = tmp_path / "dplk-store"
+    monkeypatch.setenv("DPLK_STORE_DIR", str(store))
+    # Never forward test invocations to a daemon the developer may be running.
+    monkeypatch.setenv("DPLK_SOCKET", str(tmp_path / "no-daemon.sock"))
+    return store
@@ -0,0 +1,178 @@
+import os
+import shutil
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from dropbox_link_generate.core import archive as archive_module
+from dropbox_link_generate.core.archive import write_archive
+from dropbox_link_generate.utils.errors import PathValidationError
+
+
+def _make_tree(root: Path) -> Path:
+    project = root / "project"
+    (project / "src" / "pkg").mkdir(parents=True)
+    (project / "empty").mkdir()
+    (project / "README.md").write_text("hello", encoding="utf-8")
+    (project / "src" / "pkg" / "data.bin").write_bytes(os.urandom(300_000))
+    return project
+
+
+def test_write_archive_matches_make_archive_layout(tmp_path: Path):
+    project = _make_tree(tmp_path / "tree")
+    out = tmp_path / "out"
+    out.mkdir()
+
+    destination = write_archive(project, out / "project.zip", workers=4).path
+    reference = shutil.make_archive(
+        str(tmp_path / "reference"), "zip", root_dir=str(project.parent), base_dir="project"
+    )
+
+    with zipfile.ZipFile(destination) as ours, zipfile.ZipFile(reference) as theirs:
+        assert ours.namelist() == theirs.namelist()
+        # Random bytes do not compress, so they are stored rather than deflated.
+        assert ours.getinfo("project/src/pkg/data.bin").compress_type == zipfile.ZIP_STORED
+        assert ours.getinfo("project/README.md").compress_type == zipfile.ZIP_DEFLATED
+        assert ours.testzip() is None
+        for name in theirs.namelist():
+            assert ours.read(name) == theirs.read(name)
+    assert os.listdir(out) == ["project.zip"]
+
+
+def test_write_archive_replaces_atomically_and_cleans_up(tmp_path: Path, monkeypatch):
+    project = _make_tree(tmp_path / "tree")
+    out = tmp_path / "out"
+    out.mkdir()
+    destination = out / "project.zip"
+    destination.write_bytes(b"previous archive")
+
+    def explode(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(archive_module, "_write_entry", explode)
+    with pytest.raises(OSError):
+        write_archive(project, destination)
+
+    assert destination.read_bytes() == b"previous archive"
+    assert os.listdir(out) == ["project.zip"]
+
+
+def test_write_archive_refuses_directory_destination(tmp_path: Path):
+    project = _make_tree(tmp_path / "tree")
+    (tmp_path / "project.zip").mkdir()
+    with pytest.raises(PathValidationError):
+        write_archive(project, tmp_path / "project.zip")
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = []
+
+    def get_or_create_shared_link(self, path):
+        self.calls.append(path)
+        return f"https://www.dropbox.com/s/{len(self.calls)}{path}?raw=1"
+
+
+def test_unchanged_directory_reuses_archive_and_link(tmp_path: Path):
+    import logging
+
+    from dropbox_link_generate.core.sharing import DropboxLinkGenerator
+    from dropbox_link_generate.services.archive_manifest import ArchiveManifestStore
+    from dropbox_link_generate.services.link_cache import SharedLinkCache
+
+    root = tmp_path / "Dropbox"
+    project = _make_tree(root)
+    store = tmp_path / "store" / "links.db"
+    client = CountingClient()
+    generator = DropboxLinkGenerator(
+        dropbox_root=root,
+        client=client,
+        logger=logging.getLogger("test"),
+        archive_dir=root / "archives",
+        cache=SharedLinkCache(store),
+        manifests=ArchiveManifestStore(store),
+    )
+
+    first = generator.generate(project, copy=False)
+    zip_path = root / "archives" / "project.zip"
+    built_at = zip_path.stat().st_mtime_ns
+
+    assert generator.generate(project, copy=False) == first
+    assert zip_path.stat().st_mtime_ns == built_at
+    assert client.calls == ["/archives/project.zip"]
+
+    readme = project / "README.md"
+    readme.write_text("changed", encoding="utf-8")
+    os.utime(readme, ns=(built_at + 10**9, built_at + 10**9))
+    generator.generate(project, copy=False)
+    assert zip_path.stat().st_mtime_ns != built_at
+    with zipfile.ZipFile(zip_path) as zf:
+        assert zf.read("project/README.md") == b"changed"
+
+
+def test_fingerprint_hash_contents_catches_same_stamp_edits(tmp_path: Path):
+    from dropbox_link_generate.core.archive import fingerprint_directory
+
+    project = _make_tree(tmp_path)
+    readme = project / "README.md"
+    stamp = readme.stat()
+    before = fingerprint_directory(project, hash_contents=True)
+    shallow = fingerprint_directory(project)
+
+    readme.write_text("HELLO", encoding="utf-8")
+    os.utime(readme, ns=(stamp.st_atime_ns, stamp.st_mtime_ns))
+
+    assert fingerprint_directory(project) == shallow
+    assert fingerprint_directory(project, hash_contents=True) != before
+    assert before.entries == 6
+
+
+def test_compression_choice_by_extension_sample_and_level(tmp_path: Path):
+    from dropbox_link_generate.core.archive import choose_compression
+
+    photo = tmp_path / "photo.JPG"
+    photo.write_bytes(b"a" * 100)
+    noise = tmp_path / "noise.dat"
+    noise.write_bytes(os.urandom(100_000))
+    text = tmp_path / "log.txt"
+    text.write_bytes(b"line of text\n" * 10_000)
+
+    assert choose_compression(photo, 100) == zipfile.ZIP_STORED
+    assert choose_compression(noise, 100_000) == zipfile.ZIP_STORED
+    assert choose_compression(text, 130_000) == zipfile.ZIP_DEFLATED
+    assert choose_compression(text, 130_000, level=0) == zipfile.ZIP_STORED
+
+
+def test_write_archive_reports_stats(tmp_path: Path):
+    project = _make_tree(tmp_path / "tree")
+    (project / "big.txt").write_bytes(b"abc" * 100_000)
+
+    stats = write_archive(project, tmp_path / "project.zip", workers=2)
+
+    assert (stats.files, stats.stored, stats.deflated) == (3, 1, 2)
+    assert stats.input_bytes == 5 + 300_000 + 300_000
+    assert stats.output_bytes < stats.input_bytes
+    assert stats.saved_bytes > 290_000
+    assert "saved" in stats.summary()
+
+
+def test_deterministic_archives_are_byte_identical(tmp_path: Path):
+    import hashlib
+
+    first_tree = _make_tree(tmp_path / "one")
+    second_tree = tmp_path / "two" / "project"
+    shutil.copytree(first_tree, second_tree)
+    for path in second_tree.rglob("*"):
+        os.utime(path, (1_700_000_000, 1_700_000_000))
+    os.chmod(second_tree / "README.md", 0o600)
+
+    first = write_archive(first_tree, tmp_path / "a.zip", workers=1, deterministic=True)
+    second = write_archive(second_tree, tmp_path / "b.zip", workers=3, deterministic=True)
+
+    digest = [hashlib.sha256(s.path.read_bytes()).hexdigest() for s in (first, second)]
+    assert digest[0] == digest[1]
+    with zipfile.ZipFile(first.path) as archive:
+        info = archive.getinfo("project/README.md")
+        assert info.date_time == (1980, 1, 1, 0, 0, 0)
+        assert (info.external_attr >> 16) & 0o777 == 0o644
@@ -0,0 +1,256 @@
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+from dropbox_link_generate.core.async_sharing import AsyncDropboxLinkGenerator
+from dropbox_link_generate.core.sharing import DropboxLinkGenerator
+from dropbox_link_generate.services.async_client import (
+    TOKEN_URL,
+    AsyncDropboxClient,
+    HttpResponse,
+)
+from dropbox_link_generate.services.retry import RetryPolicy
+from dropbox_link_generate.utils.config import DropboxOAuthCredentials
+from dropbox_link_generate.utils.errors import (
+    ConfigError,
+    DropboxAuthError,
+    DropboxClientError,
+    NotInDropboxRoot,
+)
+
+CREATE_URL = "https://api.dropboxapi.com/2/sharing/create_shared_link_with_settings"
+LIST_URL = "https://api.dropboxapi.com/2/sharing/list_shared_links"
+
+
+def _link(path: str) -> dict:
+    permissions = {
+        "can_revoke": False,
+        "visibility_policies": [],
+        "can_set_expiry": False,
+        "can_remove_expiry": False,
+        "allow_download": True,
+        "can_allow_download": False,
+        "can_disallow_download": False,
+        "allow_comments": False,
+        "team_restricts_comments": False,
+    }
+    return {
+        ".tag": "file",
+        "url": f"https://www.dropbox.com/s/x{path}?dl=0",
+        "name": path.rsplit("/", 1)[-1],
+        "link_permissions": permissions,
+        "client_modified": "2024-01-01T00:00:00Z",
+        "server_modified": "2024-01-01T00:00:00Z",
+        "rev": "0123456789a",
+        "size": 1,
+    }
+
+
+def _json(status: int, payload, **headers) -> HttpResponse:
+    return HttpResponse(status, headers, json.dumps(payload).encode("utf-8"))
+
+
+class FakeTransport:
+    """Serves the token, list and create endpoints from ``links``."""
+
+    def __init__(self):
+        self.links = {}
+        self.calls = []
+        self.failures = []
+        self.include_metadata = True
+        self.delay = 0.0
+        self.closed = False
+
+    async def post(self, url, headers, body, timeout):
+        self.calls.append(url)
+        await asyncio.sleep(self.delay)
+        if self.failures:
+            failure = self.failures.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            return failure
+        if url == TOKEN_URL:
+            return _json(200, {"access_token": "sl.async", "expires_in": 14400})
+        assert headers["Authorization"] == "Bearer sl.async"
+        arg = json.loads(body)
+        path = arg["path"]
+        if url == LIST_URL:
+            links = [_link(path)] if path in self.links else []
+            return _json(200, {"links": links, "has_more": False})
+        if path in self.links:
+            error = {".tag": "shared_link_already_exists"}
+            if self.include_metadata:
+                error["shared_link_already_exists"] = {
+                    ".tag": "metadata",
+                    "metadata": _link(path),
+                }
+            return _json(409, {"error_summary": "shared_link_already_exists/", "error": error})
+        self.links[path] = True
+        return _json(200, _link(path))
+
+    async def close(self):
+        self.closed = True
+
+
+def _client(transport, **kwargs) -> AsyncDropboxClient:
+    async def no_sleep(_seconds):
+        return None
+
+    creds = DropboxOAuthCredentials(app_key="key", app_secret="secret", refresh_token="refresh")
+    policy = RetryPolicy(jitter=0.0, async_sleep=no_sleep)
+    return AsyncDropboxClient(
+        credentials=creds, transport=transport, retry_policy=policy, **kwargs
+    )
+
+
+def test_create_first_and_existing_links():
+    transport = FakeTransport()
+    transport.links["/old.txt"] = True
+    client = _client(transport, link_strategy="create-first")
+
+    async def run():
+        new = await client.get_or_create_shared_link("/new.txt")
+        old = await client.get_or_create_shared_link("/old.txt", raw=False)
+        await client.close()
+        return new, old
+
+    new, old = asyncio.run(run())
+
+    assert new == "https://www.dropbox.com/s/x/new.txt?raw=1"
+    assert old == "https://www.dropbox.com/s/x/old.txt?dl=0"
+    # One token refresh, then one call per path.
+    assert transport.calls == [TOKEN_URL, CREATE_URL, CREATE_URL]
+    assert transport.closed
+
+
+def test_supplied_access_token_skips_refresh_until_expired():
+    transport = FakeTransport()
+    creds = DropboxOAuthCredentials(
+        app_key="key", app_secret="secret", refresh_token="refresh", access_token="sl.async"
+    )
+    client = AsyncDropboxClient(
+        credentials=creds, transport=transport, link_strategy="create-first"
+    )
+
+    asyncio.run(client.get_or_create_shared_link("/a.txt"))
+    assert transport.calls == [CREATE_URL]
+
+    transport.failures = [_json(401, {"error": {".tag": "expired_access_token"}})]
+    asyncio.run(client.get_or_create_shared_link("/b.txt"))
+    assert transport.calls[1:] == [CREATE_URL, TOKEN_URL, CREATE_URL]
+
+
+def test_bare_already_exists_falls_back_to_listing():
+    transport = FakeTransport()
+    transport.links["/old.txt"] = True
+    transport.include_metadata = False
+    client = _client(transport, link_strategy="create-first")
+
+    link = asyncio.run(client.get_or_create_shared_link("/old.txt"))
+
+    assert link.endswith("/old.txt?raw=1")
+    assert transport.calls[1:] == [CREATE_URL, LIST_URL]
+
+
+def test_retries_server_errors_and_dropped_connections():
+    transport = FakeTransport()
+    transport.failures = [
+        ConnectionError("reset"),
+        _json(503, {}),
+        _json(429, {"error": {"reason": {".tag": "too_many_requests"}, "retry_after": 1}}),
+    ]
+    client = _client(transport, link_strategy="create-first")
+
+    link = asyncio.run(client.get_or_create_shared_link("/a.txt"))
+
+    assert link.endswith("/a.txt?raw=1")
+    assert client.retry_policy.throttle_events == 1
+
+
+def test_auth_and_route_errors_are_wrapped():
+    transport = FakeTransport()
+    transport.failures = [_json(400, {"error": "invalid_grant"})]
+    with pytest.raises(DropboxAuthError):
+        asyncio.run(_client(transport).get_or_create_shared_link("/a.txt"))
+
+    transport = FakeTransport()
+    transport.failures = [
+        _json(200, {"access_token": "sl.async", "expires_in": 14400}),
+        _json(409, {"error": {".tag": "path", "path": {".tag": "not_found"}}}),
+    ]
+    with pytest.raises(DropboxClientError):
+        asyncio.run(
+            _client(transport, link_strategy="list-first").get_or_create_shared_link("/gone")
+        )
+
+
+def test_concurrent_requests_for_one_path_share_a_call():
+    transport = FakeTransport()
+    transport.delay = 0.01
+    client = _client(transport, link_strategy="create-first")
+
+    async def run():
+        return await asyncio.gather(
+            *(client.get_or_create_shared_link(p) for p in ["/a.txt", "/A.txt", "/a.txt"])
+        )
+
+    links = asyncio.run(run())
+
+    assert len(set(links)) == 1
+    assert transport.calls.count(CREATE_URL) == 1
+
+
+def test_missing_aiohttp_is_a_config_error(monkeypatch):
+    monkeypatch.setitem(sys.modules, "aiohttp", None)
+    creds = DropboxOAuthCredentials(app_key="key", app_secret="secret", refresh_token="refresh")
+
+    with pytest.raises(ConfigError, match=r"\[async\]"):
+        AsyncDropboxClient(credentials=creds)
+
+
+def test_generate_many_yields_results_with_bounded_fan_out(tmp_path: Path):
+    root = tmp_path / "Dropbox"
+    root.mkdir()
+    for i in range(6):
+        (root / f"f{i}.txt").write_text("x", encoding="utf-8")
+    transport = FakeTransport()
+    transport.delay = 0.01
+    client = _client(transport, link_strategy="create-first")
+    generator = AsyncDropboxLinkGenerator(
+        DropboxLinkGenerator(dropbox_root=root, client=None, logger=logging.getLogger("test")),
+        client,
+    )
+    active = peak = 0
+    fetch = client.get_or_create_shared_link
+
+    async def tracked(path, raw=True):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        try:
+            return await fetch(path, raw)
+        finally:
+            active -= 1
+
+    client.get_or_create_shared_link = tracked
+
+    async def paths():
+        for i in range(6):
+            yield root / f"f{i}.txt"
+        yield tmp_path / "outside.txt"
+
+    async def run():
+        return [result async for result in generator.generate_many(paths(), concurrency=2)]
+
+    (tmp_path / "outside.txt").write_text("x", encoding="utf-8")
+    results = asyncio.run(run())
+
+    links = sorted(r.link for r in results if r.ok)
+    assert links == [f"https://www.dropbox.com/s/x/f{i}.txt?raw=1" for i in range(6)]
+    failures = [r for r in results if not r.ok]
+    assert len(failures) == 1 and isinstance(failures[0].error, NotInDropboxRoot)
+    assert peak == 2
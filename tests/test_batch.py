@@ -0,0 +1,90 @@
+import io
+import threading
+import time
+
+from dropbox_link_generate.core.batch import generate_many, read_paths
+from dropbox_link_generate.utils.errors import PathValidationError
+
+
+class FakeGenerator:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def generate(self, path, copy=True):
+        assert copy is False
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if str(path).startswith("bad"):
+                raise PathValidationError(f"Path does not exist: {path}")
+            return f"https://example.com/{path}?raw=1"
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_read_paths_newline_and_null():
+    assert list(read_paths(io.BytesIO(b"a.txt\r\n\nb.txt\nc.txt"))) == ["a.txt", "b.txt", "c.txt"]
+    assert list(read_paths(io.BytesIO(b"a\nb\0c\0"), null_delimited=True)) == ["a\nb", "c"]
+
+
+def test_generate_many_runs_concurrently():
+    generator = FakeGenerator(delay=0.05)
+    paths = [f"f{i}.txt" for i in range(16)]
+
+    started = time.monotonic()
+    results = list(generate_many(generator, paths, jobs=8))
+    elapsed = time.monotonic() - started
+
+    assert sorted(r.path for r in results) == sorted(paths)
+    assert all(r.ok for r in results)
+    assert generator.peak == 8
+    assert elapsed < 16 * 0.05
+
+
+def test_generate_many_reports_errors_and_bounds_queue():
+    generator = FakeGenerator()
+    pulled = []
+
+    def source():
+        for name in ("ok1", "bad1", "ok2"):
+            pulled.append(name)
+            yield name
+
+    iterator = generate_many(generator, source(), jobs=1, queue_size=1)
+    first = next(iterator)
+    assert pulled == ["ok1"]
+    rest = list(iterator)
+
+    failures = [r for r in [first, *rest] if not r.ok]
+    assert [r.path for r in failures] == ["bad1"]
+    assert isinstance(failures[0].error, PathValidationError)
+
+
+def test_generate_many_ordered_keeps_input_order_within_window():
+    class SlowFirst(FakeGenerator):
+        def generate(self, path, copy=True):
+            if path == "f0.txt":
+                time.sleep(0.05)
+            return super().generate(path, copy)
+
+    generator = SlowFirst()
+    paths = [f"f{i}.txt" for i in range(8)]
+    pulled = []
+
+    def source():
+        for path in paths:
+            pulled.append(path)
+            yield path
+
+    iterator = generate_many(generator, source(), jobs=2, queue_size=3, ordered=True)
+    first = next(iterator)
+    # Finished results waiting behind the slow first path count against the window.
+    assert first.path == "f0.txt"
+    assert len(pulled) <= 4
+    assert [r.path for r in [first, *iterator]] == paths
@@ -210,3 +210,41 @@ def test_cli_auto_auth_on_dropbox_auth_error(tmp_path, monkeypatch):
     assert call_counter["count"] == 2
     assert os.environ["DROPBOX_REFRESH_TOKEN"] == "fresh_token"
     assert "https://example.com/file.txt?raw=1" in result.output
+
+
+def test_cli_batch_reads_null_delimited_stdin(tmp_path, monkeypatch):
+    root = tmp_path / "Dropbox"
+    root.mkdir()
+    names = ["a.txt", "b c.txt", "d.txt"]
+    for name in names:
+        (root / name).write_text(name)
+
+    monkeypatch.setenv("DROPBOX_APP_KEY", "app_key")
+    monkeypatch.setenv("DROPBOX_APP_SECRET", "app_secret")
+    monkeypatch.setenv("DROPBOX_REFRESH_TOKEN", "refresh")
+    monkeypatch.setenv("DROPBOX_ROOT", str(root.resolve()))
+    monkeypatch.setenv("DROPBOX_ARCHIVE_DIR", "")
+
+    def fake_get_or_create(_self, path: str) -> str:
+        return f"https://www.dropbox.com/s/xyz{path}?raw=1"
+
+    monkeypatch.setattr(
+        "dropbox_link_generate.services.dropbox_client.DropboxClient.get_or_create_shared_link",
+        fake_get_or_create,
+    )
+
+    stdin = b"\0".join(str(root / name).encode() for name in names) + b"\0"
+    stdin += str(tmp_path / "outside.txt").encode()
+
+    runner = CliRunner()
+    result = runner.invoke(main, ["link", "--from-file", "-", "-0", "-j", "2"], input=stdin)
+
+    assert result.exit_code == 1
+    lines = [line for line in result.stdout.splitlines() if line]
+    assert len(lines) == 3
+    assert {line.split("\t")[1] for line in lines} == {
+        "https://www.dropbox.com/s/xyz/a.txt?raw=1",
+        "https://www.dropbox.com/s/xyz/b c.txt?raw=1",
+        "https://www.dropbox.com/s/xyz/d.txt?raw=1",
+    }
+    assert "DROPBOX_ROOT" in result.stderr
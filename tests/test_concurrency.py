@@ -0,0 +1,79 @@
+import threading
+import time
+
+from dropbox_link_generate.core.batch import generate_many
+from dropbox_link_generate.core.concurrency import AIMDController
+from dropbox_link_generate.utils.errors import DropboxRateLimitError
+
+
+def test_additive_increase_then_multiplicative_decrease():
+    controller = AIMDController(initial=2, maximum=16)
+    for _ in range(40):
+        controller.record(0.1)
+    grown = controller.limit
+    assert 4 <= grown <= 16
+
+    controller.record(0.1, DropboxRateLimitError("429"))
+    assert controller.limit == grown // 2
+
+    # A burst of 429s within the same window counts once.
+    controller.record(0.1, DropboxRateLimitError("429"))
+    assert controller.limit == grown // 2
+
+    report = controller.report()
+    assert report.final == grown // 2
+    assert report.peak == grown
+    assert report.decreases == 1
+
+
+def test_throttle_events_from_retry_policy_trigger_decrease():
+    throttles = [0]
+    controller = AIMDController(initial=8, maximum=8, throttle_events=lambda: throttles[0])
+    throttles[0] = 1
+    controller.record(0.1)
+    assert controller.limit == 4
+
+
+def test_rising_latency_holds_the_limit():
+    controller = AIMDController(initial=4, maximum=32)
+    for _ in range(8):
+        controller.record(0.1)
+    held = controller.limit
+    for _ in range(20):
+        controller.record(2.0)
+    assert controller.limit == held
+
+
+class ThrottlingGenerator:
+    """Answers 429 whenever more than ``capacity`` requests overlap."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.active = 0
+        self._lock = threading.Lock()
+
+    def generate(self, path, copy=True):
+        with self._lock:
+            self.active += 1
+            overloaded = self.active > self.capacity
+        try:
+            time.sleep(0.005)
+            if overloaded:
+                raise DropboxRateLimitError("Rate limit exceeded (429)")
+            return f"https://example.com/{path}"
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_generate_many_follows_controller_limit():
+    controller = AIMDController(initial=1, maximum=16)
+    generator = ThrottlingGenerator(capacity=4)
+
+    results = list(generate_many(generator, (f"f{i}" for i in range(200)), controller=controller))
+
+    assert len(results) == 200
+    report = controller.report()
+    assert report.decreases >= 1
+    assert report.peak <= 16
+    assert 1 <= report.final <= 8
@@ -81,3 +81,22 @@ def test_config_archive_dir_absolute(tmp_path: Path, monkeypatch):
 
     with pytest.raises(ConfigError):
         Config.from_env(env_path=tmp_path)
+
+
+def test_config_archive_budget(tmp_path: Path, monkeypatch):
+    root = tmp_path / "Dropbox"
+    root.mkdir()
+    monkeypatch.setenv("DROPBOX_APP_KEY", "app_key")
+    monkeypatch.setenv("DROPBOX_APP_SECRET", "app_secret")
+    monkeypatch.setenv("DROPBOX_REFRESH_TOKEN", "refresh123")
+    monkeypatch.setenv("DROPBOX_ROOT", str(root))
+    monkeypatch.setenv("DPLK_ARCHIVE_MAX_BYTES", "1.5G")
+    monkeypatch.setenv("DPLK_ARCHIVE_MAX_COUNT", "50")
+
+    cfg = Config.from_env(env_path=tmp_path)
+    assert cfg.archive_max_bytes == int(1.5 * 1024**3)
+    assert cfg.archive_max_count == 50
+
+    monkeypatch.setenv("DPLK_ARCHIVE_MAX_BYTES", "lots")
+    with pytest.raises(ConfigError):
+        Config.from_env(env_path=tmp_path)
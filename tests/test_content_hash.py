@@ -0,0 +1,63 @@
+import hashlib
+import os
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from dropbox_link_generate.cli import cli
+from dropbox_link_generate.services.content_hash_store import ContentHashStore
+from dropbox_link_generate.utils import content_hash as content_hash_module
+from dropbox_link_generate.utils.content_hash import (
+    BLOCK_SIZE,
+    content_hash,
+    hash_bytes,
+)
+
+
+def _reference(data: bytes) -> str:
+    blocks = [data[i : i + BLOCK_SIZE] for i in range(0, len(data), BLOCK_SIZE)]
+    return hashlib.sha256(b"".join(hashlib.sha256(b).digest() for b in blocks)).hexdigest()
+
+
+def test_matches_dropbox_block_scheme_sequential_and_parallel(tmp_path: Path):
+    data = os.urandom(4 * BLOCK_SIZE + 12345)
+    path = tmp_path / "big.bin"
+    path.write_bytes(data)
+
+    expected = _reference(data)
+    assert content_hash(path, workers=1) == expected
+    assert content_hash(path, workers=4) == expected
+    assert hash_bytes(data) == expected
+
+    empty = tmp_path / "empty"
+    empty.write_bytes(b"")
+    assert content_hash(empty) == hashlib.sha256(b"").hexdigest()
+
+
+def test_cache_is_keyed_by_file_stamp(tmp_path: Path, monkeypatch):
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"first")
+    store = ContentHashStore(tmp_path / "links.db")
+    calls = []
+    real = content_hash_module._hash_file
+    monkeypatch.setattr(
+        content_hash_module, "_hash_file", lambda *a: calls.append(a) or real(*a)
+    )
+
+    first = content_hash(path, cache=store)
+    assert content_hash(path, cache=store) == first
+    assert len(calls) == 1
+
+    path.write_bytes(b"second, longer")
+    assert content_hash(path, cache=store) == _reference(b"second, longer")
+    assert len(calls) == 2
+
+
+def test_hash_command_prints_digest_per_file(tmp_path: Path):
+    path = tmp_path / "notes.txt"
+    path.write_bytes(b"hello")
+
+    result = CliRunner().invoke(cli, ["--no-cache", "hash", str(path)])
+
+    assert result.exit_code == 0, result.output
+    assert result.output == f"{_reference(b'hello')}  {path}\n"
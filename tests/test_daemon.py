@@ -0,0 +1,125 @@
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from dropbox_link_generate.cli import _run_via_daemon, main
+from dropbox_link_generate.services import daemon as daemon_module
+from dropbox_link_generate.services.daemon import (
+    DaemonUnavailable,
+    LinkDaemon,
+    default_socket_path,
+    request_link,
+)
+from dropbox_link_generate.utils.errors import (
+    DplkError,
+    DropboxAuthError,
+    NotInDropboxRoot,
+    SyncTimeoutError,
+)
+
+
+class FakeGenerator:
+    def __init__(self) -> None:
+        self.requests = []
+
+    def generate(self, path, copy=True):
+        assert copy is False
+        self.requests.append(path)
+        if "outside" in str(path):
+            raise NotInDropboxRoot(f"Path is not under DROPBOX_ROOT: {path}")
+        if "unsynced" in str(path):
+            raise SyncTimeoutError(f"Timed out waiting for Dropbox to sync {path}")
+        return f"https://example.com{path}?raw=1"
+
+
+@pytest.fixture
+def running_daemon(monkeypatch):
+    # Unix socket paths are length-limited, so avoid pytest's deep tmp_path.
+    socket_dir = Path(tempfile.mkdtemp(prefix="dplk-"))
+    socket_path = socket_dir / "d.sock"
+    generator = FakeGenerator()
+    daemon = LinkDaemon(generator, socket_path, logging.getLogger("test"))
+    daemon.bind()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("DPLK_SOCKET", str(socket_path))
+    yield daemon, generator
+    daemon.shutdown()
+    thread.join(timeout=5)
+    shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+def test_request_link_roundtrip_and_errors(running_daemon, tmp_path):
+    daemon, generator = running_daemon
+
+    assert request_link("/Dropbox/a.txt") == "https://example.com/Dropbox/a.txt?raw=1"
+    with pytest.raises(NotInDropboxRoot):
+        request_link("/outside.txt")
+    with pytest.raises(SyncTimeoutError, match="sync /Dropbox/unsynced.zip"):
+        request_link("/Dropbox/unsynced.zip")
+
+    relative_link = request_link("b.txt")
+    assert relative_link == f"https://example.com{Path.cwd() / 'b.txt'}?raw=1"
+    assert len(generator.requests) == 4
+
+
+def test_request_link_without_daemon(tmp_path):
+    with pytest.raises(DaemonUnavailable):
+        request_link("/a.txt", socket_path=tmp_path / "missing.sock")
+
+
+def test_cli_forwards_single_path_to_daemon(running_daemon, monkeypatch):
+    _, generator = running_daemon
+    monkeypatch.setattr(
+        "dropbox_link_generate.utils.clipboard.copy_to_clipboard", lambda _text: True
+    )
+
+    result = CliRunner().invoke(main, ["/Dropbox/a.txt"])
+
+    assert result.exit_code == 0
+    assert result.output.strip() == "https://example.com/Dropbox/a.txt?raw=1"
+    assert generator.requests == ["/Dropbox/a.txt"]
+
+
+def test_request_link_distrusts_sockets_of_other_users(running_daemon, monkeypatch):
+    uid = os.getuid()
+    monkeypatch.setattr(daemon_module.os, "getuid", lambda: uid + 1)
+
+    with pytest.raises(DaemonUnavailable):
+        request_link("/Dropbox/a.txt")
+
+
+def test_fallback_socket_lives_in_private_directory(monkeypatch):
+    base = Path(tempfile.mkdtemp(prefix="dplk-"))
+    monkeypatch.setattr(tempfile, "tempdir", str(base))
+    monkeypatch.delenv("DPLK_SOCKET", raising=False)
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    try:
+        socket_path = default_socket_path()
+        assert socket_path == base / f"dplk-{os.getuid()}" / "dplk.sock"
+
+        daemon = LinkDaemon(FakeGenerator(), socket_path, logging.getLogger("test"))
+        daemon.bind()
+        daemon.close()
+        assert os.stat(socket_path.parent).st_mode & 0o777 == 0o700
+
+        os.chmod(socket_path.parent, 0o755)
+        with pytest.raises(DplkError):
+            LinkDaemon(FakeGenerator(), socket_path, logging.getLogger("test")).bind()
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_auth_failures_fall_back_to_in_process(monkeypatch):
+    def fail(_path):
+        raise DropboxAuthError("expired")
+
+    monkeypatch.setattr(daemon_module, "request_link", fail)
+
+    assert _run_via_daemon(Path("/Dropbox/a.txt"), no_copy=True) is None
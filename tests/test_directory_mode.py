@@ -0,0 +1,70 @@
+import logging
+from pathlib import Path
+
+from dropbox_link_generate.core.archive import tree_exceeds
+from dropbox_link_generate.core.sharing import DropboxLinkGenerator
+
+
+class RecordingClient:
+    def __init__(self):
+        self.calls = []
+
+    def get_or_create_shared_link(self, path, raw=True):
+        self.calls.append((path, raw))
+        suffix = "?raw=1" if raw else "?dl=0"
+        return f"https://www.dropbox.com/s/x{path}{suffix}"
+
+
+def _tree(root: Path, files: int) -> Path:
+    project = root / "project"
+    (project / "sub").mkdir(parents=True)
+    for i in range(files):
+        (project / "sub" / f"f{i}.txt").write_text("x" * 100, encoding="utf-8")
+    return project
+
+
+def _generator(root: Path, client, **kwargs) -> DropboxLinkGenerator:
+    return DropboxLinkGenerator(
+        dropbox_root=root,
+        client=client,
+        logger=logging.getLogger("test"),
+        archive_dir=root / "archives",
+        **kwargs,
+    )
+
+
+def test_folder_mode_links_directory_without_archiving(tmp_path: Path):
+    root = tmp_path / "Dropbox"
+    project = _tree(root, files=3)
+    client = RecordingClient()
+
+    link = _generator(root, client, directory_mode="folder").generate(project, copy=False)
+
+    assert link.endswith("?dl=0")
+    assert client.calls == [("/project", False)]
+    assert not (root / "archives").exists()
+
+
+def test_auto_mode_uses_thresholds(tmp_path: Path):
+    root = tmp_path / "Dropbox"
+    project = _tree(root, files=5)
+
+    small = RecordingClient()
+    _generator(root, small, directory_mode="auto", folder_min_files=10).generate(
+        project, copy=False
+    )
+    assert small.calls == [("/archives/project.zip", True)]
+
+    large = RecordingClient()
+    _generator(root, large, directory_mode="auto", folder_min_bytes=300).generate(
+        project, copy=False
+    )
+    assert large.calls == [("/project", False)]
+
+
+def test_tree_exceeds_stops_at_limits(tmp_path: Path):
+    project = _tree(tmp_path, files=5)
+    assert tree_exceeds(project, max_files=4)
+    assert not tree_exceeds(project, max_files=5)
+    assert tree_exceeds(project, max_bytes=499)
+    assert not tree_exceeds(project, max_bytes=500)
@@ -0,0 +1,107 @@
+import logging
+import os
+import time
+from pathlib import Path
+
+from dropbox_link_generate.core.eviction import ArchiveBudget, evict_archives
+from dropbox_link_generate.core.sharing import DropboxLinkGenerator
+from dropbox_link_generate.services.archive_manifest import ArchiveManifestStore
+from dropbox_link_generate.utils.singleflight import file_lock
+
+
+def _archive(root: Path, name: str, size: int, age: float) -> Path:
+    path = root / name
+    path.write_bytes(b"\0" * size)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_evicts_least_recently_used_until_within_budget(tmp_path: Path):
+    old = _archive(tmp_path, "old.zip", 100, age=3 * 86400)
+    middle = _archive(tmp_path, "middle.zip", 100, age=2 * 86400)
+    newest = _archive(tmp_path, "newest.zip", 100, age=86400)
+    partial = _archive(tmp_path, ".~dplk-x.zip.1.tmp", 500, age=86400)
+    # Written long ago but linked a moment ago: recently used, so it stays.
+    relinked = _archive(tmp_path, "relinked.zip", 100, age=4 * 86400)
+    # Never recorded by dplk: neither counted nor deleted.
+    users = _archive(tmp_path, "users-own.zip", 1000, age=10 * 86400)
+    linked = {str(path): 0.0 for path in (old, middle, newest)}
+    linked[str(relinked)] = time.time() - 3600
+
+    result = evict_archives(
+        tmp_path, ArchiveBudget(max_bytes=250, pin_seconds=60), last_linked=linked
+    )
+
+    assert result.removed == [old, middle]
+    assert result.freed_bytes == 200
+    assert (result.remaining_bytes, result.remaining_count) == (200, 2)
+    assert not result.over_budget
+    assert newest.exists() and relinked.exists() and partial.exists() and users.exists()
+
+
+def test_sweeps_unheld_lock_files(tmp_path: Path):
+    stale = tmp_path / ".~dplk-old.zip.lock"
+    stale.touch()
+    held = tmp_path / ".~dplk-busy.zip.lock"
+
+    with file_lock(held):
+        evict_archives(tmp_path, ArchiveBudget(max_count=0))
+        assert held.exists()
+
+    assert not stale.exists()
+    # file_lock cleans up after itself.
+    assert not held.exists()
+
+
+def test_pinned_and_kept_archives_survive_over_budget(tmp_path: Path):
+    pinned = _archive(tmp_path, "pinned.zip", 100, age=10)
+    kept = _archive(tmp_path, "kept.zip", 100, age=86400)
+    stale = _archive(tmp_path, "stale.zip", 100, age=86400)
+    linked = {str(path): 0.0 for path in (pinned, kept, stale)}
+
+    result = evict_archives(
+        tmp_path,
+        ArchiveBudget(max_count=0, pin_seconds=3600),
+        last_linked=linked,
+        keep=(kept,),
+    )
+
+    assert result.removed == [stale]
+    assert result.over_budget
+    assert pinned.exists() and kept.exists()
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = []
+
+    def get_or_create_shared_link(self, path):
+        self.calls.append(path)
+        return f"https://www.dropbox.com/s/{len(self.calls)}{path}?raw=1"
+
+
+def test_generator_evicts_older_archives_after_linking(tmp_path: Path):
+    root = tmp_path / "Dropbox"
+    archives = root / "archives"
+    archives.mkdir(parents=True)
+    stale = _archive(archives, "stale.zip", 1000, age=86400)
+    project = root / "project"
+    project.mkdir()
+    (project / "notes.txt").write_text("hello", encoding="utf-8")
+    manifests = ArchiveManifestStore(tmp_path / "links.db")
+    manifests.touch(stale, when=time.time() - 86400)
+
+    generator = DropboxLinkGenerator(
+        dropbox_root=root,
+        client=CountingClient(),
+        logger=logging.getLogger("test"),
+        archive_dir=archives,
+        manifests=manifests,
+        archive_budget=ArchiveBudget(max_count=1, pin_seconds=60),
+    )
+    generator.generate(project, copy=False)
+
+    assert not stale.exists()
+    assert (archives / "project.zip").exists()
+    assert list(manifests.last_linked()) == [str(archives / "project.zip")]
@@ -0,0 +1,72 @@
+import os
+from pathlib import Path
+
+from dropbox_link_generate.core.archive import iter_archive_entries
+from dropbox_link_generate.core.ignore import IgnoreMatcher, parse_rule
+
+
+def _matches(pattern: str, path: str, is_dir: bool = False) -> bool:
+    rule = parse_rule(pattern)
+    assert rule is not None
+    return rule.matches(path, is_dir)
+
+
+def test_gitignore_pattern_semantics():
+    assert _matches("*.log", "a/b/debug.log")
+    assert not _matches("/*.log", "a/debug.log")
+    assert _matches("/*.log", "debug.log")
+    assert _matches("build/", "pkg/build", is_dir=True)
+    assert not _matches("build/", "pkg/build")
+    assert _matches("docs/*.md", "docs/a.md")
+    assert not _matches("docs/*.md", "docs/sub/a.md")
+    assert _matches("docs/**/*.md", "docs/sub/deep/a.md")
+    assert _matches("**/tmp", "x/y/tmp", is_dir=True)
+    assert _matches("out/**", "out/a/b")
+    assert _matches("file[0-9].txt", "file7.txt")
+    assert not _matches("file[!0-9].txt", "file7.txt")
+    assert parse_rule("# comment") is None
+    assert parse_rule("   ") is None
+    assert _matches("\\#hash", "#hash")
+
+
+def test_negation_and_nested_ignore_files(tmp_path: Path):
+    (tmp_path / ".gitignore").write_text("*.log\n!keep.log\n", encoding="utf-8")
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    (sub / ".dplkignore").write_text("!debug.log\n/local.txt\n", encoding="utf-8")
+
+    matcher = IgnoreMatcher().descend(tmp_path, "")
+    assert matcher.is_ignored("debug.log", False)
+    assert not matcher.is_ignored("keep.log", False)
+
+    nested = matcher.descend(sub, "sub")
+    assert not nested.is_ignored("sub/debug.log", False)
+    assert nested.is_ignored("sub/other.log", False)
+    assert nested.is_ignored("sub/local.txt", False)
+    assert not nested.is_ignored("local.txt", False)
+
+
+def test_ignored_subtrees_are_pruned_without_stat(tmp_path: Path, monkeypatch):
+    project = tmp_path / "project"
+    (project / "src").mkdir(parents=True)
+    (project / "src" / "app.py").write_text("print()", encoding="utf-8")
+    (project / "src" / "app.pyc").write_bytes(b"\0")
+    (project / "node_modules" / "left-pad").mkdir(parents=True)
+    (project / "node_modules" / "left-pad" / "index.js").write_text("", encoding="utf-8")
+    (project / ".git").mkdir()
+    (project / "dist").mkdir()
+    (project / "dist" / "bundle.js").write_text("", encoding="utf-8")
+    (project / ".gitignore").write_text("dist/\n", encoding="utf-8")
+
+    scanned = []
+    real_scandir = os.scandir
+
+    def tracking_scandir(path):
+        scanned.append(Path(path).name)
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", tracking_scandir)
+    names = [arc for _, arc in iter_archive_entries(project, ignore=IgnoreMatcher.with_defaults())]
+
+    assert sorted(names) == ["project", "project/.gitignore", "project/src", "project/src/app.py"]
+    assert sorted(scanned) == ["project", "src"]
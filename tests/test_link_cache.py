@@ -0,0 +1,58 @@
+import logging
+from pathlib import Path
+
+from dropbox_link_generate.core.sharing import DropboxLinkGenerator
+from dropbox_link_generate.services.link_cache import SharedLinkCache
+
+
+def test_cache_hit_requires_matching_stamps(tmp_path: Path):
+    cache = SharedLinkCache(tmp_path / "links.db", scope="/root")
+    cache.put("/Docs/A.txt", "https://example.com/a?raw=1", size=5, mtime_ns=100)
+
+    assert cache.get("/docs/a.txt", size=5, mtime_ns=100) == "https://example.com/a?raw=1"
+    assert cache.get("/docs/a.txt", size=6, mtime_ns=100) is None
+    assert cache.get("/docs/a.txt", size=5, mtime_ns=101) is None
+
+    other_scope = SharedLinkCache(tmp_path / "links.db", scope="/other")
+    assert other_scope.get("/docs/a.txt", size=5, mtime_ns=100) is None
+
+    cache.invalidate("/docs/a.txt")
+    assert cache.get("/docs/a.txt", size=5, mtime_ns=100) is None
+
+
+def test_cache_respects_max_age(tmp_path: Path):
+    cache = SharedLinkCache(tmp_path / "links.db", max_age=-1)
+    cache.put("/a.txt", "https://example.com/a?raw=1", size=1, mtime_ns=1)
+    assert cache.get("/a.txt", size=1, mtime_ns=1) is None
+
+
+class CountingClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def get_or_create_shared_link(self, path: str) -> str:
+        self.calls += 1
+        return f"https://example.com{path}?raw=1"
+
+
+def test_generator_serves_repeat_requests_from_cache(tmp_path: Path):
+    root = tmp_path / "Dropbox"
+    root.mkdir()
+    target = root / "a.txt"
+    target.write_text("hello")
+
+    client = CountingClient()
+    generator = DropboxLinkGenerator(
+        dropbox_root=root,
+        client=client,  # type: ignore[arg-type]
+        logger=logging.getLogger("test"),
+        cache=SharedLinkCache(tmp_path / "links.db", scope=str(root)),
+    )
+
+    assert generator.generate(target, copy=False) == "https://example.com/a.txt?raw=1"
+    assert generator.generate(target, copy=False) == "https://example.com/a.txt?raw=1"
+    assert client.calls == 1
+
+    target.write_text("changed content")
+    generator.generate(target, copy=False)
+    assert client.calls == 2
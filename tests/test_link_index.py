@@ -0,0 +1,122 @@
+import logging
+from pathlib import Path
+
+from dropbox_link_generate.core.sharing import DropboxLinkGenerator
+from dropbox_link_generate.services import link_index as link_index_module
+from dropbox_link_generate.services.dropbox_client import SharedLinkEntry
+from dropbox_link_generate.services.link_index import SharedLinkIndex
+from dropbox_link_generate.utils.errors import DropboxClientError
+
+
+class PagingClient:
+    def __init__(self, pages, reject_cursor=None):
+        self.pages = pages
+        self.reject_cursor = reject_cursor
+        self.requested = []
+
+    def list_shared_links_page(self, cursor=None):
+        self.requested.append(cursor)
+        if cursor is not None and cursor == self.reject_cursor:
+            raise DropboxClientError("reset")
+        key = cursor or "start"
+        entries, next_cursor, has_more = self.pages[key]
+        return entries, next_cursor, has_more
+
+    def get_or_create_shared_link(self, path):  # pragma: no cover - must not be hit
+        raise AssertionError(f"unexpected API call for {path}")
+
+
+def _entry(path: str) -> SharedLinkEntry:
+    return SharedLinkEntry(path_lower=path, url=f"https://example.com{path}?raw=1", is_folder=False)
+
+
+def test_sync_pages_through_listing_and_resumes_from_cursor(tmp_path: Path):
+    index = SharedLinkIndex(tmp_path / "links.db", scope="/root")
+    client = PagingClient(
+        {
+            "start": ([_entry("/a.txt")], "c1", True),
+            "c1": ([_entry("/b.txt")], "c2", False),
+            "c2": ([_entry("/c.txt")], "c3", False),
+        }
+    )
+
+    first = index.sync(client)
+    assert (first.pages, first.links, first.resumed) == (2, 2, False)
+    assert index.lookup("/A.txt") == "https://example.com/a.txt?raw=1"
+
+    second = index.sync(client)
+    assert (second.pages, second.links, second.resumed) == (1, 1, True)
+    assert client.requested == [None, "c1", "c2"]
+    assert index.status().links == 3
+
+
+def test_sync_restarts_when_cursor_rejected(tmp_path: Path):
+    index = SharedLinkIndex(tmp_path / "links.db")
+    index.sync(PagingClient({"start": ([_entry("/a.txt")], "stale", False)}))
+
+    client = PagingClient({"start": ([_entry("/b.txt")], "fresh", False)}, reject_cursor="stale")
+    result = index.sync(client)
+
+    assert result.resumed is False
+    assert client.requested == ["stale", None]
+    assert index.lookup("/b.txt")
+
+
+def test_sync_keeps_the_final_cursor(tmp_path: Path):
+    index = SharedLinkIndex(tmp_path / "links.db")
+    client = PagingClient(
+        {
+            "start": ([_entry("/a.txt")], "c1", True),
+            "c1": ([_entry("/b.txt")], None, False),
+        }
+    )
+
+    index.sync(client)
+    assert index.status().has_cursor is False
+    # Without a final cursor there is nothing to resume from.
+    assert index.sync(client).resumed is False
+    assert client.requested == [None, "c1", None, "c1"]
+
+
+def test_expired_entries_are_ignored_and_force_a_full_sync(tmp_path: Path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(link_index_module.time, "time", lambda: now[0])
+    index = SharedLinkIndex(tmp_path / "links.db", max_age=60)
+    client = PagingClient(
+        {
+            "start": ([_entry("/a.txt")], "c1", False),
+            "c1": ([_entry("/b.txt")], "c2", False),
+        }
+    )
+    index.sync(client)
+
+    now[0] += 30
+    assert index.sync(client).resumed is True
+    now[0] += 45
+    # /a.txt was listed 75 s ago, /b.txt only 45 s ago.
+    assert index.lookup("/a.txt") is None
+    assert index.lookup("/b.txt") == "https://example.com/b.txt?raw=1"
+
+    result = index.sync(client)
+    assert result.resumed is False
+    assert client.requested == [None, "c1", None]
+    assert index.lookup("/a.txt") == "https://example.com/a.txt?raw=1"
+    assert index.lookup("/b.txt") is None
+
+
+def test_generator_answers_from_index(tmp_path: Path):
+    root = tmp_path / "Dropbox"
+    root.mkdir()
+    target = root / "Report.pdf"
+    target.write_text("pdf")
+
+    index = SharedLinkIndex(tmp_path / "links.db", scope=str(root))
+    index.store([_entry("/report.pdf")])
+    generator = DropboxLinkGenerator(
+        dropbox_root=root,
+        client=PagingClient({}),  # type: ignore[arg-type]
+        logger=logging.getLogger("test"),
+        index=index,
+    )
+
+    assert generator.generate(target, copy=False) == "https://example.com/report.pdf?raw=1"
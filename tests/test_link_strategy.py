@@ -0,0 +1,115 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from dropbox import sharing
+from dropbox.exceptions import ApiError
+
+from dropbox_link_generate.services import dropbox_client as client_module
+from dropbox_link_generate.services.dropbox_client import DropboxClient
+from dropbox_link_generate.utils.config import DropboxOAuthCredentials
+
+
+class FakeDropbox:
+    """Shared links live in ``links``; every endpoint call is recorded."""
+
+    def __init__(self, **kwargs):
+        self._oauth2_access_token = "sl.token"
+        self._oauth2_access_token_expiration = datetime.now(timezone.utc).replace(
+            tzinfo=None
+        ) + timedelta(hours=4)
+        self.links = {}
+        self.calls = []
+        self.include_metadata = True
+        self.delay = 0.0
+
+    def sharing_list_shared_links(self, path=None, direct_only=None):
+        self.calls.append("list")
+        url = self.links.get(path)
+        links = [SimpleNamespace(url=url)] if url else []
+        return SimpleNamespace(links=links, has_more=False)
+
+    def sharing_create_shared_link_with_settings(self, path, settings=None):
+        self.calls.append("create")
+        time.sleep(self.delay)
+        if path in self.links:
+            metadata = None
+            if self.include_metadata:
+                link = sharing.SharedLinkMetadata(
+                    url=self.links[path],
+                    name=path.lstrip("/"),
+                    link_permissions=sharing.LinkPermissions(can_revoke=False),
+                )
+                metadata = sharing.SharedLinkAlreadyExistsMetadata("metadata", link)
+            error = sharing.CreateSharedLinkWithSettingsError("shared_link_already_exists", metadata)
+            raise ApiError("req", error, None, None)
+        self.links[path] = f"https://www.dropbox.com/s/new{path}?dl=0"
+        return SimpleNamespace(url=self.links[path])
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    monkeypatch.setattr(client_module.dropbox, "Dropbox", FakeDropbox)
+    creds = DropboxOAuthCredentials(app_key="key", app_secret="secret", refresh_token="refresh")
+    return lambda strategy: DropboxClient(credentials=creds, link_strategy=strategy)
+
+
+def test_list_first_costs_two_calls_for_new_files(make_client):
+    client = make_client("list-first")
+    assert client.get_or_create_shared_link("/a.txt").endswith("?raw=1")
+    assert client._dbx.calls == ["list", "create"]
+
+
+def test_create_first_uses_existing_link_from_error(make_client):
+    client = make_client("create-first")
+    client._dbx.links["/old.txt"] = "https://www.dropbox.com/s/old/old.txt?dl=0"
+
+    assert client.get_or_create_shared_link("/new.txt").endswith("?raw=1")
+    assert client.get_or_create_shared_link("/old.txt") == (
+        "https://www.dropbox.com/s/old/old.txt?raw=1"
+    )
+    assert client._dbx.calls == ["create", "create"]
+
+
+def test_adaptive_switches_to_listing_when_existing_links_come_back_bare(make_client):
+    client = make_client("adaptive")
+    dbx = client._dbx
+    dbx.include_metadata = False
+    for i in range(40):
+        dbx.links[f"/f{i}"] = f"https://www.dropbox.com/s/{i}/f{i}?dl=0"
+
+    for i in range(40):
+        client.get_or_create_shared_link(f"/f{i}")
+
+    # Starts create-first (create, then list because the reply had no link)
+    # and settles on listing, one call per path.
+    assert dbx.calls[:2] == ["create", "list"]
+    assert dbx.calls[-3:] == ["list", "list", "list"]
+    assert len(dbx.calls) < 2 * 40
+
+
+def test_unknown_strategy_is_rejected(make_client):
+    with pytest.raises(ValueError):
+        make_client("sometimes")
+
+
+def test_concurrent_requests_for_one_path_share_a_call(make_client):
+    client = make_client("create-first")
+    client._dbx.delay = 0.1
+    barrier = threading.Barrier(5)
+    links = []
+
+    def worker():
+        barrier.wait()
+        links.append(client.get_or_create_shared_link("/same.txt"))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert client._dbx.calls == ["create"]
+    assert len(set(links)) == 1 and len(links) == 5
@@ -0,0 +1,51 @@
+import io
+import os
+import zipfile
+from pathlib import Path
+
+from dropbox_link_generate.core.parallel_zip import ParallelZipWriter
+
+
+def _build(files: dict[str, Path], workers: int) -> bytes:
+    buffer = io.BytesIO()
+    with ParallelZipWriter(buffer, workers=workers, chunk_size=64 * 1024) as writer:
+        writer.add_directory(zipfile.ZipInfo("tree/"))
+        for arcname, path in files.items():
+            info = zipfile.ZipInfo.from_file(path, arcname)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            writer.add_file(path, info)
+    return buffer.getvalue()
+
+
+def test_chunked_deflate_round_trips_and_ignores_worker_count(tmp_path: Path):
+    text = tmp_path / "text.txt"
+    text.write_bytes(b"the quick brown fox jumps over the lazy dog\n" * 20_000)
+    noise = tmp_path / "noise.bin"
+    noise.write_bytes(os.urandom(200_000))
+    empty = tmp_path / "empty"
+    empty.write_bytes(b"")
+    files = {"tree/text.txt": text, "tree/noise.bin": noise, "tree/été.txt": empty}
+
+    single = _build(files, workers=1)
+    assert _build(files, workers=4) == single
+
+    with zipfile.ZipFile(io.BytesIO(single)) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ["tree/", *files]
+        for arcname, path in files.items():
+            assert archive.read(arcname) == path.read_bytes()
+        assert archive.getinfo("tree/text.txt").compress_size < text.stat().st_size // 10
+
+
+def test_stored_entries_are_written_verbatim(tmp_path: Path):
+    data = tmp_path / "data.bin"
+    data.write_bytes(os.urandom(150_000))
+    buffer = io.BytesIO()
+    with ParallelZipWriter(buffer, workers=2, chunk_size=64 * 1024) as writer:
+        writer.add_file(data, zipfile.ZipInfo.from_file(data, "data.bin"))
+
+    with zipfile.ZipFile(buffer) as archive:
+        info = archive.getinfo("data.bin")
+        assert info.compress_type == zipfile.ZIP_STORED
+        assert info.compress_size == info.file_size == 150_000
+        assert archive.read("data.bin") == data.read_bytes()
@@ -3,7 +3,7 @@ import os
 
 import pytest
 
-from dropbox_link_generate.utils.paths import normalize_and_validate_path
+from dropbox_link_generate.utils.paths import PathValidator, normalize_and_validate_path
 from dropbox_link_generate.utils.errors import NotInDropboxRoot, PathValidationError
 
 
@@ -75,3 +75,95 @@ def test_symlink_outside_root_even_if_target_inside_rejected(tmp_path: Path):
     with pytest.raises(NotInDropboxRoot):
         normalize_and_validate_path(outside_link, root)
 
+
+
+def test_allow_directories_for_folder_links(tmp_path: Path):
+    root = tmp_path / "Dropbox"
+    d = root / "Photos" / "2024"
+    d.mkdir(parents=True)
+
+    resolved, api_path = normalize_and_validate_path(d, root, allow_directories=True)
+    assert resolved == d.resolve()
+    assert api_path == "/Photos/2024"
+
+    with pytest.raises(PathValidationError):
+        normalize_and_validate_path(root, root, allow_directories=True)
+
+
+def _outcome(func, *args):
+    try:
+        return func(*args)
+    except PathValidationError as exc:
+        return type(exc), str(exc)
+
+
+def test_path_validator_matches_normalize_and_validate_path(tmp_path: Path, monkeypatch):
+    root = tmp_path / "Dropbox"
+    (root / "docs" / "sub").mkdir(parents=True)
+    (root / "docs" / "a.txt").write_text("a")
+    (root / "docs" / "sub" / "b.txt").write_text("b")
+    (tmp_path / "outside").mkdir()
+    (tmp_path / "outside" / "secret.txt").write_text("s")
+    (root / "docs" / "link.txt").symlink_to(root / "docs" / "a.txt")
+    (root / "docs" / "leak.txt").symlink_to(tmp_path / "outside" / "secret.txt")
+    (root / "docs" / "broken.txt").symlink_to(root / "missing.txt")
+    (root / "escape").symlink_to(tmp_path / "outside")
+    (root / "alias").symlink_to(root / "docs")
+    monkeypatch.chdir(root / "docs")
+
+    candidates = [
+        root / "docs" / "a.txt",
+        "sub/b.txt",
+        "../docs/./sub/b.txt",
+        root / "docs" / "sub" / ".." / "a.txt",
+        root / "docs" / "link.txt",
+        root / "docs" / "leak.txt",
+        root / "docs" / "broken.txt",
+        root / "docs" / "missing.txt",
+        root / "docs" / "a.txt" / "nested",
+        root / "escape" / "secret.txt",
+        root / "alias" / "sub" / "b.txt",
+        root / "docs" / "sub",
+        root / "docs" / "sub" / "..",
+        root / ".." / "Dropbox" / "docs" / "a.txt",
+        root / ".." / "outside" / "secret.txt",
+        tmp_path / "outside" / "secret.txt",
+        root,
+    ]
+    validator = PathValidator(root)
+    for allow_directories in (False, True):
+        for path in candidates:
+            expected = _outcome(normalize_and_validate_path, path, root, allow_directories)
+            assert _outcome(validator.validate, path, allow_directories) == expected, path
+
+    entries = [entry for entry in os.scandir(root / "docs")]
+    for entry in entries:
+        expected = _outcome(normalize_and_validate_path, entry.path, root, True)
+        assert _outcome(validator.validate_entry, entry, True) == expected, entry.path
+
+    results = list(validator.validate_many(["a.txt", "missing.txt"]))
+    assert results[0].ok and results[0].api_path == "/docs/a.txt"
+    assert not results[1].ok
+
+
+def test_path_validator_stats_each_file_once(tmp_path: Path, monkeypatch):
+    root = tmp_path / "Dropbox"
+    files = []
+    for d in range(3):
+        folder = root / f"d{d}"
+        folder.mkdir(parents=True)
+        for i in range(10):
+            (folder / f"f{i}.txt").write_text("x")
+            files.append(folder / f"f{i}.txt")
+    validator = PathValidator(root)
+    calls = []
+    real_lstat = os.lstat
+    monkeypatch.setattr(os, "lstat", lambda p, *a, **kw: calls.append(p) or real_lstat(p, *a, **kw))
+
+    pairs = [validator.validate(f) for f in files]
+
+    assert [api for _, api in pairs] == [f"/d{d}/f{i}.txt" for d in range(3) for i in range(10)]
+    # One lstat per file, plus the realpath of each of the three parents.
+    assert len([p for p in calls if str(p).endswith(".txt")]) == len(files)
+    assert len(calls) - len(files) <= 3 * len(root.resolve().parts)
+
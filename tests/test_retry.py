@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+import requests
+from dropbox.exceptions import BadInputError, InternalServerError, RateLimitError
+
+from dropbox_link_generate.services.retry import RetryPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def __call__(self):
+        return self.now
+
+
+def _policy(clock, **kwargs):
+    kwargs.setdefault("jitter", 0.0)
+    return RetryPolicy(sleep=clock.sleep, clock=clock, **kwargs)
+
+
+def _failing(errors, result="ok"):
+    remaining = list(errors)
+
+    def func():
+        if remaining:
+            raise remaining.pop(0)
+        return result
+
+    return func
+
+
+def test_retries_server_errors_with_exponential_backoff():
+    clock = FakeClock()
+    policy = _policy(clock, base_delay=1.0)
+    errors = [InternalServerError("id", 503, ""), requests.exceptions.ConnectionError()]
+
+    assert policy.call(_failing(errors)) == "ok"
+    assert clock.sleeps == [1.0, 2.0]
+
+
+def test_rate_limit_honours_backoff_and_blocks_other_callers():
+    clock = FakeClock()
+    policy = _policy(clock, base_delay=1.0)
+
+    assert policy.call(_failing([RateLimitError("id", backoff=7)])) == "ok"
+    assert clock.sleeps == [7.0]
+    assert policy.throttle_events == 1
+
+    # A 429 seen elsewhere holds every caller until the server backoff passes.
+    policy._block_for(3.0)
+    assert policy.call(lambda: "next") == "next"
+    assert clock.sleeps == [7.0, 3.0]
+
+
+def test_non_retryable_errors_fail_immediately():
+    clock = FakeClock()
+    policy = _policy(clock)
+
+    with pytest.raises(BadInputError):
+        policy.call(_failing([BadInputError("id", "bad")]))
+    assert clock.sleeps == []
+
+
+def test_attempt_limit_and_budget_stop_retries():
+    clock = FakeClock()
+    policy = _policy(clock, max_attempts=2, base_delay=1.0)
+    with pytest.raises(InternalServerError):
+        policy.call(_failing([InternalServerError("id", 500, "")] * 3))
+    assert clock.sleeps == [1.0]
+
+    clock = FakeClock()
+    policy = _policy(clock, budget=10.0)
+    with pytest.raises(RateLimitError):
+        policy.call(_failing([RateLimitError("id", backoff=30)]))
+    assert clock.sleeps == []
+    assert policy.throttle_events == 1
+
+
+def test_policy_is_safe_to_share_between_threads():
+    clock = FakeClock()
+    policy = _policy(clock, base_delay=0.0)
+    lock = threading.Lock()
+    results = []
+
+    def worker():
+        value = policy.call(_failing([InternalServerError("id", 500, "")]))
+        with lock:
+            results.append(value)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["ok"] * 8
@@ -0,0 +1,100 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+import dropbox_link_generate
+from dropbox_link_generate import LinkSession
+from dropbox_link_generate.services import dropbox_client as client_module
+from dropbox_link_generate.utils import config as config_module
+from dropbox_link_generate.utils.errors import ConfigError
+
+
+class FakeDropbox:
+    instances = 0
+
+    def __init__(self, **kwargs):
+        FakeDropbox.instances += 1
+        self.session = kwargs["session"]
+
+
+@pytest.fixture
+def dropbox_root(tmp_path: Path, monkeypatch) -> Path:
+    root = tmp_path / "Dropbox"
+    root.mkdir()
+    monkeypatch.setenv("DROPBOX_APP_KEY", "app_key")
+    monkeypatch.setenv("DROPBOX_APP_SECRET", "app_secret")
+    monkeypatch.setenv("DROPBOX_REFRESH_TOKEN", "refresh")
+    monkeypatch.setenv("DROPBOX_ROOT", str(root))
+    monkeypatch.setenv("DROPBOX_ARCHIVE_DIR", "")
+    monkeypatch.setattr(client_module.dropbox, "Dropbox", FakeDropbox)
+    FakeDropbox.instances = 0
+    return root
+
+
+def test_session_loads_config_and_client_once(dropbox_root: Path, monkeypatch):
+    for name in ("a.txt", "b.txt"):
+        (dropbox_root / name).write_text(name, encoding="utf-8")
+    fetched = []
+
+    def fake_get_or_create(_self, path, raw=True):
+        fetched.append(path)
+        return f"https://www.dropbox.com/s/x{path}?raw=1"
+
+    monkeypatch.setattr(client_module.DropboxClient, "get_or_create_shared_link", fake_get_or_create)
+    loads = []
+    from_env = config_module.Config.from_env.__func__
+    monkeypatch.setattr(
+        config_module.Config,
+        "from_env",
+        classmethod(lambda cls, env_path=None: loads.append(env_path) or from_env(cls, env_path)),
+    )
+
+    with LinkSession.from_env() as session:
+        first = session.generate(dropbox_root / "a.txt")
+        assert session.generate(dropbox_root / "a.txt") == first
+        results = list(session.generate_many([dropbox_root / "b.txt", "missing.txt"]))
+
+    assert loads == [None]
+    assert FakeDropbox.instances == 1
+    # The second call for a.txt was answered from the link cache.
+    assert fetched == ["/a.txt", "/b.txt"]
+    assert [r.ok for r in sorted(results, key=lambda r: r.path)] == [True, False]
+
+
+def test_close_releases_connections_and_stores(dropbox_root: Path):
+    session = LinkSession.from_env()
+    pool = session.client.transport
+    pool.session()
+
+    session.close()
+
+    assert pool._session is None
+    with pytest.raises(sqlite3.ProgrammingError):
+        session.generator.cache._conn.execute("SELECT 1")
+
+
+def test_failed_client_leaves_no_store_open(dropbox_root: Path, monkeypatch):
+    from dropbox_link_generate.services import link_cache
+
+    opened = []
+
+    class TrackedCache(link_cache.SharedLinkCache):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+
+    def broken_dropbox(**_kwargs):
+        raise ConfigError("bad credentials")
+
+    monkeypatch.setattr(link_cache, "SharedLinkCache", TrackedCache)
+    monkeypatch.setattr(client_module.dropbox, "Dropbox", broken_dropbox)
+
+    with pytest.raises(ConfigError):
+        LinkSession.from_env()
+    assert opened == []
+
+
+def test_session_is_exported_lazily():
+    assert "LinkSession" in dropbox_link_generate.__all__
+    assert dropbox_link_generate.LinkSession is LinkSession
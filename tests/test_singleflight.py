@@ -0,0 +1,113 @@
+import logging
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from dropbox_link_generate.core import sharing as sharing_module
+from dropbox_link_generate.core.sharing import DropboxLinkGenerator
+from dropbox_link_generate.utils.singleflight import SingleFlight, file_lock
+
+
+def _run_together(count, func):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = func()
+        except Exception as exc:
+            results[i] = exc
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_overlapping_calls_share_one_execution():
+    flights = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.1)
+        return object()
+
+    results = _run_together(6, lambda: flights.do("key", slow))
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flights.in_flight() == 0
+    # Finished calls are not cached.
+    flights.do("key", slow)
+    assert len(calls) == 2
+
+
+def test_errors_reach_every_waiter():
+    flights = SingleFlight()
+
+    def failing():
+        time.sleep(0.05)
+        raise RuntimeError("boom")
+
+    results = _run_together(3, lambda: flights.do("key", failing))
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_file_lock_serialises_holders(tmp_path: Path):
+    lock_path = tmp_path / "x.lock"
+    active = []
+    overlaps = []
+
+    def hold():
+        with file_lock(lock_path):
+            active.append(1)
+            overlaps.append(len(active))
+            time.sleep(0.02)
+            active.pop()
+
+    _run_together(4, hold)
+    assert overlaps == [1, 1, 1, 1]
+
+
+class SlowClient:
+    def __init__(self):
+        self.calls = []
+
+    def get_or_create_shared_link(self, path):
+        self.calls.append(path)
+        return f"https://www.dropbox.com/s/x{path}?raw=1"
+
+
+def test_concurrent_requests_for_one_directory_archive_once(tmp_path: Path, monkeypatch):
+    root = tmp_path / "Dropbox"
+    project = root / "project"
+    project.mkdir(parents=True)
+    (project / "a.txt").write_text("hello", encoding="utf-8")
+
+    builds = []
+    real_write = sharing_module.write_archive
+
+    def counting_write(*args, **kwargs):
+        builds.append(args[0])
+        time.sleep(0.1)
+        return real_write(*args, **kwargs)
+
+    monkeypatch.setattr(sharing_module, "write_archive", counting_write)
+    generator = DropboxLinkGenerator(
+        dropbox_root=root,
+        client=SlowClient(),
+        logger=logging.getLogger("test"),
+        archive_dir=root / "archives",
+    )
+
+    links = _run_together(4, lambda: generator.generate(project, copy=False))
+
+    assert len(builds) == 1
+    assert len(set(links)) == 1
+    assert (root / "archives" / "project.zip").exists()
@@ -0,0 +1,114 @@
+import pytest
+
+from dropbox_link_generate.core.sync import SyncWaiter
+from dropbox_link_generate.services.dropbox_client import RemoteFile
+from dropbox_link_generate.utils.errors import SyncTimeoutError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeSyncClient:
+    """A Dropbox whose folders fill up as longpolls return."""
+
+    def __init__(self, clock, folders, uploads):
+        self.clock = clock
+        self.folders = set(folders)
+        # Each longpoll that reports changes releases the next batch.
+        self.uploads = list(uploads)
+        self.files = {}
+        self.calls = []
+
+    def latest_cursor(self, folder, recursive=False):
+        self.calls.append(("cursor", folder, recursive))
+        return f"cursor:{folder}" if folder.lower() in self.folders else None
+
+    def get_file_metadata(self, path):
+        self.calls.append(("metadata", path))
+        return self.files.get(path.lower())
+
+    def longpoll(self, cursor, timeout=30):
+        self.calls.append(("longpoll", cursor, timeout))
+        self.clock.now += 10
+        return bool(self.uploads), None
+
+    def list_folder_changes(self, cursor):
+        batch = self.uploads.pop(0)
+        for remote in batch:
+            self.files[remote.path_lower] = remote
+        return batch, cursor + "+"
+
+
+def test_waits_on_nearest_existing_folder_until_file_appears():
+    clock = FakeClock()
+    uploaded = RemoteFile("/archives/new/project.zip", "abc", 10)
+    client = FakeSyncClient(
+        clock,
+        folders={"", "/archives"},
+        uploads=[[RemoteFile("/archives/other.zip", "x", 1)], [uploaded]],
+    )
+
+    remote = SyncWaiter(client, timeout=300, sleep=clock.sleep, clock=clock).wait(
+        "/Archives/new/project.zip"
+    )
+
+    assert remote == uploaded
+    assert client.calls[:3] == [
+        ("cursor", "/Archives/new", False),
+        ("cursor", "/Archives", True),
+        ("metadata", "/Archives/new/project.zip"),
+    ]
+    assert [call[0] for call in client.calls[3:]] == ["longpoll", "longpoll"]
+    # Each longpoll leaves room for Dropbox's jitter before the deadline.
+    assert client.calls[3][2] == 210
+    assert client.calls[4][1:] == ("cursor:/Archives+", 200)
+
+
+def test_returns_immediately_when_already_synced():
+    clock = FakeClock()
+    client = FakeSyncClient(clock, folders={"/docs"}, uploads=[])
+    client.files["/docs/a.txt"] = RemoteFile("/docs/a.txt", "h", 3)
+
+    SyncWaiter(client, timeout=60, clock=clock).wait("/docs/a.txt")
+
+    assert not any(call[0] == "longpoll" for call in client.calls)
+
+
+def test_stale_content_hash_keeps_waiting_until_timeout():
+    clock = FakeClock()
+    client = FakeSyncClient(
+        clock, folders={"/docs"}, uploads=[[RemoteFile("/docs/a.txt", "old", 3)]]
+    )
+
+    waiter = SyncWaiter(client, timeout=150, sleep=clock.sleep, clock=clock)
+    with pytest.raises(SyncTimeoutError):
+        waiter.wait("/docs/a.txt", expected_hash="new")
+    assert client.calls[2] == ("longpoll", "cursor:/docs", 60)
+    assert client.calls[-1] == ("metadata", "/docs/a.txt")
+    assert clock.now == 150
+
+
+def test_polls_metadata_when_too_short_for_a_longpoll():
+    clock = FakeClock()
+    client = FakeSyncClient(clock, folders={"/docs"}, uploads=[])
+
+    def upload_later(seconds):
+        clock.sleep(seconds)
+        if clock.now >= 15:
+            client.files["/docs/a.txt"] = RemoteFile("/docs/a.txt", "h", 3)
+
+    remote = SyncWaiter(client, timeout=60, sleep=upload_later, clock=clock).wait(
+        "/docs/a.txt"
+    )
+
+    assert remote.content_hash == "h"
+    assert clock.now == 15
+    assert not any(call[0] == "longpoll" for call in client.calls)
@@ -0,0 +1,165 @@
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from dropbox_link_generate.services import dropbox_client as client_module
+from dropbox_link_generate.services.dropbox_client import DropboxClient
+from dropbox_link_generate.services.token_store import CachedToken, TokenStore
+from dropbox_link_generate.utils.config import DropboxOAuthCredentials
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def test_token_store_roundtrip_is_private(tmp_path: Path):
+    store = TokenStore(tmp_path / "token.json")
+    store.save("key", "refresh", CachedToken("sl.abc", _utcnow() + timedelta(hours=4)))
+
+    assert os.stat(store.path).st_mode & 0o777 == 0o600
+    loaded = store.load("key", "refresh")
+    assert loaded is not None and loaded.access_token == "sl.abc"
+    assert store.load("key", "other-refresh") is None
+
+
+def test_token_store_ignores_tokens_near_expiry_and_loose_files(tmp_path: Path):
+    store = TokenStore(tmp_path / "token.json", margin=300)
+    store.save("key", "refresh", CachedToken("sl.old", _utcnow() + timedelta(seconds=60)))
+    assert store.load("key", "refresh") is None
+
+    store.save("key", "refresh", CachedToken("sl.new", _utcnow() + timedelta(hours=4)))
+    os.chmod(store.path, 0o644)
+    assert store.load("key", "refresh") is None
+
+
+class FakeDropbox:
+    refreshes = 0
+
+    def __init__(self, **kwargs):
+        self._oauth2_access_token = kwargs.get("oauth2_access_token")
+        self._oauth2_access_token_expiration = kwargs.get("oauth2_access_token_expiration")
+
+    def refresh_access_token(self):
+        FakeDropbox.refreshes += 1
+        self._oauth2_access_token = f"sl.fresh{FakeDropbox.refreshes}"
+        self._oauth2_access_token_expiration = _utcnow() + timedelta(hours=4)
+
+
+def test_client_reuses_persisted_token_across_instances(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(client_module.dropbox, "Dropbox", FakeDropbox)
+    FakeDropbox.refreshes = 0
+    creds = DropboxOAuthCredentials(app_key="key", app_secret="secret", refresh_token="refresh")
+    store = TokenStore(tmp_path / "token.json")
+
+    first = DropboxClient(credentials=creds, token_store=store)
+    first.ensure_access_token()
+    assert FakeDropbox.refreshes == 1
+
+    second = DropboxClient(credentials=creds, token_store=store)
+    second.ensure_access_token()
+    assert FakeDropbox.refreshes == 1
+    assert second._dbx._oauth2_access_token == "sl.fresh1"
+
+
+def _response(status: int, payload: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(payload).encode()
+    response.headers = CaseInsensitiveDict({"content-type": "application/json"})
+    return response
+
+
+class StubSession(requests.Session):
+    """Answers Dropbox API and OAuth requests without a network."""
+
+    def __init__(self):
+        super().__init__()
+        self.expired: set[str] = set()
+        self.requests: list[tuple[str, str]] = []
+
+    def post(self, url, headers=None, **kwargs):
+        if url.endswith("/oauth2/token"):
+            self.requests.append(("refresh", ""))
+            return _response(200, {"access_token": "sl.fresh", "expires_in": 14400})
+        token = (headers or {}).get("Authorization", "").removeprefix("Bearer ")
+        self.requests.append((url.rsplit("/", 2)[-2] + "/" + url.rsplit("/", 1)[-1], token))
+        if token in self.expired:
+            return _response(
+                401,
+                {"error_summary": "expired_access_token/", "error": {".tag": "expired_access_token"}},
+            )
+        return _response(
+            200,
+            {
+                ".tag": "file",
+                "name": "a.txt",
+                "id": "id:abc",
+                "client_modified": "2024-01-01T00:00:00Z",
+                "server_modified": "2024-01-01T00:00:00Z",
+                "rev": "0123456789abcdef",
+                "size": 3,
+                "path_lower": "/a.txt",
+                "path_display": "/a.txt",
+                "content_hash": "h" * 64,
+            },
+        )
+
+
+class StubTransport:
+    def __init__(self, session):
+        self._session = session
+
+    def session(self):
+        return self._session
+
+    def close(self):
+        pass
+
+
+def test_supplied_access_token_is_used_without_refresh(tmp_path: Path):
+    http = StubSession()
+    creds = DropboxOAuthCredentials(
+        app_key="key", app_secret="secret", refresh_token="refresh", access_token="sl.explicit"
+    )
+    store = TokenStore(tmp_path / "token.json")
+    client = DropboxClient(credentials=creds, token_store=store, transport=StubTransport(http))
+
+    assert client.get_file_metadata("/a.txt").path_lower == "/a.txt"
+    assert http.requests == [("files/get_metadata", "sl.explicit")]
+    assert store.load("key", "refresh") is None
+
+    # Once Dropbox reports it expired, the SDK refreshes and retries once;
+    # the client keeps the new token for later invocations.
+    http.expired.add("sl.explicit")
+    assert client.get_file_metadata("/a.txt").path_lower == "/a.txt"
+    assert http.requests[1:] == [
+        ("files/get_metadata", "sl.explicit"),
+        ("refresh", ""),
+        ("files/get_metadata", "sl.fresh"),
+    ]
+    assert store.load("key", "refresh").access_token == "sl.fresh"
+
+
+def test_diagnostics_client_respects_token_cache_setting(tmp_path: Path, monkeypatch):
+    from dropbox_link_generate.diagnostics.common import Credentials, build_client
+
+    monkeypatch.setattr(client_module.dropbox, "Dropbox", FakeDropbox)
+    FakeDropbox.refreshes = 0
+    monkeypatch.setenv("DROPBOX_APP_KEY", "key")
+    monkeypatch.setenv("DROPBOX_APP_SECRET", "secret")
+    monkeypatch.setenv("DROPBOX_REFRESH_TOKEN", "refresh")
+    monkeypatch.setenv("DROPBOX_ROOT", str(tmp_path))
+    monkeypatch.setenv("DPLK_STORE_DIR", str(tmp_path / "store"))
+    monkeypatch.setenv("DPLK_TOKEN_CACHE", "0")
+
+    build_client(Credentials("key", "secret", "refresh", access_token=None))
+    assert FakeDropbox.refreshes == 1
+    assert not (tmp_path / "store" / "token.json").exists()
+
+    dbx = build_client(Credentials("key", "secret", "refresh", access_token="sl.explicit"))
+    assert FakeDropbox.refreshes == 1
+    assert dbx._oauth2_access_token == "sl.explicit"
@@ -0,0 +1,40 @@
+import socket
+
+from dropbox_link_generate.services import dropbox_client as client_module
+from dropbox_link_generate.services.dropbox_client import DropboxClient
+from dropbox_link_generate.services.transport import HttpTransport
+from dropbox_link_generate.utils.config import DropboxOAuthCredentials
+
+
+def test_session_pool_is_sized_and_keeps_connections_alive():
+    transport = HttpTransport(pool_size=24)
+    session = transport.session()
+
+    assert transport.session() is session
+    pool_kw = session.get_adapter("https://api.dropboxapi.com").poolmanager.connection_pool_kw
+    assert pool_kw["maxsize"] == 24
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in pool_kw["socket_options"]
+
+    transport.close()
+    assert transport.session() is not session
+
+
+def test_keepalive_can_be_disabled():
+    session = HttpTransport(keepalive=False).session()
+    pool_kw = session.get_adapter("https://api.dropboxapi.com").poolmanager.connection_pool_kw
+    assert "socket_options" not in pool_kw
+
+
+class RecordingDropbox:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+def test_client_hands_the_shared_session_to_the_sdk(monkeypatch):
+    monkeypatch.setattr(client_module.dropbox, "Dropbox", RecordingDropbox)
+    transport = HttpTransport(pool_size=4)
+    creds = DropboxOAuthCredentials(app_key="key", app_secret="secret", refresh_token="refresh")
+
+    client = DropboxClient(credentials=creds, transport=transport)
+
+    assert client._dbx.kwargs["session"] is transport.session()
@@ -0,0 +1,187 @@
+import csv
+import io
+import json
+import os
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from dropbox_link_generate.cli import main
+from dropbox_link_generate.core.ignore import IgnoreMatcher
+from dropbox_link_generate.core.tree import walk_tree
+from dropbox_link_generate.utils.errors import NotInDropboxRoot, PathValidationError
+from dropbox_link_generate.utils.paths import PathValidator
+
+
+def _make_tree(root: Path) -> Path:
+    top = root / "Reports"
+    for rel in (
+        "b.pdf",
+        "a.txt",
+        "docs/z.pdf",
+        "docs/draft.pdf",
+        "docs/deep/x.pdf",
+        "drafts/y.pdf",
+        ".git/HEAD",
+    ):
+        path = top / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel, encoding="utf-8")
+    return top
+
+
+def _rel(results, top: Path) -> list[str]:
+    return [Path(r.path).relative_to(top).as_posix() for r in results]
+
+
+def test_walk_tree_yields_files_in_path_order(tmp_path: Path):
+    root = tmp_path / "Dropbox"
+    top = _make_tree(root)
+    validator = PathValidator(root)
+
+    results = list(walk_tree(top, validator, ignore=IgnoreMatcher.with_defaults()))
+
+    assert _rel(results, top) == [
+        "a.txt",
+        "b.pdf",
+        "docs/deep/x.pdf",
+        "docs/draft.pdf",
+        "docs/z.pdf",
+        "drafts/y.pdf",
+    ]
+    assert all(r.ok for r in results)
+    assert results[2].api_path == "/Reports/docs/deep/x.pdf"
+    assert results[2].resolved == (top / "docs/deep/x.pdf").resolve()
+
+
+def test_walk_tree_include_and_exclude_globs(tmp_path: Path):
+    top = _make_tree(tmp_path / "Dropbox")
+    validator = PathValidator(tmp_path / "Dropbox")
+
+    pdfs = walk_tree(top, validator, include=["*.pdf"], exclude=["drafts/", "draft.*"])
+    assert _rel(pdfs, top) == ["b.pdf", "docs/deep/x.pdf", "docs/z.pdf"]
+
+    anchored = walk_tree(top, validator, include=["docs/*.pdf"])
+    assert _rel(anchored, top) == ["docs/draft.pdf", "docs/z.pdf"]
+
+    # A matching directory selects everything below it.
+    assert _rel(walk_tree(top, validator, include=["docs/"]), top) == [
+        "docs/deep/x.pdf",
+        "docs/draft.pdf",
+        "docs/z.pdf",
+    ]
+    assert _rel(walk_tree(top, validator, include=["deep"]), top) == ["docs/deep/x.pdf"]
+
+    # Without an ignore matcher nothing is skipped by default.
+    assert ".git/HEAD" in _rel(walk_tree(top, validator), top)
+
+
+def test_walk_tree_sorts_by_relative_path_and_keeps_the_given_prefix(tmp_path: Path):
+    root = tmp_path / "Dropbox"
+    top = root / "Reports"
+    for rel in ("a/b.txt", "a.txt", "a-c.txt", "ab.txt"):
+        path = top / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel, encoding="utf-8")
+    alias = root / "alias"
+    os.symlink(top, alias)
+
+    results = list(walk_tree(alias, PathValidator(root)))
+
+    names = _rel(results, alias)
+    assert names == sorted(names) == ["a-c.txt", "a.txt", "a/b.txt", "ab.txt"]
+    assert results[2].path == os.path.join(str(alias), "a", "b.txt")
+    assert results[2].api_path == "/Reports/a/b.txt"
+
+
+def test_walk_tree_reports_escaping_symlinks_and_skips_linked_dirs(tmp_path: Path):
+    root = tmp_path / "Dropbox"
+    top = root / "Reports"
+    top.mkdir(parents=True)
+    (top / "ok.txt").write_text("ok", encoding="utf-8")
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "secret.txt").write_text("s", encoding="utf-8")
+    os.symlink(outside / "secret.txt", top / "escape.txt")
+    os.symlink(outside, top / "linked")
+
+    results = list(walk_tree(top, PathValidator(root)))
+
+    assert _rel(results, top) == ["escape.txt", "ok.txt"]
+    assert isinstance(results[0].error, NotInDropboxRoot)
+    assert results[1].ok
+
+
+def test_walk_tree_checks_the_directory(tmp_path: Path):
+    root = tmp_path / "Dropbox"
+    root.mkdir()
+    (root / "file.txt").write_text("x", encoding="utf-8")
+    validator = PathValidator(root)
+
+    with pytest.raises(NotInDropboxRoot):
+        walk_tree(tmp_path, validator)
+    os.symlink(tmp_path, root / "escape")
+    with pytest.raises(NotInDropboxRoot):
+        walk_tree(root / "escape", validator)
+    with pytest.raises(PathValidationError):
+        walk_tree(root / "file.txt", validator)
+    # The root itself may be walked, though it cannot be linked.
+    assert _rel(walk_tree(root, validator), root) == ["file.txt"]
+
+
+@pytest.fixture
+def tree_env(tmp_path: Path, monkeypatch) -> Path:
+    root = tmp_path / "Dropbox"
+    monkeypatch.setenv("DROPBOX_APP_KEY", "app_key")
+    monkeypatch.setenv("DROPBOX_APP_SECRET", "app_secret")
+    monkeypatch.setenv("DROPBOX_REFRESH_TOKEN", "refresh")
+    monkeypatch.setenv("DROPBOX_ROOT", str(root))
+    monkeypatch.setenv("DROPBOX_ARCHIVE_DIR", "")
+
+    def fake_get_or_create(_self, path: str, raw: bool = True) -> str:
+        if path.endswith("z.pdf"):
+            raise PathValidationError("boom")
+        return f"https://www.dropbox.com/s/x{path}?raw=1"
+
+    monkeypatch.setattr(
+        "dropbox_link_generate.services.dropbox_client.DropboxClient.get_or_create_shared_link",
+        fake_get_or_create,
+    )
+    return _make_tree(root)
+
+
+def test_cli_tree_streams_ndjson_in_path_order(tree_env: Path):
+    result = CliRunner().invoke(
+        main, ["--no-cache", "tree", str(tree_env), "--include", "*.pdf", "-j", "3"]
+    )
+
+    assert result.exit_code == 1
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    names = [Path(r["path"]).name for r in records]
+    assert names == ["b.pdf", "x.pdf", "draft.pdf", "z.pdf", "y.pdf"]
+    assert records[0]["link"] == "https://www.dropbox.com/s/x/Reports/b.pdf?raw=1"
+    assert records[3] == {"path": records[3]["path"], "error": "boom"}
+
+
+def test_cli_tree_writes_csv(tree_env: Path):
+    result = CliRunner().invoke(
+        main,
+        [
+            "--no-cache",
+            "tree",
+            str(tree_env),
+            "--exclude",
+            "docs/",
+            "--format",
+            "csv",
+            "--order",
+            "completion",
+        ],
+    )
+
+    assert result.exit_code == 0
+    rows = list(csv.DictReader(io.StringIO(result.stdout)))
+    assert sorted(Path(row["path"]).name for row in rows) == ["a.txt", "b.pdf", "y.pdf"]
+    assert all(row["link"].startswith("https://") for row in rows)
+    assert all(row["error"] == "" for row in rows)